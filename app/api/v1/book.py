@@ -1,15 +1,20 @@
 # app/api/v1/book.py
-from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File, status, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File, status, Request, Response
+from fastapi.responses import RedirectResponse, StreamingResponse
+from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List, Optional, Any
+from typing import AsyncIterator, List, Optional, Any
 from uuid import UUID as PyUUID
+from xml.etree import ElementTree
+import zipfile
 
-from app.database import get_async_db
+from app.config import settings
+from app.database import AsyncSessionLocal, get_async_db
 from app.schemas.book import BookCreate, BookResponse, BookUpdate
 from app.crud.book import book_crud
 from app.dependencies import get_current_user, get_current_active_moderator_or_admin, get_current_active_admin
 from app.models.user import User
-from app.models.content import Content, ContentStatus, ContentType, ContentSubType
+from app.models.content import BookChapter, Content, ContentStatus, ContentType, ContentSubType
 from app.models.content import BookType as ModelBookTypeEnum
 from app.models.content import ContentType as ModelContentTypeEnum
 from app.crud.book_chapter import book_chapter_crud
@@ -17,36 +22,71 @@ from app.crud.book_section import book_section_crud
 from app.schemas.book_chapter import (
     BookChapterCreate,
     BookChapterResponse,
-    BookChapterUpdate, BookChapterResponseWithoutSections
+    BookChapterUpdate, BookChapterResponseWithoutSections,
+    BookChapterReorderRequest,
+    BookChapterRangeItem,
+    BookChapterRangeResponse
 
 )
 from app.schemas.book_section import (
     BookSectionCreate,
     BookSectionResponse,
-    BookSectionUpdate
+    BookSectionUpdate,
+    BookSectionReorderRequest
 )
+from app.schemas.book_import import BookImportDocument, BookImportResponse, BookSourceImportResponse
+from app.services.book_import import import_book, sync_book_from_source
+from app.schemas.book_bundle import BookBundleStatus
+from app.schemas.book_search import BookSearchHit
+from app.schemas.transcript import (
+    TranscriptReplaceResponse,
+    TranscriptSearchHit,
+    TranscriptSegmentResponse,
+    TranscriptSegmentsReplace,
+    TranscriptWindowResponse
+)
+from app.services.book_bundles import (
+    BUNDLE_MEDIA_TYPE, LocalBundleStore, bundle_builder, bundle_filename, bundle_key, bundle_store
+)
+from app.services.book_sources import iter_source, source_format, source_title
+from app.services.transcripts import CAPTION_FORMATS, parse_captions
+from app.crud.transcript_segment import transcript_segment_crud
+from app.utils.helpers import slugify
 from app.schemas.book_toc import (
     BookTableOfContentsResponse,
     TOCChapterItem,
     TOCSectionItem
 )
 from app.schemas.pagination import PaginatedResponse
+from app.schemas.batch import BatchGetResponse
+from app.utils.cache import entity_tag, response_cache, visibility_scope
+from app.utils.serialization import batch_body, json_bytes_response, paginated_body
+from app.utils.batch_ids import IDS_QUERY_DESCRIPTION, parse_ids
+from app.utils.etag import etag_matches, make_etag, not_modified
+from app.utils.fieldsets import FIELDS_QUERY_DESCRIPTION, FieldSet
+from app.utils.file_ranges import range_file_response
+from app.utils.serialization import json_dumps
 
 router = APIRouter()
 
+BOOK_FIELDS = FieldSet(BookResponse, Content, derived={"book_format": ("content_type", "sub_type")})
+
 @router.get("", response_model=PaginatedResponse[BookResponse], summary="List all books with pagination")
 async def list_all_books_paginated(
     request: Request,
     skip: int = Query(0, ge=0, description="Number of items to skip (offset)"),
     limit: int = Query(10, ge=1, le=100, description="Number of items per page"),
     category_id: Optional[str] = Query(None, description="Filter by category UUID"),
+    include_descendants: bool = Query(False, description="Also include items from all sub-categories of category_id"),
     language: Optional[str] = Query(None, description="Filter by language code (e.g., EN, HI)"),
     status_filter: Optional[str] = Query(None, description="Filter by content status (e.g., PUBLISHED, DRAFT)"),
     search: Optional[str] = Query(None, description="Search query for title and description"),
     book_format: Optional[str] = Query("TEXT", description=f"Filter by book format: {', '.join([bt.value for bt in ModelBookTypeEnum])}"),
+    fields: Optional[str] = Query(None, description=FIELDS_QUERY_DESCRIPTION),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_async_db)
 ):
+    selection = BOOK_FIELDS.parse(fields)
     content_type_filter = None
     if book_format:
         try:
@@ -68,93 +108,95 @@ async def list_all_books_paginated(
         except KeyError: # Should not happen if bf_upper matches ModelBookTypeEnum values
              raise HTTPException(status_code=400, detail="Invalid book_format specified.")
 
+    async def build_page(db: AsyncSession):
+        books, total_count = await book_crud.get_book_list_and_count(
+            db=db, 
+            skip=skip, 
+            limit=limit,
+            content_type_filter_str=content_type_filter, # Pass the determined content_type
+            category_id_str=category_id,
+            language_str=language,
+            status_str=status_filter, #or ContentStatus.PUBLISHED.value,
+            search_query=search,
+            user_id=current_user.id, # Optional, if you want to filter by user
+            include_descendants=include_descendants,
+            columns=BOOK_FIELDS.columns(selection),
+        )
 
-    books, total_count = await book_crud.get_book_list_and_count(
-        db=db, 
-        skip=skip, 
-        limit=limit,
-        content_type_filter_str=content_type_filter, # Pass the determined content_type
-        category_id_str=category_id,
-        language_str=language,
-        status_str=status_filter, #or ContentStatus.PUBLISHED.value,
-        search_query=search,
-        user_id=current_user.id # Optional, if you want to filter by user
+        # book_format comes from the Content.book_format property
+        return paginated_body(
+            BOOK_FIELDS.schema_for(selection), books, total_count=total_count, skip=skip, limit=limit, request=request
+        )
+
+    return await response_cache.get_or_set(
+        response_cache.build_key(request, visibility_scope(current_user)),
+        build_page,
+        db=db,
+        # Moving a category changes which books a subtree filter matches
+        tags=[entity_tag("content")] + ([entity_tag("categories")] if include_descendants else []),
     )
 
-    response_items = []
-    for book_model in books:
-        derived_book_format = None
-        if book_model.content_type == ModelContentTypeEnum.AUDIO.value:
-            derived_book_format = ModelBookTypeEnum.AUDIO.value
-        elif book_model.content_type == ModelContentTypeEnum.BOOK.value:
-            derived_book_format = ModelBookTypeEnum.TEXT.value # Or PDF if that's the case
-        else:
-            derived_book_format = ModelBookTypeEnum.PDF.value
-        book_resp = BookResponse.model_validate(book_model) # Pydantic v2
-
-        book_resp.book_format = derived_book_format
-        response_items.append(book_resp)
-
-    # Construct next and previous page URLs
-    next_page = None
-    if (skip + limit) < total_count:
-        # Keep existing query params for the next page URL
-        next_params = request.query_params._dict.copy()
-        next_params["skip"] = str(skip + limit)
-        next_params["limit"] = str(limit)
-        next_page = str(request.url.replace_query_params(**next_params))
-
-    prev_page = None
-    if skip > 0:
-        prev_params = request.query_params._dict.copy()
-        prev_params["skip"] = str(max(0, skip - limit))
-        prev_params["limit"] = str(limit)
-        prev_page = str(request.url.replace_query_params(**prev_params))
-        
-    return PaginatedResponse[BookResponse](
-        total_count=total_count,
-        limit=limit,
-        skip=skip,
-        next_page=next_page,
-        prev_page=prev_page,
-        items=response_items
+@router.get("/batch", response_model=BatchGetResponse[BookResponse], summary="Get several books by id")
+async def batch_get_books(
+    request: Request,
+    ids: str = Query(..., description=IDS_QUERY_DESCRIPTION),
+    fields: Optional[str] = Query(None, description=FIELDS_QUERY_DESCRIPTION),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Books for `?ids=a,b,c` in one query, in the requested order; ids that aren't live books are listed under `missing`."""
+    book_ids = parse_ids(ids)
+    selection = BOOK_FIELDS.parse(fields)
+
+    async def build_batch(db: AsyncSession):
+        books = await book_crud.get_books_by_ids(db, book_ids, columns=BOOK_FIELDS.columns(selection))
+        return batch_body(BOOK_FIELDS.schema_for(selection), book_ids, books)
+
+    return await response_cache.get_or_set(
+        response_cache.build_key(request, visibility_scope(current_user)),
+        build_batch,
+        db=db,
+        tags=[entity_tag("content", book_id) for book_id in book_ids],
     )
 
 @router.get("/{content_id_or_slug}", response_model=BookResponse)
 async def get_single_book(
+    request: Request,
     content_id_or_slug: str,
+    fields: Optional[str] = Query(None, description=FIELDS_QUERY_DESCRIPTION),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get a specific content item by its UUID or slug.
+    Supports If-None-Match: an unchanged book is answered with 304 from an (id, updated_at) lookup.
     """
-    content: Optional[Content] = None
-    try:
-        # Try to interpret as UUID first
-        content_uuid = PyUUID(content_id_or_slug)
-        content = await book_crud.get_book(db=db, content_id=content_uuid)
-    except ValueError:
-        # If not a valid UUID, assume it's a slug
-        content = await book_crud.get_book_by_slug(db=db, slug=content_id_or_slug)
-
-    if not content:
+    selection = BOOK_FIELDS.parse(fields)
+    # Slugs resolve through the slug cache, so everything below is a primary-key lookup
+    content_id = await book_crud.resolve_id(db, content_id_or_slug)
+    version = content_id and await book_crud.get_book_version(db, content_id)
+    if not version:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Content not found")
+    etag = make_etag("book", *version, *sorted(selection or ()))
+    if etag_matches(request, etag):
+        return not_modified(etag)
 
-    derived_book_format = None
-    if content.content_type == ModelContentTypeEnum.AUDIO.value:
-        derived_book_format = ModelBookTypeEnum.AUDIO.value
-    elif content.content_type == ModelContentTypeEnum.BOOK.value:
-        derived_book_format = ModelBookTypeEnum.TEXT.value # Or PDF if that's the case
-    elif content.content_type == ModelContentTypeEnum.VIDEO.value:
-        derived_book_format = ModelBookTypeEnum.VIDEO.value
-    else:
-        derived_book_format = ModelBookTypeEnum.PDF.value
-    book_resp = BookResponse.model_validate(content) # Pydantic v2
+    async def build_book(db: AsyncSession):
+        content = await book_crud.get_book(db=db, content_id=content_id, columns=BOOK_FIELDS.columns(selection))
+        if not content:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Content not found")
 
-    book_resp.book_format = derived_book_format
+        return BOOK_FIELDS.schema_for(selection).model_validate(content) # book_format via Content.book_format
 
-    return book_resp
+    response = await response_cache.get_or_set(
+        # Keyed on the id, so the id and slug URLs share one entry
+        response_cache.entity_key("book", content_id, visibility_scope(current_user), etag),
+        build_book,
+        db=db,
+        tags=lambda book_resp: [entity_tag("content", book_resp.id)],
+    )
+    response.headers["ETag"] = etag
+    return response
 
 
 @router.post("",response_model=BookResponse, status_code=status.HTTP_201_CREATED)
@@ -179,6 +221,56 @@ async def create_new_book(
     print(new_content)
     return new_content
 
+@router.post("/import", response_model=BookImportResponse, summary="Import a whole book with its chapters and sections")
+async def import_book_route(
+    document: BookImportDocument,
+    response: Response,
+    current_user: User = Depends(get_current_active_admin),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Create a book, its chapters and their sections from one nested document, in a single transaction.
+    Idempotent per slug: re-posting the same document adds only the chapters that are missing.
+    For very large books or many books at once use `python -m app.scripts.import_books`.
+    """
+    try:
+        result = await import_book(db, document, author_id=current_user.id)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    response.status_code = status.HTTP_201_CREATED if result.created else status.HTTP_200_OK
+    return result
+
+@router.post("/import/file", response_model=BookSourceImportResponse, summary="Import or update a book from a Markdown or EPUB file")
+async def import_book_file_route(
+    response: Response,
+    file: UploadFile = File(..., description="`.md` (`#` chapters, `##` sections) or `.epub`"),
+    slug: Optional[str] = Query(None, description="Book to create or update; derived from the title when omitted"),
+    title: Optional[str] = Query(None, min_length=3, max_length=300, description="Title for a new book; defaults to the EPUB title or file name"),
+    split_paragraphs: bool = Query(False, description="Make every paragraph its own section (verse-per-section texts)"),
+    current_user: User = Depends(get_current_active_admin),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Streams the uploaded file into chapters and sections. Re-uploading an edited file for the
+    same slug rewrites only the sections whose text changed (matched by content hash).
+    Large files are better imported with `python -m app.scripts.import_book_file`.
+    """
+    try:
+        source_format(file.filename or "")
+        book_title = title or source_title(file.file, file.filename)
+        book_in = BookCreate(title=book_title, book_format=ModelBookTypeEnum.TEXT)
+        result = await sync_book_from_source(
+            db,
+            iter_source(file.file, file.filename, split_paragraphs=split_paragraphs),
+            slug=slug or slugify(book_title),
+            book_in=book_in,
+            author_id=current_user.id,
+        )
+    except (ValueError, zipfile.BadZipFile, KeyError, ElementTree.ParseError) as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Could not import the file: {e}")
+    response.status_code = status.HTTP_201_CREATED if result.created else status.HTTP_200_OK
+    return result
+
 @router.put("/{content_id}",response_model=BookResponse)
 async def update_existing_book(
     content_id: PyUUID,
@@ -264,17 +356,71 @@ async def create_chapter_for_book_route(
     
     return BookChapterResponseWithoutSections.model_validate(chapter_model)
 
+def _ndjson_line(kind: str, item: BaseModel) -> bytes:
+    # {"type": kind, ...item fields} without a dict round trip
+    return b'{"type":"' + kind.encode("ascii") + b'",' + item.model_dump_json().encode("utf-8")[1:] + b"\n"
+
+
+async def _stream_chapter_ndjson(chapter: BookChapter) -> AsyncIterator[bytes]:
+    """
+    Chapter header line first, then one line per section as the cursor yields it, then an
+    "end" line with the count so clients can tell a complete stream from a dropped one.
+    Runs on its own session: the generator outlives the route function.
+    """
+    yield _ndjson_line("chapter", BookChapterResponseWithoutSections.model_validate(chapter))
+    section_count = 0
+    async with AsyncSessionLocal() as db:
+        async for section in book_section_crud.stream_sections_for_chapter(
+            db, chapter_id=chapter.id, batch_size=settings.CHAPTER_STREAM_BATCH_SIZE
+        ):
+            section_count += 1
+            yield _ndjson_line("section", BookSectionResponse.model_validate(section))
+    yield b'{"type":"end","section_count":' + str(section_count).encode("ascii") + b"}\n"
+
+
+def _chapter_etag(include_sections: bool, *version) -> str:
+    # Shared by the single-chapter route and the ?from=&to= range, so their ETags are interchangeable
+    return make_etag("chapter", include_sections, *version)
+
+
 # Example for GET single chapter:
 @router.get(
     "/{book_id}/chapters/{chapter_id}"
 )
 async def get_specific_book_chapter_route(
+    request: Request,
+    response: Response,
     book_id: PyUUID,
     chapter_id: PyUUID,
     include_sections: bool = Query(True, description="Whether to include sections"),
+    stream: bool = Query(False, description="Stream as NDJSON: the chapter line first, then one line per section (also chosen by Accept: application/x-ndjson)"),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_async_db)
 ):
+    # Streaming only changes anything when there are sections to stream
+    stream = include_sections and (stream or "application/x-ndjson" in request.headers.get("accept", ""))
+
+    # ETag covers the chapter row and, when sections are included, their count and latest edit.
+    # Checked before the section bodies are loaded.
+    version = await book_chapter_crud.get_chapter_version(
+        db, chapter_id=chapter_id, book_id=book_id, include_sections=include_sections
+    )
+    if not version:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Chapter not found for this book")
+    etag = _chapter_etag(include_sections, *version, *(("ndjson",) if stream else ()))
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    response.headers["Vary"] = "Accept"
+
+    if stream:
+        chapter = await book_chapter_crud.get_chapter_by_id(db=db, chapter_id=chapter_id, book_id=book_id)
+        if not chapter:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Chapter not found for this book")
+        return StreamingResponse(
+            _stream_chapter_ndjson(chapter), media_type="application/x-ndjson", headers={"ETag": etag, "Vary": "Accept"}
+        )
+
     chapter = await book_chapter_crud.get_chapter_by_id( # Use book_chapter_crud
         db=db, chapter_id=chapter_id, book_id=book_id, load_sections=include_sections
     )
@@ -286,6 +432,92 @@ async def get_specific_book_chapter_route(
     else:
         return BookChapterResponseWithoutSections.model_validate(chapter) 
 
+@router.get(
+    "/{book_id}/chapters/{chapter_id}/transcript",
+    response_model=TranscriptWindowResponse,
+    summary="Transcript segments around a playback position"
+)
+async def get_chapter_transcript_window_route(
+    request: Request,
+    book_id: PyUUID,
+    chapter_id: PyUUID,
+    at: float = Query(0, ge=0, description="Playback position in seconds"),
+    before: float = Query(30, ge=0, le=600, description="Seconds of transcript before `at`"),
+    after: float = Query(120, ge=0, le=600, description="Seconds of transcript after `at`"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    The segments overlapping [at - before, at + after], in playback order, read by an index
+    on (chapter, start time) - the rest of the transcript is never loaded.
+    """
+    version = await book_chapter_crud.get_version(db, BookChapter.id == chapter_id, BookChapter.book_id == book_id)
+    if not version:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Chapter not found for this book")
+    from_seconds, to_seconds = max(0.0, at - before), at + after
+    etag = make_etag("transcript", *version, from_seconds, to_seconds)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    segments = await transcript_segment_crud.get_window(
+        db, chapter_id=chapter_id, from_seconds=from_seconds, to_seconds=to_seconds,
+        limit=settings.TRANSCRIPT_WINDOW_MAX_SEGMENTS,
+    )
+    body = TranscriptWindowResponse(
+        chapter_id=chapter_id, from_seconds=from_seconds, to_seconds=to_seconds,
+        segments=[TranscriptSegmentResponse.model_validate(segment) for segment in segments],
+    )
+    response = json_bytes_response(json_dumps(body))
+    response.headers["ETag"] = etag
+    return response
+
+@router.put(
+    "/{book_id}/chapters/{chapter_id}/transcript",
+    response_model=TranscriptReplaceResponse,
+    summary="Replace a chapter's timed transcript"
+)
+async def replace_chapter_transcript_route(
+    book_id: PyUUID,
+    chapter_id: PyUUID,
+    transcript_in: TranscriptSegmentsReplace,
+    current_user: User = Depends(get_current_active_admin),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Stores the segments and their joined text as the chapter's `transcript`. Requires Admin role."""
+    chapter = await book_chapter_crud.get_chapter_by_id(db=db, chapter_id=chapter_id, book_id=book_id)
+    if not chapter:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Chapter not found for this book")
+    count = await transcript_segment_crud.replace_for_chapter(db, chapter=chapter, segments=transcript_in.segments)
+    return TranscriptReplaceResponse(
+        chapter_id=chapter_id, segment_count=count,
+        end_seconds=max((segment.end_seconds for segment in transcript_in.segments), default=None),
+    )
+
+@router.post(
+    "/{book_id}/chapters/{chapter_id}/transcript/file",
+    response_model=TranscriptReplaceResponse,
+    summary="Replace a chapter's timed transcript from a WebVTT or SRT file"
+)
+async def upload_chapter_transcript_route(
+    book_id: PyUUID,
+    chapter_id: PyUUID,
+    file: UploadFile = File(..., description="`.vtt` or `.srt` captions"),
+    current_user: User = Depends(get_current_active_admin),
+    db: AsyncSession = Depends(get_async_db)
+):
+    if not (file.filename or "").lower().endswith(CAPTION_FORMATS):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Expected a .vtt or .srt file")
+    chapter = await book_chapter_crud.get_chapter_by_id(db=db, chapter_id=chapter_id, book_id=book_id)
+    if not chapter:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Chapter not found for this book")
+    try:
+        segments = parse_captions((await file.read()).decode("utf-8"))
+    except (ValueError, UnicodeDecodeError) as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Could not read the captions: {e}")
+    count = await transcript_segment_crud.replace_for_chapter(db, chapter=chapter, segments=segments)
+    return TranscriptReplaceResponse(
+        chapter_id=chapter_id, segment_count=count, end_seconds=max(segment.end_seconds for segment in segments)
+    )
+
 @router.get(
     "/{book_id}/chapters", 
     response_model=PaginatedResponse[Any],
@@ -296,9 +528,24 @@ async def list_book_chapters_paginated_route(
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
     include_sections: bool = Query(False, description="Whether to include sections (only applicable for TEXT books)"),
+    from_chapter: Optional[int] = Query(None, alias="from", ge=1, description="Range mode: first chapter_number to return (see below)"),
+    to_chapter: Optional[int] = Query(None, alias="to", ge=1, description="Range mode: last chapter_number to return (defaults to `from`)"),
     current_user: User = Depends(get_current_user), # Optional, depends on your auth flow
     db: AsyncSession = Depends(get_async_db)
 ):
+    """
+    Paginated chapters by skip/limit.
+
+    With `from` (and `to`), returns chapters from..to as a BookChapterRangeResponse instead, so a
+    reader can prefetch the next few chapters in one request. Each item carries the ETag the
+    single-chapter route would send; list the ETags already held in If-None-Match and those
+    chapters come back as `not_modified` stubs without being loaded.
+    """
+    if from_chapter is not None:
+        return await _chapter_range(
+            request, db, book_id=book_id, from_chapter=from_chapter,
+            to_chapter=to_chapter or from_chapter, include_sections=include_sections,
+        )
     book = await book_crud.get_book(db, content_id=book_id) # from CRUDBook
     if not book:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Book not found")
@@ -307,8 +554,8 @@ async def list_book_chapters_paginated_route(
 
     if book_actual_content_type == ModelContentTypeEnum.PDF:
         # Return empty paginated response or 400
-        return PaginatedResponse[BookChapterResponseWithoutSections]( # Or just Any
-            total_count=0, limit=limit, skip=skip, items=[] 
+        return json_bytes_response(
+            paginated_body(BookChapterResponseWithoutSections, [], total_count=0, skip=skip, limit=limit)
         )
         # Alternatively:
         # raise HTTPException(status_code=400, detail="PDF books do not have a chapter list.")
@@ -319,36 +566,105 @@ async def list_book_chapters_paginated_route(
     chapter_models, total_count = await book_chapter_crud.get_chapters_for_book_and_count(
         db=db, book_id=book_id, skip=skip, limit=limit, load_sections=should_load_sections_for_crud
     )
-    
-    next_page = None
-    if (skip + limit) < total_count:
-        next_params = request.query_params._dict.copy()
-        next_params["skip"] = str(skip + limit)
-        next_params["limit"] = str(limit)
-        next_page = str(request.url.replace_query_params(**next_params))
-
-    prev_page = None
-    if skip > 0:
-        prev_params = request.query_params._dict.copy()
-        prev_params["skip"] = str(max(0, skip - limit))
-        prev_params["limit"] = str(limit)
-        prev_page = str(request.url.replace_query_params(**prev_params))
-
-    processed_items = []
-    if should_load_sections_for_crud: # Returning BookChapterResponse
-        for chapter_model in chapter_models:
-            processed_items.append(BookChapterResponse.model_validate(chapter_model))
-        return PaginatedResponse[BookChapterResponse](
-            total_count=total_count, limit=limit, skip=skip, 
-            next_page=next_page, prev_page=prev_page, items=processed_items
+
+    # BookChapterResponse when sections were loaded, BookChapterResponseWithoutSections otherwise
+    item_schema = BookChapterResponse if should_load_sections_for_crud else BookChapterResponseWithoutSections
+    return json_bytes_response(
+        paginated_body(item_schema, chapter_models, total_count=total_count, skip=skip, limit=limit, request=request)
+    )
+
+async def _chapter_range(
+    request: Request, db: AsyncSession, *, book_id: PyUUID, from_chapter: int, to_chapter: int, include_sections: bool
+) -> Response:
+    if to_chapter < from_chapter or to_chapter - from_chapter + 1 > settings.CHAPTER_RANGE_MAX:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"`to` must be between `from` and `from` + {settings.CHAPTER_RANGE_MAX - 1}",
+        )
+    if not await book_crud.get_book_version(db, str(book_id)):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Book not found")
+    bounds = {"book_id": book_id, "from_number": from_chapter, "to_number": to_chapter}
+
+    held = {tag.strip().removeprefix("W/") for tag in request.headers.get("if-none-match", "").split(",") if tag.strip()}
+    etags, stubs = {}, {}
+    if held:
+        # Versions first, so only the chapters the client doesn't have are loaded
+        for row in await book_chapter_crud.get_chapter_range_versions(db, include_sections=include_sections, **bounds):
+            etags[row.id] = _chapter_etag(include_sections, *row[1:])
+            if etags[row.id] in held:
+                stubs[row.id] = BookChapterRangeItem(
+                    id=row.id, chapter_number=row.chapter_number, etag=etags[row.id], not_modified=True
+                )
+    chapters = []
+    if not etags or len(stubs) < len(etags):
+        chapters = await book_chapter_crud.get_chapter_range(
+            db, load_sections=include_sections, chapter_ids=[chapter_id for chapter_id in etags if chapter_id not in stubs] if etags else None, **bounds
         )
-    else: # Returning BookChapterResponseWithoutSections
-        for chapter_model in chapter_models:
-            processed_items.append(BookChapterResponseWithoutSections.model_validate(chapter_model))
-        return PaginatedResponse[BookChapterResponseWithoutSections](
-            total_count=total_count, limit=limit, skip=skip,
-            next_page=next_page, prev_page=prev_page, items=processed_items
+
+    items = dict(stubs)
+    for chapter in chapters:
+        if include_sections:
+            version = (
+                chapter.id, chapter.updated_at, len(chapter.sections),
+                max((section.updated_at for section in chapter.sections), default=None),
+            )
+            body = BookChapterResponse.model_validate(chapter)
+        else:
+            version = (chapter.id, chapter.updated_at)
+            body = BookChapterResponseWithoutSections.model_validate(chapter)
+        items[chapter.id] = BookChapterRangeItem(
+            id=chapter.id, chapter_number=chapter.chapter_number, etag=_chapter_etag(include_sections, *version), chapter=body
         )
+    response = json_bytes_response(json_dumps(BookChapterRangeResponse(
+        book_id=book_id, from_chapter=from_chapter, to_chapter=to_chapter,
+        chapters=sorted(items.values(), key=lambda item: item.chapter_number),
+    )))
+    response.headers["Vary"] = "If-None-Match"
+    return response
+
+# Declared before the /{chapter_id} routes so "order" isn't taken for a chapter id
+@router.put(
+    "/{book_id}/chapters/order",
+    status_code=status.HTTP_204_NO_CONTENT
+)
+async def reorder_book_chapters_route(
+    book_id: PyUUID,
+    order_in: BookChapterReorderRequest,
+    current_user: User = Depends(get_current_active_admin),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Renumber all chapters of a book in one request. Requires Admin role.
+    `chapter_ids` must list every chapter of the book exactly once; they become chapters 1..n.
+    """
+    try:
+        await book_chapter_crud.reorder_chapters(db=db, book_id=book_id, chapter_ids=order_in.chapter_ids)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return
+
+@router.put(
+    "/{book_id}/chapters/{chapter_id}/sections/order",
+    status_code=status.HTTP_204_NO_CONTENT
+)
+async def reorder_chapter_sections_route(
+    book_id: PyUUID,
+    chapter_id: PyUUID,
+    order_in: BookSectionReorderRequest,
+    current_user: User = Depends(get_current_active_admin),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Reorder all sections of a chapter in one request. Requires Admin role.
+    `section_ids` must list every section of the chapter exactly once; they get section_order 0..n-1.
+    """
+    if not await book_chapter_crud.get_version(db, BookChapter.id == chapter_id, BookChapter.book_id == book_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Chapter not found or does not belong to this book")
+    try:
+        await book_section_crud.reorder_sections(db=db, chapter_id=chapter_id, section_ids=order_in.section_ids)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return
 
 @router.put(
     "/{book_id}/chapters/{chapter_id}",
@@ -483,24 +799,8 @@ async def list_book_sections_paginated_route(
         db=db, chapter_id=chapter_id, skip=skip, limit=limit
     )
     print(sections, total_count)
-    # Construct next and previous page URLs
-    next_page = None
-    if (skip + limit) < total_count:
-        next_params = request.query_params._dict.copy()
-        next_params["skip"] = str(skip + limit)
-        next_params["limit"] = str(limit)
-        next_page = str(request.url.replace_query_params(**next_params))
-
-    prev_page = None
-    if skip > 0:
-        prev_params = request.query_params._dict.copy()
-        prev_params["skip"] = str(max(0, skip - limit))
-        prev_params["limit"] = str(limit)
-        prev_page = str(request.url.replace_query_params(**prev_params))
-
-    return PaginatedResponse[BookSectionResponse](
-        total_count=total_count, limit=limit, skip=skip,
-        next_page=next_page, prev_page=prev_page, items=sections
+    return json_bytes_response(
+        paginated_body(BookSectionResponse, sections, total_count=total_count, skip=skip, limit=limit, request=request)
     )
 
 @router.put(
@@ -554,6 +854,7 @@ async def delete_book_section_route(
     response_model=BookTableOfContentsResponse
 )
 async def get_book_table_of_contents_route(
+    request: Request,
     book_id_or_slug: str, # Allow fetching by slug as well
     current_user: User = Depends(get_current_user), # Optional, depends on your auth flow
     db: AsyncSession = Depends(get_async_db)
@@ -563,59 +864,194 @@ async def get_book_table_of_contents_route(
     For AUDIO books, it includes audio_url for each chapter.
     For TEXT books, it includes nested sections for each chapter.
     """
-    # --- MODIFICATION: Fetch by slug or ID ---
-    book_with_structure: Optional[Content] = None
-    try:
-        book_uuid = PyUUID(book_id_or_slug)
-        book_with_structure = await book_crud.get_book_table_of_contents(db=db, book_id=book_uuid)
-    except ValueError:
-        # Assuming you add a get_by_slug_with_chapters to your CRUD
-        # For now, let's assume get_book_table_of_contents can handle this, or you add a new method
-        # Let's mock a new CRUD method for clarity:
-        book_with_structure = await book_crud.get_book_toc_by_slug(db=db, slug=book_id_or_slug)
+    book = await book_crud.get_book_toc_header(db, book_id_or_slug)
+    if not book:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Book not found")
+    etag = make_etag("toc", book.id, book.updated_at)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    async def build_toc(db: AsyncSession):
+        # Determine the book's format to build the correct response
+        book_format = ModelContentTypeEnum(book.content_type)
+        rows = await book_crud.get_book_toc_rows(
+            db, book.id, include_sections=book_format == ModelContentTypeEnum.BOOK
+        )
+
+        # Rows arrive ordered by chapter_number (then section_order); group them by chapter
+        toc_chapters = {}
+        for row in rows:
+            chapter = toc_chapters.get(row.id)
+            if chapter is None:
+                chapter = toc_chapters[row.id] = TOCChapterItem(
+                    id=row.id,
+                    title=row.title,
+                    chapter_number=row.chapter_number,
+                    # For audio books, add the audio_url; audiobooks don't have text sections
+                    audio_url=row.audio_url if book_format == ModelContentTypeEnum.AUDIO else None,
+                    word_count=row.word_count,
+                    reading_time_seconds=row.reading_time_seconds,
+                    listening_time_seconds=row.listening_time_seconds,
+                )
+            if book_format == ModelContentTypeEnum.BOOK and row.section_id is not None: # This is your 'TEXT' book
+                chapter.sections.append(
+                    TOCSectionItem(id=row.section_id, title=row.section_title, section_order=row.section_order)
+                )
+
+        return BookTableOfContentsResponse(
+            book_id=book.id,
+            book_title=book.title,
+            cover_image_url=book.cover_image_url,
+            thumbnail_url=book.thumbnail_url,
+            word_count=book.word_count,
+            reading_time_seconds=book.reading_time_seconds,
+            listening_time_seconds=book.listening_time_seconds,
+            chapters=list(toc_chapters.values()),
+        )
+
+    # Keyed on the book version rather than the URL: id and slug requests share one entry
+    response = await response_cache.get_or_set(
+        f"{response_cache.namespace}:toc:{book.id}:{book.updated_at.isoformat() if book.updated_at else ''}",
+        build_toc,
+        db=db,
+        tags=[entity_tag("content", book.id)],
+    )
+    response.headers["ETag"] = etag
+    return response
 
 
-    if not book_with_structure:
+@router.get(
+    "/{book_id_or_slug}/search",
+    response_model=PaginatedResponse[BookSearchHit],
+    summary="Search the text of one book",
+)
+async def search_book_route(
+    request: Request,
+    book_id_or_slug: str,
+    q: str = Query(..., min_length=1, max_length=200, description='Words to find; supports "quoted phrases", -excluded and OR'),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=50),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Sections of the book matching the query, most relevant first, each with its chapter
+    and a highlighted snippet. Results are versioned on the book's updated_at like the TOC,
+    so repeated searches are answered from the cache or with 304.
+    """
+    book = await book_crud.get_book_toc_header(db, book_id_or_slug)
+    if not book:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Book not found")
+    etag = make_etag("search", book.id, book.updated_at, q, skip, limit)
+    if etag_matches(request, etag):
+        return not_modified(etag)
 
-    # --- CORE LOGIC MODIFICATION ---
-    # Determine the book's format to build the correct response
-    book_format = ModelContentTypeEnum(book_with_structure.content_type)
-    
-    toc_chapters = []
-    if book_with_structure.chapters:
-        for chapter_model in sorted(book_with_structure.chapters, key=lambda c: c.chapter_number):
-            
-            # Initialize chapter data
-            chapter_data = {
-                "id": chapter_model.id,
-                "title": chapter_model.title,
-                "chapter_number": chapter_model.chapter_number
-            }
-
-            # Populate format-specific data
-            if book_format == ModelContentTypeEnum.AUDIO:
-                # For audio books, add the audio_url
-                chapter_data["audio_url"] = chapter_model.audio_url
-                chapter_data["sections"] = [] # Audiobooks don't have text sections in this model
-            
-            elif book_format == ModelContentTypeEnum.BOOK: # This is your 'TEXT' book
-                # For text books, populate the sections
-                toc_sections = []
-                if chapter_model.sections:
-                    for section_model in sorted(chapter_model.sections, key=lambda s: s.section_order):
-                        toc_sections.append(
-                            TOCSectionItem.model_validate(section_model)
-                        )
-                chapter_data["sections"] = toc_sections
-
-            # Create the Pydantic model from the constructed dictionary
-            toc_chapters.append(TOCChapterItem(**chapter_data))
-            
-    # Construct the final response, now including the cover_image_url
-    return BookTableOfContentsResponse(
-        book_id=book_with_structure.id,
-        book_title=book_with_structure.title,
-        cover_image_url=book_with_structure.cover_image_url, # Add the cover image
-        chapters=toc_chapters
-    )
\ No newline at end of file
+    async def build_results(db: AsyncSession):
+        hits, total_count = await book_section_crud.search_book(db, book_id=book.id, query=q, skip=skip, limit=limit)
+        return paginated_body(BookSearchHit, hits, total_count=total_count, skip=skip, limit=limit, request=request)
+
+    response = await response_cache.get_or_set(
+        response_cache.build_key(request, visibility_scope(current_user), etag),
+        build_results,
+        db=db,
+        tags=[entity_tag("content", book.id)],
+    )
+    response.headers["ETag"] = etag
+    return response
+
+
+@router.get(
+    "/{book_id_or_slug}/transcript/search",
+    response_model=PaginatedResponse[TranscriptSearchHit],
+    summary="Find where a phrase is spoken in a book's audio/video chapters",
+)
+async def search_book_transcripts_route(
+    request: Request,
+    book_id_or_slug: str,
+    q: str = Query(..., min_length=1, max_length=200, description='Words to find; supports "quoted phrases", -excluded and OR'),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=50),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Transcript segments matching the query, most relevant first, each with the chapter and
+    the start_seconds to seek to. Versioned on the book's updated_at like the section search.
+    """
+    book = await book_crud.get_book_toc_header(db, book_id_or_slug)
+    if not book:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Book not found")
+    etag = make_etag("transcript-search", book.id, book.updated_at, q, skip, limit)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    async def build_results(db: AsyncSession):
+        hits, total_count = await transcript_segment_crud.search_book(db, book_id=book.id, query=q, skip=skip, limit=limit)
+        return paginated_body(TranscriptSearchHit, hits, total_count=total_count, skip=skip, limit=limit, request=request)
+
+    response = await response_cache.get_or_set(
+        response_cache.build_key(request, visibility_scope(current_user), etag),
+        build_results,
+        db=db,
+        tags=[entity_tag("content", book.id)],
+    )
+    response.headers["ETag"] = etag
+    return response
+
+
+def _bundle_building(book_id: PyUUID, key: str) -> Response:
+    """Schedule a build of `key` and answer 202 with Retry-After."""
+    bundle_builder.schedule(book_id, key)
+    retry_after = settings.BOOK_BUNDLE_RETRY_AFTER
+    return Response(
+        json_dumps(BookBundleStatus(retry_after=retry_after)),
+        status_code=status.HTTP_202_ACCEPTED,
+        media_type="application/json",
+        headers={"Retry-After": str(retry_after), "Cache-Control": "no-store"},
+    )
+
+
+@router.get(
+    "/{book_id_or_slug}/bundle",
+    summary="Download a whole book for offline reading",
+    responses={
+        200: {"content": {BUNDLE_MEDIA_TYPE: {}}, "description": "The gzipped JSON bundle (206 for a Range request)"},
+        202: {"model": BookBundleStatus, "description": "The bundle for the current version is being built"},
+    },
+)
+async def get_book_bundle_route(
+    request: Request,
+    book_id_or_slug: str,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Book metadata, table of contents, every chapter with all of its sections and a media URL
+    manifest in one gzipped JSON file, versioned by the book's updated_at (see
+    app/services/book_bundles.py for the layout).
+
+    The bundle is built in the background: the first request after an edit gets 202 with
+    Retry-After. Local bundles support Range / If-Range so interrupted downloads resume;
+    S3 bundles redirect to a short-lived presigned URL.
+    """
+    book = await book_crud.get_book_toc_header(db, book_id_or_slug)
+    if not book:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Book not found")
+    key = bundle_key(book.id, book.updated_at)
+    etag = make_etag("bundle", key)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    filename = bundle_filename(book_id_or_slug, key)
+    if isinstance(bundle_store, LocalBundleStore):
+        # No separate existence check: a concurrent build may prune the file in between,
+        # so it is opened once and a missing file is treated like a bundle not built yet
+        try:
+            return range_file_response(
+                request, bundle_store.path(key), media_type=BUNDLE_MEDIA_TYPE, etag=etag, filename=filename
+            )
+        except FileNotFoundError:
+            return _bundle_building(book.id, key)
+    if await bundle_store.size(key) is None:
+        return _bundle_building(book.id, key)
+    return RedirectResponse(bundle_store.url(key, filename), status_code=status.HTTP_307_TEMPORARY_REDIRECT)
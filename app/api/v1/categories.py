@@ -1,5 +1,5 @@
 # app/api/v1/categories.py
-from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from uuid import UUID as PyUUID
@@ -7,10 +7,13 @@ from uuid import UUID as PyUUID
 from app.models.user import User
 from app.dependencies import get_current_user, get_current_active_moderator_or_admin
 from app.dependencies import get_async_db, get_current_active_admin
-from app.schemas.category import CategoryCreate, CategoryResponse, CategoryUpdate
+from app.schemas.category import CategoryCreate, CategoryResponse, CategoryUpdate, CategoryTreeNode
 from app.schemas.pagination import PaginatedResponse
 from app.crud.category import category_crud
 from app.models.category import CategoryScopeType, Category
+from app.utils.cache import entity_tag, response_cache, visibility_scope
+from app.services.category_tree import build_category_tree, category_tree, dump_category_tree
+from app.utils.serialization import list_body
 
 router = APIRouter()
 
@@ -57,18 +60,16 @@ async def list_categories_by_type(
         except ValueError:
             raise HTTPException(status_code=400, detail="Invalid parent_id format.")
 
-    categories, total_count = await category_crud.get_categories_by_type( # Make sure CRUD method uses 'scope' or 'type' consistently
-        db=db, 
-        type=type, # Pass the enum member directly
-        parent_id=parent_uuid,
-        #skip=skip, 
-        #limit=limit,
-        #load_children=load_children_in_list # Use the query param
-    )
-    response_items = []
-    for cat_model in categories:
-
-        response_items.append(CategoryResponse.model_validate(cat_model))
+    async def build_categories(db: AsyncSession):
+        categories, total_count = await category_crud.get_categories_by_type( # Make sure CRUD method uses 'scope' or 'type' consistently
+            db=db, 
+            type=type, # Pass the enum member directly
+            parent_id=parent_uuid,
+            #skip=skip, 
+            #limit=limit,
+            #load_children=load_children_in_list # Use the query param
+        )
+        return list_body(CategoryResponse, categories)
     '''
     next_page = None
     if (skip + limit) < total_count:
@@ -93,7 +94,52 @@ async def list_categories_by_type(
         items=response_items
     )
     '''
-    return response_items
+    return await response_cache.get_or_set(
+        response_cache.build_key(request, visibility_scope(current_user)),
+        build_categories,
+        db=db,
+        tags=[entity_tag("categories")],
+    )
+
+@router.get(
+    "/tree",
+    response_model=List[CategoryTreeNode],
+    tags=[CATEGORY_TAG],
+    summary="Full category tree for a type"
+)
+async def get_category_tree(
+    type: CategoryScopeType,
+    current_user: User = Depends(get_current_user),
+):
+    # Served from the per-type in-memory tree; rebuilt after any category write.
+    # The enum keeps that cache to one entry per scope: unknown types get a 422.
+    return Response(content=await category_tree.get(type.value), media_type="application/json")
+
+@router.get(
+    "/{category_id}/tree",
+    response_model=List[CategoryTreeNode],
+    tags=[CATEGORY_TAG],
+    summary="A category with all of its descendants"
+)
+async def get_category_subtree(
+    request: Request,
+    category_id: PyUUID,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    async def build_subtree(db: AsyncSession):
+        categories = await category_crud.get_subtree(db, category_id) # One query via the closure table
+        if not categories:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Category not found")
+        return dump_category_tree(build_category_tree(categories, root_id=category_id))
+
+    return await response_cache.get_or_set(
+        response_cache.build_key(request, visibility_scope(current_user)),
+        build_subtree,
+        db=db,
+        tags=[entity_tag("categories")],
+    )
+
 @router.get(
     "/{category_id_or_slug}", 
     response_model=CategoryResponse, 
@@ -101,22 +147,31 @@ async def list_categories_by_type(
     summary="Get a specific category by ID or slug"
 )
 async def get_single_category(
+    request: Request,
     category_id_or_slug: str,
     #load_children: bool = Query(False, description="Whether to load direct children"),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_async_db)
 ):
-    category: Optional[Category] = None
-    try:
-        cat_uuid = PyUUID(category_id_or_slug)
-        category = await category_crud.get(db, id=cat_uuid)
-    except ValueError: # Not a UUID, try slug
-        # If loading children by slug, get_category_by_slug needs to be adapted or do a two-step fetch
-        category = await category_crud.get_category_by_slug(db, slug=category_id_or_slug)
+    async def build_category(db: AsyncSession):
+        category: Optional[Category] = None
+        try:
+            cat_uuid = PyUUID(category_id_or_slug)
+            category = await category_crud.get(db, id=cat_uuid)
+        except ValueError: # Not a UUID, try slug
+            # If loading children by slug, get_category_by_slug needs to be adapted or do a two-step fetch
+            category = await category_crud.get_category_by_slug(db, slug=category_id_or_slug)
 
-    if not category:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Category not found")
-    return category
+        if not category:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Category not found")
+        return CategoryResponse.model_validate(category)
+
+    return await response_cache.get_or_set(
+        response_cache.build_key(request, visibility_scope(current_user)),
+        build_category,
+        db=db,
+        tags=lambda res: [entity_tag("categories", res.id)],
+    )
 
 
 @router.put(
@@ -8,6 +8,7 @@ from app.models.user import User
 from app.crud import chat_with_guruji_crud
 from app.schemas import ChatWithGurujiCreate, ChatWithGurujiUpdate, ChatWithGurujiResponse, PaginatedResponse
 from app.database import get_async_db
+from app.utils.serialization import json_bytes_response, paginated_body
 
 
 router = APIRouter()
@@ -53,26 +54,8 @@ async def list_all_chats(
         skip=skip,
         limit=limit,
     )
-    response_items = [ChatWithGurujiResponse.model_validate(p) for p in chats]
-
-    base_url = str(request.url.remove_query_params(keys=["skip", "limit"]))
-    next_page = prev_page = None
-    if (skip + limit) < total_count:
-        next_params = request.query_params._dict.copy()
-        next_params["skip"] = str(skip + limit)
-        next_page = str(request.url.replace_query_params(**next_params))
-    if skip > 0:
-        prev_params = request.query_params._dict.copy()
-        prev_params["skip"] = str(max(0, skip - limit))
-        prev_page = str(request.url.replace_query_params(**prev_params))
-
-    return PaginatedResponse[ChatWithGurujiResponse](
-        total_count=total_count,
-        limit=limit,
-        skip=skip,
-        next_page=next_page,
-        prev_page=prev_page,
-        items=response_items
+    return json_bytes_response(
+        paginated_body(ChatWithGurujiResponse, chats, total_count=total_count, skip=skip, limit=limit, request=request)
     )
 
 
@@ -13,6 +13,9 @@ from app.schemas.pagination import PaginatedResponse
 from app.crud.collection import collection_crud, collection_item_crud
 from app.models.user import User
 from app.models.content import Content
+from app.utils.cache import entity_tag, response_cache, visibility_scope
+from app.utils.etag import etag_matches, make_etag, not_modified
+from app.utils.serialization import paginated_body
 
 router = APIRouter()
 COLLECTION_TAG = "Collections"
@@ -44,46 +47,55 @@ async def list_all_collections_api(
     current_user: User = Depends(get_current_user), # Optional: if you want to filter by user
     db: AsyncSession = Depends(get_async_db),
 ):
-    # For public listing, default is_public=True
-    collections, total_count = await collection_crud.get_all_collections_and_count(
-        db, skip=skip, limit=limit, is_public=True, is_featured=is_featured , load_items_with_content=True#, curator_id=None
-    )
-    # These collection responses will have empty items list by default, which is fine for a list view.
-    # If you wanted to show item counts, you'd need another query or a hybrid property on Collection.
-    response_items = [CollectionResponseWithItems.model_validate(col) for col in collections]
-    # ... (pagination next/prev page logic - copy from book.py list endpoint) ...
-    next_page, prev_page = None, None # Placeholder
-    base_url = str(request.url.remove_query_params(keys=['skip', 'limit']))
-    if (skip + limit) < total_count:
-        next_page_url_params = request.query_params._dict.copy()
-        next_page_url_params["skip"] = str(skip + limit)
-        next_page = str(request.url.replace_query_params(**next_page_url_params))
-    if skip > 0:
-        prev_page_url_params = request.query_params._dict.copy()
-        prev_page_url_params["skip"] = str(max(0, skip - limit))
-        prev_page = str(request.url.replace_query_params(**prev_page_url_params))
+    async def build_page(db: AsyncSession):
+        # For public listing, default is_public=True
+        collections, total_count = await collection_crud.get_all_collections_and_count(
+            db, skip=skip, limit=limit, is_public=True, is_featured=is_featured , load_items_with_content=True#, curator_id=None
+        )
+        # These collection responses will have empty items list by default, which is fine for a list view.
+        # If you wanted to show item counts, you'd need another query or a hybrid property on Collection.
+        return paginated_body(
+            CollectionResponseWithItems, collections, total_count=total_count, skip=skip, limit=limit, request=request
+        )
 
-    return PaginatedResponse[CollectionResponseWithItems](
-        total_count=total_count, limit=limit, skip=skip, 
-        next_page=next_page, prev_page=prev_page, items=response_items
+    # Items embed their content, so content edits invalidate the page too
+    return await response_cache.get_or_set(
+        response_cache.build_key(request, visibility_scope(current_user)),
+        build_page,
+        db=db,
+        tags=[entity_tag("collections"), entity_tag("content")],
     )
 
 @router.get("/{collection_id_or_slug}", response_model=CollectionResponseWithItems, tags=[COLLECTION_TAG])
 async def get_single_collection_api(
+    request: Request,
     collection_id_or_slug: str,
     current_user: User = Depends(get_current_user), # Optional: if you want to check permissions
     db: AsyncSession = Depends(get_async_db)
 ):
-    collection_model_from_db = None # Renamed for clarity
-    try:
-        collection_uuid = PyUUID(collection_id_or_slug)
-        collection_model_from_db = await collection_crud.get_collection_by_id(
-            db, collection_id=collection_uuid, load_items_with_content=True
-        )
-    except ValueError:
-        collection_model_from_db = await collection_crud.get_collection_by_slug(
-            db, slug=collection_id_or_slug, load_items_with_content=True
-        )
+    collection_id = await collection_crud.resolve_id(db, collection_id_or_slug)
+    # The ETag also covers the items and their embedded content, so editing any of them changes it
+    version = collection_id and await collection_crud.get_public_collection_version(db, collection_id)
+    if not version:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Collection not found or not public")
+    etag = make_etag("collection", *version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    response = await response_cache.get_or_set(
+        response_cache.entity_key("collection", collection_id, visibility_scope(current_user), etag),
+        lambda session: _build_collection_with_items(session, collection_id),
+        db=db,
+        tags=lambda res: [entity_tag("collections", res.id)] + [entity_tag("content", item.content_id) for item in res.items],
+    )
+    response.headers["ETag"] = etag
+    return response
+
+
+async def _build_collection_with_items(db: AsyncSession, collection_id: PyUUID) -> CollectionResponseWithItems:
+    collection_model_from_db = await collection_crud.get_collection_by_id(
+        db, collection_id=collection_id, load_items_with_content=True
+    )
     
     if not collection_model_from_db or not collection_model_from_db.is_public:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Collection not found or not public")
@@ -244,41 +256,31 @@ async def list_items_in_collection_api(
     db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user) # Optional: if collection visibility depends on user
 ):
-    # Check if collection exists and if user has permission to view it
-    collection = await collection_crud.get_collection_by_id(db, collection_id=collection_id)
-    if not collection:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Collection not found")
+    async def build_page(db: AsyncSession):
+        # Check if collection exists and if user has permission to view it
+        collection = await collection_crud.get_collection_by_id(db, collection_id=collection_id)
+        if not collection:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Collection not found")
 
-    # TODO: Add permission check if the collection is private
-    # if not collection.is_public and (not current_user or collection.curator_id != current_user.id):
-    #     raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You do not have permission to view this collection's items")
+        # TODO: Add permission check if the collection is private
+        # if not collection.is_public and (not current_user or collection.curator_id != current_user.id):
+        #     raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You do not have permission to view this collection's items")
 
-    items, total_count = await collection_item_crud.get_items_for_collection_paginated(
-        db=db,
-        collection_id=collection_id,
-        skip=skip,
-        limit=limit,
-        load_content_details=True # Always load for CollectionItemResponse which expects it
-    )
+        items, total_count = await collection_item_crud.get_items_for_collection_paginated(
+            db=db,
+            collection_id=collection_id,
+            skip=skip,
+            limit=limit,
+            load_content_details=True # Always load for CollectionItemResponse which expects it
+        )
+        # The CRUD method already loads content if specified
+        return paginated_body(
+            CollectionItemResponse, items, total_count=total_count, skip=skip, limit=limit, request=request
+        )
 
-    # Construct next and previous page URLs
-    next_page, prev_page = None, None
-    if (skip + limit) < total_count:
-        next_params = request.query_params._dict.copy()
-        next_params["skip"] = str(skip + limit)
-        next_params["limit"] = str(limit) # Ensure limit is also passed for consistency
-        next_page = str(request.url.replace_query_params(**next_params))
-    if skip > 0:
-        prev_params = request.query_params._dict.copy()
-        prev_params["skip"] = str(max(0, skip - limit))
-        prev_params["limit"] = str(limit) # Ensure limit is also passed
-        prev_page = str(request.url.replace_query_params(**prev_params))
-    
-    return PaginatedResponse[CollectionItemResponse](
-        total_count=total_count,
-        limit=limit,
-        skip=skip,
-        next_page=next_page,
-        prev_page=prev_page,
-        items=items # The CRUD method already loads content if specified
+    return await response_cache.get_or_set(
+        response_cache.build_key(request, visibility_scope(current_user)),
+        build_page,
+        db=db,
+        tags=[entity_tag("collections", collection_id), entity_tag("content")],
     )
\ No newline at end of file
@@ -17,6 +17,7 @@ from app.schemas.contact_submission import (
 )
 from app.schemas.pagination import PaginatedResponse
 from app.crud.contact_submission import contact_submission_crud
+from app.utils.serialization import json_bytes_response, paginated_body
 
 router = APIRouter()
 
@@ -65,23 +66,8 @@ async def list_all_contact_submissions(
     submissions, total_count = await contact_submission_crud.get_submissions_paginated(
         db=db, skip=skip, limit=limit, status_filter=status_filter, search_query=search
     )
-    
-    # ... (pagination next/prev page logic from your other endpoints) ...
-    next_page, prev_page = None, None
-    if (skip + limit) < total_count:
-        # Build URL for next page
-        pass
-    if skip > 0:
-        # Build URL for prev page
-        pass
-        
-    return PaginatedResponse[ContactSubmissionResponse](
-        total_count=total_count,
-        limit=limit,
-        skip=skip,
-        next_page=next_page,
-        prev_page=prev_page,
-        items=submissions
+    return json_bytes_response(
+        paginated_body(ContactSubmissionResponse, submissions, total_count=total_count, skip=skip, limit=limit, request=request)
     )
 
 
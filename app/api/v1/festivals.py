@@ -13,9 +13,15 @@ from app.schemas.pagination import PaginatedResponse
 from app.database import get_async_db
 from app.dependencies import get_current_user
 from app.models.user import User
+from app.utils.cache import entity_tag, response_cache, visibility_scope
+from app.utils.fieldsets import FIELDS_QUERY_DESCRIPTION, FieldSet
+from app.utils.serialization import paginated_body
+from app.models.festival import Festival
 
 router = APIRouter()
 
+FESTIVAL_FIELDS = FieldSet(FestivalResponse, Festival)
+
 @router.post("", response_model=FestivalResponse, status_code=status.HTTP_201_CREATED)
 async def create_new_festival(
     festival_in: FestivalCreate,
@@ -65,42 +71,50 @@ async def list_all_festivals(
     # category_id: Optional[PyUUID] = Query(None, description="Filter by Category ID"),
     is_major: Optional[bool] = Query(None, description="Filter by major festivals"),
     search: Optional[str] = Query(None, description="Search by name or description"),
+    fields: Optional[str] = Query(None, description=FIELDS_QUERY_DESCRIPTION),
     current_user: User = Depends(get_current_user), # Optional: if you want to filter by user permissions
     db: AsyncSession = Depends(get_async_db),
 ):
-    festivals, total_count = await festival_crud.get_festivals_paginated(
-        db=db, skip=skip, limit=limit, state_id=state_id, # category_id=category_id,
-        is_major=is_major, search_query=search
-    )
+    selection = FESTIVAL_FIELDS.parse(fields)
+
+    async def build_page(db: AsyncSession):
+        festivals, total_count = await festival_crud.get_festivals_paginated(
+            db=db, skip=skip, limit=limit, state_id=state_id, # category_id=category_id,
+            is_major=is_major, search_query=search, columns=FESTIVAL_FIELDS.columns(selection)
+        )
+        return paginated_body(FESTIVAL_FIELDS.schema_for(selection), festivals, total_count=total_count, skip=skip, limit=limit, request=request)
 
-    # Construct pagination URLs
-    next_page, prev_page = None, None
-    if (skip + limit) < total_count:
-        next_params = request.query_params._dict.copy()
-        next_params["skip"] = str(skip + limit)
-        next_page = str(request.url.replace_query_params(**next_params))
-    if skip > 0:
-        prev_params = request.query_params._dict.copy()
-        prev_params["skip"] = str(max(0, skip - limit))
-        prev_page = str(request.url.replace_query_params(**prev_params))
-        
-    return PaginatedResponse[FestivalResponse](
-        total_count=total_count, limit=limit, skip=skip, 
-        items=festivals, next_page=next_page, prev_page=prev_page
+    return await response_cache.get_or_set(
+        response_cache.build_key(request, visibility_scope(current_user)),
+        build_page,
+        db=db,
+        tags=[entity_tag("festivals")],
     )
 
 
 @router.get("/{festival_id}", response_model=FestivalResponse)
 async def get_single_festival(
+    request: Request,
     festival_id: PyUUID, 
+    fields: Optional[str] = Query(None, description=FIELDS_QUERY_DESCRIPTION),
     current_user: User = Depends(get_current_user), # Optional: if you want to filter by user permissions
     db: AsyncSession = Depends(get_async_db)
 ):
-    festival = await festival_crud.get(db=db, id=festival_id) # CRUDBase get
-    if not festival or festival.is_deleted: # Also check if active for public view
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Festival not found or not active")
-    # await db.refresh(festival, attribute_names=['state']) # If you want to include state details
-    return festival
+    selection = FESTIVAL_FIELDS.parse(fields)
+
+    async def build_festival(db: AsyncSession):
+        festival = await festival_crud.get(db=db, id=festival_id, columns=FESTIVAL_FIELDS.columns(selection)) # CRUDBase get (already skips deleted rows)
+        if not festival: # Also check if active for public view
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Festival not found or not active")
+        # await db.refresh(festival, attribute_names=['state']) # If you want to include state details
+        return FESTIVAL_FIELDS.schema_for(selection).model_validate(festival)
+
+    return await response_cache.get_or_set(
+        response_cache.build_key(request, visibility_scope(current_user)),
+        build_festival,
+        db=db,
+        tags=[entity_tag("festivals", festival_id)],
+    )
 
 
 @router.put("/{festival_id}", response_model=FestivalResponse)
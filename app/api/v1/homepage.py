@@ -1,8 +1,9 @@
 # app/api/v1/homepage.py
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.schemas.homepage import HomepageCard, HomepageCardsResponse
+from app.schemas.homepage import HomepageCard, HomepageCardsResponse, HomepageFeedResponse
+from app.services.homepage_feed import build_homepage_feed
 
 router = APIRouter()
 
@@ -83,4 +84,21 @@ async def get_homepage_features():
 
     # For now, just returning the static list
     cards = [HomepageCard(**card_data) for card_data in HOMEPAGE_CARDS_DATA]
-    return HomepageCardsResponse(cards=cards)
\ No newline at end of file
+    return HomepageCardsResponse(cards=cards)
+
+
+@router.get("/feed", response_model=HomepageFeedResponse)
+async def get_homepage_feed(
+    limit: int = Query(8, ge=1, le=20, description="Items per section"),
+):
+    """
+    Everything the homepage renders below the cards in one call: featured books and
+    collections, upcoming major festivals, featured temples, latest stories and teachings.
+    Sections are fetched concurrently and cached individually (see app/services/homepage_feed.py).
+    """
+    body, section_status = await build_homepage_feed(limit)
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={"X-Cache-Sections": ",".join(f"{name}={status}" for name, status in section_status.items())},
+    )
@@ -1,73 +1,82 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List, Optional
+from fastapi import APIRouter, Depends, Query, Request, Response
+from typing import List
 from uuid import UUID
 
-from sqlalchemy.future import select
-from ...database import get_async_db
-from ...models.location import Region, State, City, Country
-from ...schemas.location import RegionResponse, StateResponse, CityResponse, CountryResponse
+from ...dependencies import get_current_active_admin
+from ...models.user import User
+from ...schemas.location import RegionResponse, StateResponse, CityResponse, CountryResponse, CountryTreeNode
+from ...services.location_tree import location_tree
+from ...utils.etag import etag_matches, not_modified
 
 
 router = APIRouter()
 
 # These APIs are used to fetch country, region, state, city in drop down while creating new place, temple, etc.
+# All of them are served from the in-memory location tree (app/services/location_tree.py): no DB hit per request.
+
+
+def _json(body: bytes) -> Response:
+    return Response(content=body, media_type="application/json")
+
+
+@router.get("/tree", response_model=List[CountryTreeNode])
+async def get_location_tree(request: Request):
+    """
+    Whole country -> region -> state -> city hierarchy in one response, for admin forms.
+    The body is serialized once per reload; clients revalidate with If-None-Match.
+    """
+    snapshot = await location_tree.get()
+    if etag_matches(request, snapshot.tree_etag):
+        return not_modified(snapshot.tree_etag)
+    return Response(content=snapshot.tree_body, media_type="application/json", headers={"ETag": snapshot.tree_etag})
+
+
+@router.post("/refresh")
+async def refresh_location_tree(current_user: User = Depends(get_current_active_admin)):
+    """Reload the location tree after editing location tables outside the API (seeds, SQL)."""
+    snapshot = await location_tree.refresh()
+    return snapshot.counts
 
 
 @router.get("/countries", response_model=List[CountryResponse])
-async def get_all_countries(db: AsyncSession = Depends(get_async_db)):
-    query = select(Country).where(Country.is_deleted.is_(False))
-    result = await db.execute(query)
-    countries = result.scalars().all()
-    return countries
+async def get_all_countries():
+    snapshot = await location_tree.get()
+    return _json(snapshot.countries_body)
 
 
 @router.get("/countries/regions", response_model=List[RegionResponse])
 async def get_all_regions(
     country_id: UUID = Query(default=UUID("ed2cff2f-6065-4a63-a921-73b2af99a0b9"), description="ID of the country to fetch regions for"),
-    db: AsyncSession = Depends(get_async_db)
 ):
-    query = select(Region).where(Region.country_id == country_id, Region.is_deleted.is_(False))
-    result = await db.execute(query)
-    regions = result.scalars().all()
-    return regions
+    snapshot = await location_tree.get()
+    return _json(snapshot.children(snapshot.regions_by_country, country_id))
 
 
 @router.get("/regions", response_model=List[RegionResponse])
-async def get_all_regions(db: AsyncSession = Depends(get_async_db)):
-    query = select(Region).where(Region.is_deleted.is_(False))
-    result = await db.execute(query)
-    regions = result.scalars().all()
-    return regions
+async def get_all_regions():
+    snapshot = await location_tree.get()
+    return _json(snapshot.regions_body)
 
 
 @router.get("/regions/{region_id}/states", response_model=List[StateResponse])
-async def get_states_by_region(region_id: UUID, db: AsyncSession = Depends(get_async_db)):
-    query = select(State).where(State.region_id == region_id, State.is_deleted.is_(False))
-    result = await db.execute(query)
-    states = result.scalars().all()
-    return states
+async def get_states_by_region(region_id: UUID):
+    snapshot = await location_tree.get()
+    return _json(snapshot.children(snapshot.states_by_region, region_id))
 
 
 @router.get("/states", response_model=List[StateResponse])
-async def get_all_states(db: AsyncSession = Depends(get_async_db)):
-    query = select(State).where(State.is_deleted.is_(False))
-    result = await db.execute(query)
-    states = result.scalars().all()
-    return states
+async def get_all_states():
+    snapshot = await location_tree.get()
+    return _json(snapshot.states_body)
 
 
 @router.get("/states/{state_id}/cities", response_model=List[CityResponse])
-async def get_cities_by_state(state_id: UUID, db: AsyncSession = Depends(get_async_db)):
-    query = select(City).where(City.state_id == state_id, City.is_deleted.is_(False))
-    result = await db.execute(query)
-    cities = result.scalars().all()
-    return cities
+async def get_cities_by_state(state_id: UUID):
+    snapshot = await location_tree.get()
+    return _json(snapshot.children(snapshot.cities_by_state, state_id))
 
 
 @router.get("/cities", response_model=List[CityResponse])
-async def get_all_cities(db: AsyncSession = Depends(get_async_db)):
-    query = select(City).where(City.is_deleted.is_(False))
-    result = await db.execute(query)
-    cities = result.scalars().all()
-    return cities
\ No newline at end of file
+async def get_all_cities():
+    snapshot = await location_tree.get()
+    return _json(snapshot.cities_body)
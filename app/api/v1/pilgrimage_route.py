@@ -12,6 +12,7 @@ from app.schemas import (
 )
 from app.database import get_async_db
 from app.schemas.pilgrimage_route import DifficultyType, DurationType
+from app.utils.serialization import json_bytes_response, paginated_body
 
 router = APIRouter()
 
@@ -67,26 +68,8 @@ async def list_all_pilgrimage_routes(
         skip=skip,
         limit=limit,
     )
-    response_items = [PilgrimageRouteResponse.model_validate(p) for p in routes]
-
-    base_url = str(request.url.remove_query_params(keys=["skip", "limit"]))
-    next_page = prev_page = None
-    if (skip + limit) < total_count:
-        next_params = request.query_params._dict.copy()
-        next_params["skip"] = str(skip + limit)
-        next_page = str(request.url.replace_query_params(**next_params))
-    if skip > 0:
-        prev_params = request.query_params._dict.copy()
-        prev_params["skip"] = str(max(0, skip - limit))
-        prev_page = str(request.url.replace_query_params(**prev_params))
-
-    return PaginatedResponse[PilgrimageRouteResponse](
-        total_count=total_count,
-        limit=limit,
-        skip=skip,
-        next_page=next_page,
-        prev_page=prev_page,
-        items=response_items
+    return json_bytes_response(
+        paginated_body(PilgrimageRouteResponse, routes, total_count=total_count, skip=skip, limit=limit, request=request)
     )
 
 
@@ -118,7 +101,8 @@ async def get_pilgrimage_route(
     await db.refresh(pilgrimage_route)     # Refresh to re-fetch any auto-updated fields (optional)
 
     
-    places = await place_crud.get_by_ids(db=db, ids=pilgrimage_route.route_path)
+    # Stops come back in route order (route_path holds the place ids as strings)
+    places = await place_crud.get_by_ids(db, [UUID(place_id) for place_id in pilgrimage_route.route_path or []])
     pilgrimage_route_response = PilgrimageRouteResponseWithStops.model_validate(pilgrimage_route)
     pilgrimage_route_response.stops = [
         PilgrimagePlace.model_validate(place) for place in places
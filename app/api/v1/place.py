@@ -7,11 +7,18 @@ from uuid import UUID
 from app.dependencies import get_current_user, get_current_active_admin
 from app.models.user import User
 from app.crud import place_crud
-from app.schemas import PlaceCreate, PlaceUpdate, PlaceResponse, PaginatedResponse
+from app.schemas import PlaceCreate, PlaceUpdate, PlaceResponse, PaginatedResponse, BatchGetResponse
 from app.database import get_async_db
+from app.utils.cache import entity_tag, response_cache, visibility_scope
+from app.utils.fieldsets import FIELDS_QUERY_DESCRIPTION, FieldSet
+from app.utils.batch_ids import IDS_QUERY_DESCRIPTION, parse_ids
+from app.utils.serialization import batch_body, list_body, paginated_body
+from app.models.place import Place
 
 router = APIRouter()
 
+PLACE_FIELDS = FieldSet(PlaceResponse, Place)
+
 # NOTE: Static paths MUST come before dynamic {place_id} path to avoid UUID conflicts.
 
 @router.post("", response_model=PlaceResponse, status_code=status.HTTP_201_CREATED)
@@ -36,13 +43,25 @@ async def create_place(
 
 @router.get("/all", response_model=List[PlaceResponse])
 async def list_all_places(
+    request: Request,
+    fields: Optional[str] = Query(None, description=FIELDS_QUERY_DESCRIPTION),
     db: AsyncSession = Depends(get_async_db),
 ):
     """
     Retrieve all places without any filters.
     """
-    places = await place_crud.get_all(db=db)
-    return [PlaceResponse.model_validate(p) for p in places]
+    selection = PLACE_FIELDS.parse(fields)
+
+    async def build_places(db: AsyncSession):
+        places = await place_crud.get_all(db=db, columns=PLACE_FIELDS.columns(selection))
+        return list_body(PLACE_FIELDS.schema_for(selection), places)
+
+    return await response_cache.get_or_set(
+        response_cache.build_key(request),
+        build_places,
+        db=db,
+        tags=[entity_tag("places")],
+    )
 
 @router.get("", response_model=PaginatedResponse[PlaceResponse])
 async def list_places(
@@ -52,58 +71,91 @@ async def list_places(
     name: Optional[str] = Query(None),
     is_featured: Optional[bool] = Query(None),
     category_id: Optional[UUID]= Query(None),
+    include_descendants: bool = Query(False, description="Also include items from all sub-categories of category_id"),
     region_id: Optional[UUID]= Query(None),
     state_id: Optional[UUID]= Query(None),
     city_id: Optional[UUID]= Query(None),
     country_id: Optional[UUID]= Query(None),
+    fields: Optional[str] = Query(None, description=FIELDS_QUERY_DESCRIPTION),
     current_user: User = Depends(get_current_user),  # Example: Only admins can list
     db: AsyncSession = Depends(get_async_db),
 ):
-    places, total_count = await place_crud.get_filtered_with_count(
+    selection = PLACE_FIELDS.parse(fields)
+
+    async def build_page(db: AsyncSession):
+        places, total_count = await place_crud.get_filtered_with_count(
+            db=db,
+            skip=skip,
+            limit=limit,
+            name=name,
+            is_featured=is_featured,
+            category_id=category_id,
+            region_id=region_id,
+            state_id=state_id,
+            city_id=city_id,
+            country_id=country_id,
+            include_descendants=include_descendants,
+            columns=PLACE_FIELDS.columns(selection),
+        )
+        return paginated_body(PLACE_FIELDS.schema_for(selection), places, total_count=total_count, skip=skip, limit=limit, request=request)
+
+    return await response_cache.get_or_set(
+        response_cache.build_key(request, visibility_scope(current_user)),
+        build_page,
         db=db,
-        skip=skip,
-        limit=limit,
-        name=name,
-        is_featured=is_featured,
-        category_id=category_id,
-        region_id=region_id,
-        state_id=state_id,
-        city_id=city_id,
-        country_id=country_id,
+        # Moving a category changes which places a subtree filter matches
+        tags=[entity_tag("places")] + ([entity_tag("categories")] if include_descendants else []),
     )
-    response_items = [PlaceResponse.model_validate(p) for p in places]
-
-    base_url = str(request.url.remove_query_params(keys=["skip", "limit"]))
-    next_page = prev_page = None
-    if (skip + limit) < total_count:
-        next_params = request.query_params._dict.copy()
-        next_params["skip"] = str(skip + limit)
-        next_page = str(request.url.replace_query_params(**next_params))
-    if skip > 0:
-        prev_params = request.query_params._dict.copy()
-        prev_params["skip"] = str(max(0, skip - limit))
-        prev_page = str(request.url.replace_query_params(**prev_params))
-
-    return PaginatedResponse[PlaceResponse](
-        total_count=total_count,
-        limit=limit,
-        skip=skip,
-        next_page=next_page,
-        prev_page=prev_page,
-        items=response_items
+
+
+@router.get("/batch", response_model=BatchGetResponse[PlaceResponse])
+async def batch_get_places(
+    request: Request,
+    ids: str = Query(..., description=IDS_QUERY_DESCRIPTION),
+    fields: Optional[str] = Query(None, description=FIELDS_QUERY_DESCRIPTION),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Places for `?ids=a,b,c` in one query, in the requested order; unknown or deleted ids are listed under `missing`.
+    """
+    place_ids = parse_ids(ids)
+    selection = PLACE_FIELDS.parse(fields)
+
+    async def build_batch(db: AsyncSession):
+        places = await place_crud.get_by_ids(db, place_ids, columns=PLACE_FIELDS.columns(selection))
+        return batch_body(PLACE_FIELDS.schema_for(selection), place_ids, places)
+
+    return await response_cache.get_or_set(
+        response_cache.build_key(request, visibility_scope(current_user)),
+        build_batch,
+        db=db,
+        tags=[entity_tag("places", place_id) for place_id in place_ids],
     )
 
 
 @router.get("/{place_id}", response_model=PlaceResponse)
 async def get_place(
+    request: Request,
     place_id: UUID, 
+    fields: Optional[str] = Query(None, description=FIELDS_QUERY_DESCRIPTION),
     current_user: User = Depends(get_current_user),  
     db: AsyncSession = Depends(get_async_db)
 ):
-    place = await place_crud.get(db=db, id=place_id)
-    if not place:
-        raise HTTPException(status_code=404, detail="Place not found")
-    return place
+    selection = PLACE_FIELDS.parse(fields)
+
+    async def build_place(db: AsyncSession):
+        place = await place_crud.get(db=db, id=place_id, columns=PLACE_FIELDS.columns(selection))
+        if not place:
+            raise HTTPException(status_code=404, detail="Place not found")
+        return PLACE_FIELDS.schema_for(selection).model_validate(place)
+
+    return await response_cache.get_or_set(
+        response_cache.build_key(request, visibility_scope(current_user)),
+        build_place,
+        db=db,
+        tags=[entity_tag("places", place_id)],
+    )
 
 
 @router.put("/{place_id}", response_model=PlaceResponse)
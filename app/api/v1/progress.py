@@ -0,0 +1,109 @@
+# app/api/v1/progress.py
+from datetime import datetime
+from typing import List
+from uuid import UUID as PyUUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.dependencies import get_async_db, get_current_user
+from app.models.content import Content
+from app.models.user import User
+from app.models.user_progress import UserProgress
+from app.schemas.user_progress import ProgressHeartbeat, ProgressResponse
+from app.services.progress_buffer import POSITION_FIELDS, combine, heartbeat_entry, progress_buffer
+
+router = APIRouter()
+
+_STORED_FIELDS = ("user_id", "content_id", *POSITION_FIELDS, "position_updated_at", "time_spent", "is_completed", "completion_date")
+
+
+def _as_entry(row: UserProgress) -> dict:
+    return {field: getattr(row, field) for field in _STORED_FIELDS}
+
+
+@router.put("/{content_id}", status_code=status.HTTP_204_NO_CONTENT, summary="Report the current reading/listening position")
+async def report_progress(
+    content_id: PyUUID,
+    heartbeat: ProgressHeartbeat,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Heartbeat from the reader or player. Omitted position fields keep their previous value;
+    time_spent_delta is added to the total. Writes are buffered and batched (see
+    app/services/progress_buffer.py), so sending this every few seconds is fine.
+    """
+    # Checked before buffering: a pending entry is served back by the reads below until it is flushed
+    exists = (
+        await db.execute(select(Content.id).where(Content.id == content_id, Content.is_deleted.is_(False)))
+    ).scalar_one_or_none()
+    if exists is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Content not found")
+    entry = heartbeat_entry(current_user.id, content_id, heartbeat, datetime.utcnow())
+    await progress_buffer.record(db, entry)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.get("", response_model=List[ProgressResponse], summary="Continue reading: the user's most recent positions")
+async def list_progress(
+    limit: int = Query(20, ge=1, le=100),
+    include_completed: bool = Query(False),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    query = select(UserProgress).where(UserProgress.user_id == current_user.id)
+    if not include_completed:
+        query = query.where(UserProgress.is_completed.is_(False))
+    rows = (await db.execute(query.order_by(UserProgress.position_updated_at.desc()).limit(limit))).scalars().all()
+    entries = {row.content_id: _as_entry(row) for row in rows}
+    for pending in progress_buffer.pending_for_user(current_user.id):
+        # Not-yet-flushed positions; content outside the stored page is read individually
+        stored = entries.get(pending["content_id"])
+        if stored is None:
+            row = (
+                await db.execute(
+                    select(UserProgress).where(
+                        UserProgress.user_id == current_user.id, UserProgress.content_id == pending["content_id"]
+                    )
+                )
+            ).scalar_one_or_none()
+            stored = _as_entry(row) if row else None
+        entries[pending["content_id"]] = combine(stored, pending)
+    items = [entry for entry in entries.values() if include_completed or not entry["is_completed"]]
+    items.sort(key=lambda entry: entry["position_updated_at"], reverse=True)
+    return [ProgressResponse.model_validate(entry) for entry in items[:limit]]
+
+
+@router.get("/{content_id}", response_model=ProgressResponse, summary="The user's position in one book/story/teaching")
+async def get_progress(
+    content_id: PyUUID,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    row = (
+        await db.execute(
+            select(UserProgress).where(UserProgress.user_id == current_user.id, UserProgress.content_id == content_id)
+        )
+    ).scalar_one_or_none()
+    pending = progress_buffer.pending(current_user.id, content_id)
+    if row is None and pending is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No progress recorded")
+    entry = _as_entry(row) if row else None
+    return ProgressResponse.model_validate(combine(entry, pending) if pending else entry)
+
+
+@router.delete("/{content_id}", status_code=status.HTTP_204_NO_CONTENT, summary="Forget the position (start over)")
+async def reset_progress(
+    content_id: PyUUID,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    progress_buffer.discard(current_user.id, content_id)
+    await db.execute(
+        delete(UserProgress).where(UserProgress.user_id == current_user.id, UserProgress.content_id == content_id)
+    )
+    await db.commit()
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
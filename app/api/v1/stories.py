@@ -7,15 +7,22 @@ from typing import Optional
 from app.crud import category_crud
 from app.schemas.story import StoryCreate, StoryUpdate, StoryResponse
 from app.schemas.pagination import PaginatedResponse
+from app.schemas.batch import BatchGetResponse
 from app.crud.story import story_crud
 from app.models.user import User
-from app.models.content import ContentStatus
+from app.models.content import Content, ContentStatus
 from app.dependencies import get_async_db, get_current_user, get_current_active_moderator_or_admin, get_current_active_admin
+from app.utils.cache import entity_tag, response_cache, visibility_scope
+from app.utils.etag import etag_matches, make_etag, not_modified
+from app.utils.fieldsets import FIELDS_QUERY_DESCRIPTION, FieldSet
+from app.utils.batch_ids import IDS_QUERY_DESCRIPTION, parse_ids
+from app.utils.serialization import batch_body, paginated_body
 from uuid import UUID as PyUUID
 
 
 router = APIRouter()
 STORY_TAG = "Stories"
+STORY_FIELDS = FieldSet(StoryResponse, Content, derived={"category_name": ("category_id",)})
 
 @router.post("", response_model=StoryResponse, status_code=status.HTTP_201_CREATED, tags=[STORY_TAG])
 async def create_new_story_api(
@@ -38,62 +45,105 @@ async def list_all_stories_api(
     limit: int = Query(10, ge=1, le=100),
     status_filter: Optional[str] = Query(None), # Allow filtering by status
     category_id: Optional[str] = Query(None),
+    include_descendants: bool = Query(False, description="Also include items from all sub-categories of category_id"),
     language: Optional[str] = Query(None),
     search: Optional[str] = Query(None),
+    fields: Optional[str] = Query(None, description=FIELDS_QUERY_DESCRIPTION),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_async_db)
 ):
+    selection = STORY_FIELDS.parse(fields)
     # Default to published if no status_filter is provided for public listing
     final_status_str = status_filter if status_filter else ContentStatus.PUBLISHED.value
 
-    story_models, total_count = await story_crud.get_stories_list_and_count(
-        db, skip=skip, limit=limit, status_str=final_status_str,
-        category_id_str=category_id, language_str=language, search_query=search
+    async def build_page(db: AsyncSession):
+        story_models, total_count = await story_crud.get_stories_list_and_count(
+            db, skip=skip, limit=limit, status_str=final_status_str,
+            category_id_str=category_id, language_str=language, search_query=search,
+            include_descendants=include_descendants, columns=STORY_FIELDS.columns(selection)
+        )
+
+        if STORY_FIELDS.wants(selection, "category_name"):
+            # One lookup for the whole page; the name rides along as a plain attribute for StoryResponse.category_name
+            category_names = await category_crud.get_names(db, [story.category_id for story in story_models])
+            for story in story_models:
+                story.category_name = category_names.get(story.category_id)
+
+        return paginated_body(
+            STORY_FIELDS.schema_for(selection), story_models, total_count=total_count, skip=skip, limit=limit, request=request
+        )
+
+    # category_name is denormalized into every item, so category edits invalidate the page too
+    return await response_cache.get_or_set(
+        response_cache.build_key(request, visibility_scope(current_user)),
+        build_page,
+        db=db,
+        tags=[entity_tag("content"), entity_tag("categories")],
     )
-    
-    response_items = [StoryResponse.model_validate(story) for story in story_models]
-
-    for idx, res in enumerate(response_items):
-        category = await category_crud.get(db, res.category_id)
-        response_items[idx].category_name = category.name
-
-    # ... (pagination next/prev page logic) ...
-    next_page, prev_page = None, None # Placeholder
-    base_url = str(request.url.remove_query_params(keys=['skip', 'limit']))
-    if (skip + limit) < total_count:
-        next_page_url_params = request.query_params._dict.copy()
-        next_page_url_params["skip"] = str(skip + limit)
-        next_page = str(request.url.replace_query_params(**next_page_url_params))
-    if skip > 0:
-        prev_page_url_params = request.query_params._dict.copy()
-        prev_page_url_params["skip"] = str(max(0, skip - limit))
-        prev_page = str(request.url.replace_query_params(**prev_page_url_params))
-
-    return PaginatedResponse[StoryResponse](
-        total_count=total_count, limit=limit, skip=skip, 
-        next_page=next_page, prev_page=prev_page, items=response_items
+
+@router.get("/batch", response_model=BatchGetResponse[StoryResponse], tags=[STORY_TAG])
+async def batch_get_stories_api(
+    request: Request,
+    ids: str = Query(..., description=IDS_QUERY_DESCRIPTION),
+    fields: Optional[str] = Query(None, description=FIELDS_QUERY_DESCRIPTION),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Stories for `?ids=a,b,c` in one query, in the requested order; ids that aren't live stories are listed under `missing`."""
+    story_ids = parse_ids(ids)
+    selection = STORY_FIELDS.parse(fields)
+
+    async def build_batch(db: AsyncSession):
+        story_models = await story_crud.get_stories_by_ids(db, story_ids, columns=STORY_FIELDS.columns(selection))
+        if STORY_FIELDS.wants(selection, "category_name"):
+            category_names = await category_crud.get_names(db, [story.category_id for story in story_models])
+            for story in story_models:
+                story.category_name = category_names.get(story.category_id)
+        return batch_body(STORY_FIELDS.schema_for(selection), story_ids, story_models)
+
+    return await response_cache.get_or_set(
+        response_cache.build_key(request, visibility_scope(current_user)),
+        build_batch,
+        db=db,
+        tags=[entity_tag("content", story_id) for story_id in story_ids] + [entity_tag("categories")],
     )
 
 @router.get("/{story_id_or_slug}", response_model=StoryResponse, tags=[STORY_TAG])
 async def get_single_story_api(
+    request: Request,
     story_id_or_slug: str,
+    fields: Optional[str] = Query(None, description=FIELDS_QUERY_DESCRIPTION),
     current_user: User = Depends(get_current_user), # Optional: if you want to filter by user permissions
     db: AsyncSession = Depends(get_async_db)
 ):
-    story_model = None
-    try:
-        story_uuid = PyUUID(story_id_or_slug)
-        story_model = await story_crud.get_story(db, story_id=story_uuid)
-    except ValueError:
-        story_model = await story_crud.get_story_by_slug(db, slug=story_id_or_slug)
-
-    res = StoryResponse.model_validate(story_model)
-    category = await category_crud.get(db, story_model.category_id)
-    res.category_name = category.name
-
-    if not res:
+    selection = STORY_FIELDS.parse(fields)
+    story_id = await story_crud.resolve_id(db, story_id_or_slug)
+    version = story_id and await story_crud.get_story_version(db, story_id)
+    if not version:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Story not found")
-    return res # Pydantic converts Content model to StoryResponse
+    etag = make_etag("story", *version, *sorted(selection or ()))
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    async def build_story(db: AsyncSession):
+        story_model = await story_crud.get_story(db, story_id=story_id, columns=STORY_FIELDS.columns(selection))
+        if not story_model:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Story not found")
+
+        if STORY_FIELDS.wants(selection, "category_name"):
+            category_names = await category_crud.get_names(db, [story_model.category_id])
+            story_model.category_name = category_names.get(story_model.category_id)
+        return STORY_FIELDS.schema_for(selection).model_validate(story_model) # Pydantic converts Content model to StoryResponse
+
+    response = await response_cache.get_or_set(
+        response_cache.entity_key("story", story_id, visibility_scope(current_user), etag),
+        build_story,
+        db=db,
+        # Without category_id in the fieldset this falls back to the table-wide categories tag
+        tags=lambda res: [entity_tag("content", res.id), entity_tag("categories", getattr(res, "category_id", None))],
+    )
+    response.headers["ETag"] = etag
+    return response
 
 @router.put("/{story_id}", response_model=StoryResponse, tags=[STORY_TAG])
 async def update_existing_story_api(
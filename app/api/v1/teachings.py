@@ -4,15 +4,23 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 from app.schemas.teaching import TeachingCreate, TeachingUpdate, TeachingResponse
 from app.schemas.pagination import PaginatedResponse
+from app.schemas.batch import BatchGetResponse
 from app.crud.teaching import teaching_crud
 from app.models.user import User, UserRole
 from app.models.content import ContentStatus, ContentType as ModelContentTypeEnum
 from app.dependencies import get_async_db, get_current_user, get_current_active_moderator_or_admin, get_current_active_admin
+from app.utils.cache import entity_tag, response_cache, visibility_scope
+from app.utils.etag import etag_matches, make_etag, not_modified
+from app.utils.fieldsets import FIELDS_QUERY_DESCRIPTION, FieldSet
+from app.models.content import Content
+from app.utils.batch_ids import IDS_QUERY_DESCRIPTION, parse_ids
+from app.utils.serialization import batch_body, paginated_body
 from uuid import UUID as PyUUID
 
 
 router = APIRouter()
 TEACHING_TAG = "Teachings"
+TEACHING_FIELDS = FieldSet(TeachingResponse, Content)
 
 @router.post("", response_model=TeachingResponse, status_code=status.HTTP_201_CREATED, tags=[TEACHING_TAG])
 async def create_new_teaching_api(
@@ -45,51 +53,88 @@ async def list_all_teachings_api(
     content_type: Optional[str] = Query(None, description="Filter by teaching content_type: ARTICLE, AUDIO, VIDEO"),
     status_filter: Optional[str] = Query(None),
     category_id: Optional[str] = Query(None),
+    include_descendants: bool = Query(False, description="Also include items from all sub-categories of category_id"),
     language: Optional[str] = Query(None),
     search: Optional[str] = Query(None),
+    fields: Optional[str] = Query(None, description=FIELDS_QUERY_DESCRIPTION),
     current_user: User = Depends(get_current_user), # Optional: if you want to filter by user permissions
     db: AsyncSession = Depends(get_async_db)
 ):
+    selection = TEACHING_FIELDS.parse(fields)
     final_status_str = status_filter #if status_filter else ContentStatus.PUBLISHED.value
-    teaching_models, total_count = await teaching_crud.get_teachings_list_and_count(
-        db, skip=skip, limit=limit, content_type_str=content_type, status_str=final_status_str,
-        category_id_str=category_id, language_str=language, search_query=search
+
+    async def build_page(db: AsyncSession):
+        teaching_models, total_count = await teaching_crud.get_teachings_list_and_count(
+            db, skip=skip, limit=limit, content_type_str=content_type, status_str=final_status_str,
+            category_id_str=category_id, language_str=language, search_query=search,
+            include_descendants=include_descendants, columns=TEACHING_FIELDS.columns(selection)
+        )
+        return paginated_body(
+            TEACHING_FIELDS.schema_for(selection), teaching_models, total_count=total_count, skip=skip, limit=limit, request=request
+        )
+
+    return await response_cache.get_or_set(
+        response_cache.build_key(request, visibility_scope(current_user)),
+        build_page,
+        db=db,
+        # Moving a category changes which teachings a subtree filter matches
+        tags=[entity_tag("content")] + ([entity_tag("categories")] if include_descendants else []),
     )
-    response_items = [TeachingResponse.model_validate(t) for t in teaching_models]
-    
-    # ... (pagination next/prev page logic) ...
-    next_page, prev_page = None, None # Placeholder
-    base_url = str(request.url.remove_query_params(keys=['skip', 'limit']))
-    if (skip + limit) < total_count:
-        next_page_url_params = request.query_params._dict.copy()
-        next_page_url_params["skip"] = str(skip + limit)
-        next_page = str(request.url.replace_query_params(**next_page_url_params))
-    if skip > 0:
-        prev_page_url_params = request.query_params._dict.copy()
-        prev_page_url_params["skip"] = str(max(0, skip - limit))
-        prev_page = str(request.url.replace_query_params(**prev_page_url_params))
-
-    return PaginatedResponse[TeachingResponse](
-        total_count=total_count, limit=limit, skip=skip, 
-        next_page=next_page, prev_page=prev_page, items=response_items
+
+@router.get("/batch", response_model=BatchGetResponse[TeachingResponse], tags=[TEACHING_TAG])
+async def batch_get_teachings_api(
+    request: Request,
+    ids: str = Query(..., description=IDS_QUERY_DESCRIPTION),
+    fields: Optional[str] = Query(None, description=FIELDS_QUERY_DESCRIPTION),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Teachings for `?ids=a,b,c` in one query, in the requested order; ids that aren't live teachings are listed under `missing`."""
+    teaching_ids = parse_ids(ids)
+    selection = TEACHING_FIELDS.parse(fields)
+
+    async def build_batch(db: AsyncSession):
+        teaching_models = await teaching_crud.get_teachings_by_ids(db, teaching_ids, columns=TEACHING_FIELDS.columns(selection))
+        return batch_body(TEACHING_FIELDS.schema_for(selection), teaching_ids, teaching_models)
+
+    return await response_cache.get_or_set(
+        response_cache.build_key(request, visibility_scope(current_user)),
+        build_batch,
+        db=db,
+        tags=[entity_tag("content", teaching_id) for teaching_id in teaching_ids],
     )
 
 @router.get("/{teaching_id_or_slug}", response_model=TeachingResponse, tags=[TEACHING_TAG])
 async def get_single_teaching_api(
+    request: Request,
     teaching_id_or_slug: str,
+    fields: Optional[str] = Query(None, description=FIELDS_QUERY_DESCRIPTION),
     current_user: User = Depends(get_current_user), # Optional: if you want to filter by user permissions
     db: AsyncSession = Depends(get_async_db)
 ):
-    teaching_model = None
-    try:
-        teaching_uuid = PyUUID(teaching_id_or_slug)
-        teaching_model = await teaching_crud.get_teaching(db, teaching_id=teaching_uuid)
-    except ValueError:
-        teaching_model = await teaching_crud.get_teaching_by_slug(db, slug=teaching_id_or_slug)
-    
-    if not teaching_model:
+    selection = TEACHING_FIELDS.parse(fields)
+    teaching_id = await teaching_crud.resolve_id(db, teaching_id_or_slug)
+    version = teaching_id and await teaching_crud.get_teaching_version(db, teaching_id)
+    if not version:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Teaching not found")
-    return teaching_model # Pydantic converts
+    etag = make_etag("teaching", *version, *sorted(selection or ()))
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    async def build_teaching(db: AsyncSession):
+        teaching_model = await teaching_crud.get_teaching(db, teaching_id=teaching_id, columns=TEACHING_FIELDS.columns(selection))
+        if not teaching_model:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Teaching not found")
+        return TEACHING_FIELDS.schema_for(selection).model_validate(teaching_model)
+
+    response = await response_cache.get_or_set(
+        response_cache.entity_key("teaching", teaching_id, visibility_scope(current_user), etag),
+        build_teaching,
+        db=db,
+        tags=lambda res: [entity_tag("content", res.id)],
+    )
+    response.headers["ETag"] = etag
+    return response
 
 @router.put("/{teaching_id}", response_model=TeachingResponse, tags=[TEACHING_TAG])
 async def update_existing_teaching_api(
@@ -6,12 +6,19 @@ from uuid import UUID
 from app.dependencies import get_current_user, get_current_active_admin
 from app.models.user import User
 from app.crud import temple_crud, place_crud
-from app.schemas import TempleCreate, TempleUpdate, TempleResponse, PaginatedResponse
+from app.schemas import TempleCreate, TempleUpdate, TempleResponse, PaginatedResponse, BatchGetResponse
 from app.database import get_async_db
+from app.utils.cache import entity_tag, response_cache, visibility_scope
+from app.utils.fieldsets import FIELDS_QUERY_DESCRIPTION, FieldSet
+from app.utils.batch_ids import IDS_QUERY_DESCRIPTION, parse_ids
+from app.utils.serialization import batch_body, json_bytes_response, paginated_body
+from app.models.temple import Temple
 
 
 router = APIRouter()
 
+TEMPLE_FIELDS = FieldSet(TempleResponse, Temple, derived={"place_name": ("place_id",)})
+
 
 @router.post("", response_model=TempleResponse, status_code=status.HTTP_201_CREATED)
 async def create_temple(
@@ -40,6 +47,7 @@ async def list_all_temples(
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
     search: Optional[str] = Query(None),
+    fields: Optional[str] = Query(None, description=FIELDS_QUERY_DESCRIPTION),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_async_db),
 ):
@@ -48,46 +56,74 @@ async def list_all_temples(
     Add more filters as needed.
     As of now only from admin side search by name filtered is applied, if required any for user side will add.
     """
-    temples, total_count = await temple_crud.get_filtered_with_count(
+    selection = TEMPLE_FIELDS.parse(fields)
+
+    async def build_page(db: AsyncSession):
+        temples, total_count = await temple_crud.get_filtered_with_count(
+            db=db,
+            skip=skip,
+            limit=limit,
+            search=search,
+            columns=TEMPLE_FIELDS.columns(selection),
+        )
+        if TEMPLE_FIELDS.wants(selection, "place_name"):
+            # One lookup for the whole page; the name rides along as a plain attribute for TempleResponse.place_name
+            place_names = await place_crud.get_names(db, [temple.place_id for temple in temples])
+            for temple in temples:
+                temple.place_name = place_names.get(temple.place_id)
+
+        return paginated_body(TEMPLE_FIELDS.schema_for(selection), temples, total_count=total_count, skip=skip, limit=limit, request=request)
+
+    # place_name is denormalized into every item, so place edits invalidate the page too.
+    # The detail route is not cached: every read bumps visit_count.
+    return await response_cache.get_or_set(
+        response_cache.build_key(request, visibility_scope(current_user)),
+        build_page,
         db=db,
-        skip=skip,
-        limit=limit,
-        search=search,
+        tags=[entity_tag("temples"), entity_tag("places")],
     )
-    response_items = [TempleResponse.model_validate(p) for p in temples]
-    for idx, res in enumerate(response_items):
-        # print(res)
-        place= await place_crud.get(db, res.place_id)
-        # print(place)
-        response_items[idx].place_name = place.name
-
-    base_url = str(request.url.remove_query_params(keys=["skip", "limit"]))
-    next_page = prev_page = None
-    if (skip + limit) < total_count:
-        next_params = request.query_params._dict.copy()
-        next_params["skip"] = str(skip + limit)
-        next_page = str(request.url.replace_query_params(**next_params))
-    if skip > 0:
-        prev_params = request.query_params._dict.copy()
-        prev_params["skip"] = str(max(0, skip - limit))
-        prev_page = str(request.url.replace_query_params(**prev_params))
-
-    return PaginatedResponse[TempleResponse](
-        total_count=total_count,
-        limit=limit,
-        skip=skip,
-        next_page=next_page,
-        prev_page=prev_page,
-        items=response_items
+
+
+@router.get("/batch", response_model=BatchGetResponse[TempleResponse])
+async def batch_get_temples(
+    request: Request,
+    ids: str = Query(..., description=IDS_QUERY_DESCRIPTION),
+    fields: Optional[str] = Query(None, description=FIELDS_QUERY_DESCRIPTION),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Temples for `?ids=a,b,c` in one query, in the requested order; unknown or deleted ids are listed under `missing`.
+    Unlike the detail route this doesn't count as a visit, so it is cached.
+    """
+    temple_ids = parse_ids(ids)
+    selection = TEMPLE_FIELDS.parse(fields)
+
+    async def build_batch(db: AsyncSession):
+        temples = await temple_crud.get_by_ids(db, temple_ids, columns=TEMPLE_FIELDS.columns(selection))
+        if TEMPLE_FIELDS.wants(selection, "place_name"):
+            place_names = await place_crud.get_names(db, [temple.place_id for temple in temples])
+            for temple in temples:
+                temple.place_name = place_names.get(temple.place_id)
+        return batch_body(TEMPLE_FIELDS.schema_for(selection), temple_ids, temples)
+
+    return await response_cache.get_or_set(
+        response_cache.build_key(request, visibility_scope(current_user)),
+        build_batch,
+        db=db,
+        tags=[entity_tag("temples", temple_id) for temple_id in temple_ids] + [entity_tag("places")],
     )
 
 
 @router.get("/{temple_id}", response_model=TempleResponse)
 async def get_temple(
     temple_id: UUID, 
+    fields: Optional[str] = Query(None, description=FIELDS_QUERY_DESCRIPTION),
     current_user: User = Depends(get_current_user),  
     db: AsyncSession = Depends(get_async_db)
 ):
+    # Only the payload is narrowed here: the visit_count bump below needs the full row anyway
+    selection = TEMPLE_FIELDS.parse(fields)
     temple = await temple_crud.get(db=db, id=temple_id)
     if not temple:
         raise HTTPException(status_code=404, detail="Temple not found")
@@ -97,12 +133,11 @@ async def get_temple(
     await db.commit()       # Commit to make it permanent
     await db.refresh(temple)     # Refresh to re-fetch any auto-updated fields (optional)
     # print(temple)
-    res = TempleResponse.model_validate(temple)
-    # print(res)
-    place = await place_crud.get(db, temple.place_id)
-    # print(place)
-    res.place_name = place.name
-    return res
+    if TEMPLE_FIELDS.wants(selection, "place_name"):
+        temple.place_name = (await place_crud.get_names(db, [temple.place_id])).get(temple.place_id)
+    # Serialized here: a sparse payload must not be re-validated (and re-filled) against response_model
+    payload = TEMPLE_FIELDS.schema_for(selection).model_validate(temple)
+    return json_bytes_response(payload.model_dump_json().encode("utf-8"))
 
 
 @router.put("/{temple_id}", response_model=TempleResponse)
@@ -37,6 +37,62 @@ class Settings(BaseSettings):
     # Project
     PROJECT_NAME: str = "Sanatani API"
 
+    # Response cache
+    CACHE_ENABLED: bool = True
+    CACHE_BACKEND: str = "memory"  # "memory" or "redis"
+    CACHE_REDIS_URL: Optional[str] = None  # e.g. "redis://localhost:6379/0"
+    CACHE_DEFAULT_TTL: int = 300  # seconds
+    CACHE_STALE_TTL: int = 60  # expired entries are served this long while one background refresh runs
+    CACHE_MAX_ENTRIES: int = 2048  # LRU bound for the in-memory backend
+    SLUG_CACHE_MAX_ENTRIES: int = 10000  # slug -> id entries per worker (app/utils/slug_cache.py)
+    SLUG_CACHE_TTL: int = 300  # seconds; bounds staleness after a slug change made through another worker
+    LOCATION_TREE_MAX_AGE: int = 3600  # seconds before another worker's location edits are picked up
+    CATEGORY_TREE_MAX_AGE: int = 600  # same, for the per-scope category trees
+
+    # Response compression
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024  # bytes; smaller bodies are sent as-is
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 5  # only used when the optional brotli package is installed
+    COMPRESSION_CACHE_MAX_BYTES: int = 32 * 1024 * 1024  # compressed bodies of ETag'd responses, per worker
+
+    # Admin exports
+    EXPORT_BATCH_SIZE: int = 1000  # rows fetched per server-side cursor round trip / flushed per chunk
+    CHAPTER_STREAM_BATCH_SIZE: int = 20  # sections per cursor fetch when a chapter is streamed as NDJSON
+    CHAPTER_RANGE_MAX: int = 20  # chapters one ?from=&to= range request may cover
+    BATCH_GET_MAX_IDS: int = 100  # ids one ?ids=a,b,c batch-get request may ask for
+    BOOK_IMPORT_BATCH_SIZE: int = 500  # new sections per multi-row INSERT when importing a Markdown/EPUB source
+
+    # Reading statistics (app/models/reading_stats.py)
+    READING_WORDS_PER_MINUTE: int = 200
+    LISTENING_WORDS_PER_MINUTE: int = 150  # for chapters with a transcript but no duration
+
+    # In-book search (app/utils/text_search.py)
+    BOOK_SEARCH_CONFIG: str = "simple"  # PostgreSQL text search configuration; "simple" doesn't stem, so Sanskrit/Hindi words match as written
+    BOOK_SEARCH_SNIPPET_WORDS: int = 30
+    TRANSCRIPT_WINDOW_MAX_SEGMENTS: int = 500  # cap on the segments one transcript window returns
+
+    # Reading progress heartbeats (app/services/progress_buffer.py)
+    PROGRESS_FLUSH_INTERVAL: float = 60  # seconds between batched upserts; 0 writes every heartbeat immediately
+    PROGRESS_FLUSH_MAX_PENDING: int = 5000  # flush early once this many (user, content) entries are waiting
+
+    # Offline book bundles (app/services/book_bundles.py)
+    BOOK_BUNDLE_STORAGE: str = "local"  # "local" or "s3" (uses the AWS_* settings above)
+    BOOK_BUNDLE_DIR: str = "data/book_bundles"  # must not be under UPLOAD_DIR, which is served publicly at /static
+    BOOK_BUNDLE_S3_PREFIX: str = "book-bundles/"
+    BOOK_BUNDLE_URL_TTL: int = 3600  # seconds a presigned S3 download link stays valid
+    BOOK_BUNDLE_GZIP_LEVEL: int = 9  # built once per version, downloaded many times
+    BOOK_BUNDLE_MAX_BUILDS: int = 2  # concurrent background builds per worker
+    BOOK_BUNDLE_RETRY_AFTER: int = 5  # seconds, sent with 202 while a bundle is being built
+
+    # Compressed long-text columns (section bodies, transcripts, article text).
+    # Must match the column types in the DB: run app.scripts.compress_text_columns before turning it on.
+    COMPRESSED_TEXT_COLUMNS: bool = False
+    COMPRESSED_TEXT_MIN_SIZE: int = 256  # bytes; shorter values are stored as plain UTF-8
+    COMPRESSED_TEXT_ZLIB_LEVEL: int = 6
+    COMPRESSED_TEXT_ZSTD_LEVEL: int = 9  # only used when the optional zstandard package is installed
+    COMPRESSED_TEXT_ZSTD_DICTS: str = ""  # comma-separated dictionary files; the first is used for writes, all for reads
+
     # Clerk (Placeholders - fill in .env)
     # Clerk Configuration (as needed by fastapi-clerk-auth)
     # These might not be directly used if fastapi-clerk-auth handles init differently
@@ -6,10 +6,11 @@ from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession # Changed
 from sqlalchemy.future import select # Changed for SQLAlchemy 1.4+ style with async
-from sqlalchemy.orm import selectinload
-from sqlalchemy import func, update as sqlalchemy_update, delete as sqlalchemy_delete
-from app.models.content import BookChapter, BookSection, Content, ContentSubType
+from sqlalchemy.orm import load_only
+from sqlalchemy import Row, case, func, update as sqlalchemy_update, delete as sqlalchemy_delete
 from app.database import Base # Assuming Base is defined in app.database
+from app.utils.cache import entity_tag, response_cache
+from app.utils.slug_cache import slug_cache
 
 ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
@@ -19,14 +20,98 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     def __init__(self, model: Type[ModelType]):
         self.model = model
 
-    async def get(self, db: AsyncSession, id: Union[PyUUID, int, str]) -> Optional[ModelType]:
+    def cache_tags(self, obj: ModelType) -> List[str]:
+        """Response-cache tags affected by a write to `obj`: every list of this table plus the row itself."""
+        table = self.model.__tablename__
+        return [entity_tag(table), entity_tag(table, obj.id)]
+
+    async def invalidate_cache(self, obj: Optional[ModelType]) -> None:
+        if obj is not None:
+            # The slug may have changed or the row been deleted
+            slug_cache.forget(self.model.__tablename__, obj.id)
+            await response_cache.invalidate_tags(self.cache_tags(obj))
+
+    def id_or_slug_filter(self, id_or_slug: str):
+        """`model.id == <uuid>` when the value parses as a UUID, otherwise `model.slug == value`."""
+        try:
+            return self.model.id == PyUUID(str(id_or_slug))
+        except ValueError:
+            return self.model.slug == id_or_slug
+
+    async def resolve_id(self, db: AsyncSession, id_or_slug: str) -> Optional[PyUUID]:
+        """
+        Primary key for a detail route's `{id_or_slug}`: parsed when it's a UUID, otherwise from
+        slug_cache, falling back to one slug lookup whose result is cached. None if no live row has the slug.
+        """
+        try:
+            return PyUUID(str(id_or_slug))
+        except ValueError:
+            pass
+        table = self.model.__tablename__
+        cached = slug_cache.get(table, id_or_slug)
+        if cached is not None:
+            return cached
+        query = select(self.model.id).where(self.model.slug == id_or_slug)
+        if hasattr(self.model, "is_deleted"):
+            query = query.where(self.model.is_deleted.is_(False))
+        found = (await db.execute(query)).scalar_one_or_none()
+        if found is not None:
+            slug_cache.set(table, id_or_slug, found)
+        return found
+
+    async def get_version(self, db: AsyncSession, *criteria) -> Optional[Row]:
+        """
+        `(id, updated_at)` of the single live row matching `criteria`.
+        Cheap enough to run before every conditional GET: no heavy text columns are loaded.
+        """
+        query = select(self.model.id, self.model.updated_at).where(*criteria)
+        if hasattr(self.model, "is_deleted"):
+            query = query.where(self.model.is_deleted.is_(False))
+        result = await db.execute(query)
+        return result.first()
+
+    def only_columns(self, query, columns: Optional[List[str]]):
+        """Restrict an entity select to `columns` (sparse fieldsets); None loads every column."""
+        if not columns:
+            return query
+        return query.options(load_only(*(getattr(self.model, name) for name in columns)))
+
+    async def get(self, db: AsyncSession, id: Union[PyUUID, int, str], *, columns: Optional[List[str]] = None) -> Optional[ModelType]:
         result = await db.execute(
-                select(self.model)
+                self.only_columns(select(self.model), columns)
                 .filter(self.model.id == id)
                 .filter(self.model.is_deleted.is_(False))
         )
         return result.scalar_one_or_none()
 
+    async def get_by_ids(
+        self, db: AsyncSession, ids: List[Any], *criteria, columns: Optional[List[str]] = None
+    ) -> List[ModelType]:
+        """
+        Live rows for a batch of ids in one `IN (...)` query, returned in the order of `ids`
+        (repeated and unknown ids are dropped). `criteria` narrows the match, e.g. to one sub_type.
+        """
+        ids = list(dict.fromkeys(ids))
+        if not ids:
+            return []
+        query = self.only_columns(select(self.model), columns).where(self.model.id.in_(ids), *criteria)
+        if hasattr(self.model, "is_deleted"):
+            query = query.where(self.model.is_deleted.is_(False))
+        found = {row.id: row for row in (await db.execute(query)).scalars()}
+        return [found[id] for id in ids if id in found]
+
+    async def get_names(self, db: AsyncSession, ids: List[Any]) -> Dict[Any, str]:
+        """{id: name} for a batch of ids in one query, for list pages that show a related object's name."""
+        ids = {id for id in ids if id is not None}
+        if not ids:
+            return {}
+        result = await db.execute(
+            select(self.model.id, self.model.name)
+            .filter(self.model.id.in_(ids))
+            .filter(self.model.is_deleted.is_(False))
+        )
+        return {row.id: row.name for row in result}
+
     async def get_multi(
         self, db: AsyncSession, *, skip: int = 0, limit: int = 100
     ) -> List[ModelType]:
@@ -45,12 +130,43 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         )
         return result.scalar_one()
 
+    async def reorder(
+        self, db: AsyncSession, *, parent_column, parent_id: Any, order_column, ids: List[Any], start: int = 0
+    ) -> None:
+        """
+        Renumber every row under `parent_id` so `order_column` follows `ids` (start, start+1, ...).
+        One SELECT and two set-based UPDATEs whatever the row count; the caller commits.
+
+        Unique (parent, order) constraints are checked row by row, so the rows first move to
+        distinct negative values below every current one, then to their final positions.
+        Raises ValueError unless `ids` lists each of the parent's rows exactly once.
+        """
+        rows = (
+            await db.execute(select(self.model.id, order_column).where(parent_column == parent_id).with_for_update())
+        ).all()
+        current = {row[0] for row in rows}
+        if len(ids) != len(set(ids)) or set(ids) != current:
+            missing, unknown = len(current - set(ids)), len(set(ids) - current)
+            raise ValueError(
+                f"The new order must list each of the {len(current)} items exactly once "
+                f"({missing} missing, {unknown} unknown, {len(ids) - len(set(ids))} duplicated)"
+            )
+        if not rows:
+            return
+        offset = max(abs(row[1]) for row in rows) + 1
+        scope = self.model.__table__.update().where(parent_column == parent_id)
+        await db.execute(
+            scope.values({order_column: case({id: -(position + offset) for position, id in enumerate(ids)}, value=self.model.id)})
+        )
+        await db.execute(scope.values({order_column: start - offset - order_column}))
+
     async def create(self, db: AsyncSession, *, obj_in: CreateSchemaType) -> ModelType:
         obj_in_data = jsonable_encoder(obj_in)
         db_obj = self.model(**obj_in_data)
         db.add(db_obj)
         await db.commit()
         await db.refresh(db_obj)
+        await self.invalidate_cache(db_obj)
         return db_obj
 
     async def update(
@@ -74,6 +190,7 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         db.add(db_obj) # Add the modified object to the session
         await db.commit()
         await db.refresh(db_obj)
+        await self.invalidate_cache(db_obj)
         return db_obj
 
     async def remove(self, db: AsyncSession, *, id: Union[PyUUID, int, str]) -> Optional[ModelType]:
@@ -84,25 +201,6 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             # await db.delete(obj)
             await db.commit()
             await db.refresh(obj)  # Refresh to re-fetch any auto-updated fields (optional)
+            await self.invalidate_cache(obj)
 
         return obj
-
-    async def get_book_table_of_contents(self, db: AsyncSession, book_id: PyUUID) -> Optional[Content]:
-        """
-        Fetches a book with its chapters, and each chapter with its sections,
-        optimized for a table of contents view.
-        """
-        result = await db.execute(
-            select(self.model)
-            .options(
-                selectinload(self.model.chapters) # Content.chapters
-                .selectinload(BookChapter.sections) # BookChapter.sections
-            )
-            .filter(self.model.id == book_id)
-            .filter(self.model.sub_type == ContentSubType.BOOK.value) # Ensure it's a book
-            .filter(self.model.is_deleted.is_(False))
-        )
-        book = result.scalar_one_or_none()
-        # The relationships (chapters and their sections) will be loaded.
-        # Pydantic schemas (TOCChapterItem, TOCSectionItem) will select only needed fields.
-        return book
\ No newline at end of file
@@ -7,8 +7,11 @@ from sqlalchemy.future import select
 from sqlalchemy import or_
 
 from app.crud.base import CRUDBase
+from app.crud.category import category_filter
 from app.models.content import (
     Content, 
+    BookChapter,
+    BookSection,
     ContentType as ContentTypeEnum, 
     LanguageCode as LanguageCodeEnum, 
     ContentSubType,
@@ -24,8 +27,8 @@ from app.schemas.book import BookType
 
 class CRUDBook(CRUDBase[Content, BookCreate, BookUpdate]):
     
-    async def get_book(self, db: AsyncSession, content_id: PyUUID) -> Optional[Content]:
-        query = select(self.model).filter(self.model.id == content_id)
+    async def get_book(self, db: AsyncSession, content_id: PyUUID, *, columns: Optional[List[str]] = None) -> Optional[Content]:
+        query = self.only_columns(select(self.model), columns).filter(self.model.id == content_id)
         # Use .value to convert enum to string if Content.content_type stores string values in DB
         query = query.where(Content.sub_type == ContentTypeEnum.BOOK.value, self.model.is_deleted.is_(False))  # If book_format=TEXT
         # query = query.where(Content.sub_type == ContentSubType.BOOK.value)  # This is good for your plan
@@ -35,14 +38,12 @@ class CRUDBook(CRUDBase[Content, BookCreate, BookUpdate]):
         result = await db.execute(query)
         return result.scalar_one_or_none()
 
-    async def create_book(
-        self, 
-        db: AsyncSession, 
-        *, 
-        obj_in: BookCreate, 
-        author_id: PyUUID
-    ) -> Content:
-        slug = await generate_slug(db, self.model, obj_in.title)
+    async def get_books_by_ids(self, db: AsyncSession, ids: List[PyUUID], *, columns: Optional[List[str]] = None) -> List[Content]:
+        """Books among `ids`, in request order (one IN query)."""
+        return await self.get_by_ids(db, ids, Content.sub_type == ContentSubType.BOOK.value, columns=columns)
+
+    def build_book(self, *, obj_in: BookCreate, author_id: Optional[PyUUID], slug: str) -> Content:
+        """Unsaved Content row for a book: content_type follows book_format (TEXT when absent/unknown)."""
         content_data = obj_in.model_dump(exclude={"category_id", "book_format"})
 
         # Convert book_format string to enum safely (case insensitive)
@@ -50,8 +51,6 @@ class CRUDBook(CRUDBase[Content, BookCreate, BookUpdate]):
             book_format_enum = BookType(obj_in.book_format)
         except Exception:
             book_format_enum = BookType.TEXT  # default fallback
-        print(f"Book type enum: {obj_in.book_format}")
-        print(book_format_enum)
         # Set content_type based on book_format
         if book_format_enum == BookType.AUDIO:
             determined_content_type = ContentTypeEnum.AUDIO.value
@@ -78,10 +77,23 @@ class CRUDBook(CRUDBase[Content, BookCreate, BookUpdate]):
                 db_obj.category_id = PyUUID(obj_in.category_id)
             except ValueError:
                 pass
+        return db_obj
+
+    async def create_book(
+        self, 
+        db: AsyncSession, 
+        *, 
+        obj_in: BookCreate, 
+        author_id: PyUUID
+    ) -> Content:
+        slug = await generate_slug(db, self.model, obj_in.title)
+        print(f"Book type enum: {obj_in.book_format}")
+        db_obj = self.build_book(obj_in=obj_in, author_id=author_id, slug=slug)
 
         db.add(db_obj)
         await db.commit()
         await db.refresh(db_obj)
+        await self.invalidate_cache(db_obj)
         return db_obj
     
 
@@ -160,12 +172,14 @@ class CRUDBook(CRUDBase[Content, BookCreate, BookUpdate]):
         language_str: Optional[str] = None,
         status_str: Optional[str] = None,
         search_query: Optional[str] = None,
-        user_id: Optional[PyUUID] = None  # Optional filter for user-specific books
+        user_id: Optional[PyUUID] = None,  # Optional filter for user-specific books
+        include_descendants: bool = False,  # Also match books in sub-categories of category_id
+        columns: Optional[List[str]] = None  # Sparse fieldsets: only load these columns
     ) -> Tuple[List[Content], int]: # Returns (list_of_books, total_count)
         
         # Base query for filtering
         count_query = select(func.count(Content.id)).select_from(Content)
-        data_query = select(Content)
+        data_query = self.only_columns(select(Content), columns)
 
         # Apply common filters to both queries
         filters = [Content.sub_type == ContentSubType.BOOK.value] # Core filter for all books
@@ -194,7 +208,7 @@ class CRUDBook(CRUDBase[Content, BookCreate, BookUpdate]):
         if category_id_str:
             try:
                 cat_uuid = PyUUID(category_id_str)
-                filters.append(Content.category_id == cat_uuid)
+                filters.append(category_filter(Content.category_id, cat_uuid, include_descendants))
             except ValueError:
                 pass
         if language_str:
@@ -280,12 +294,72 @@ class CRUDBook(CRUDBase[Content, BookCreate, BookUpdate]):
         return result.scalar_one()
 
 
+    async def get_book_version(self, db: AsyncSession, id_or_slug: str):
+        """(id, updated_at) for the book detail ETag."""
+        return await self.get_version(
+            db, self.id_or_slug_filter(id_or_slug), Content.sub_type == ContentSubType.BOOK.value
+        )
+
+    async def get_book_toc_header(self, db: AsyncSession, id_or_slug: str):
+        """
+        The book columns the table of contents shows, plus updated_at as its version.
+        Chapter and section writes touch the book's updated_at, so this one row is enough for the ETag.
+        """
+        result = await db.execute(
+            select(
+                Content.id,
+                Content.title,
+                Content.content_type,
+                Content.cover_image_url,
+                Content.thumbnail_url,
+                Content.word_count,
+                Content.reading_time_seconds,
+                Content.listening_time_seconds,
+                Content.updated_at,
+            ).where(
+                self.id_or_slug_filter(id_or_slug),
+                Content.sub_type == ContentSubType.BOOK.value,
+                Content.is_deleted.is_(False),
+            )
+        )
+        return result.first()
+
+    async def get_book_toc_rows(self, db: AsyncSession, book_id: PyUUID, *, include_sections: bool = True):
+        """
+        One row per (chapter, section) in reading order - only ids, titles and ordering columns.
+        Section bodies are never selected, so this costs the same for a pamphlet and an epic.
+        Chapters without sections come back once with section columns set to None.
+        """
+        columns = [
+            BookChapter.id, BookChapter.title, BookChapter.chapter_number, BookChapter.audio_url,
+            BookChapter.word_count, BookChapter.reading_time_seconds, BookChapter.listening_time_seconds,
+        ]
+        query = select(*columns).where(BookChapter.book_id == book_id)
+        if include_sections:
+            query = (
+                select(
+                    *columns,
+                    BookSection.id.label("section_id"),
+                    BookSection.title.label("section_title"),
+                    BookSection.section_order,
+                )
+                .outerjoin(BookSection, BookSection.chapter_id == BookChapter.id)
+                .where(BookChapter.book_id == book_id)
+                .order_by(BookChapter.chapter_number, BookSection.section_order)
+            )
+        else:
+            query = query.order_by(BookChapter.chapter_number)
+        result = await db.execute(query)
+        return result.all()
+
     async def get_book_by_slug(
         self, 
         db: AsyncSession, 
-        slug: str
+        slug: str,
+        *,
+        columns: Optional[List[str]] = None
     ) -> Optional[Content]:
-        query = select(self.model).filter(self.model.slug == slug)
+        query = self.only_columns(select(self.model), columns).filter(self.model.slug == slug)
         query = query.where(Content.sub_type == ContentSubType.BOOK.value, self.model.is_deleted.is_(False))
         result = await db.execute(query)
         return result.scalar_one_or_none()
@@ -3,14 +3,39 @@ from typing import List, Optional, Tuple, Union
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import and_
+from sqlalchemy import and_, update
 from sqlalchemy.orm import selectinload
 from sqlalchemy.sql import func
 from app.crud.base import CRUDBase
-from app.models.content import BookChapter # Using the specific BookChapter model
+from app.models.content import BookChapter, BookSection, Content # Using the specific BookChapter model
+from app.models.reading_stats import mark_stale
 from app.schemas.book_chapter import BookChapterCreate, BookChapterUpdate
+from app.utils.cache import entity_tag, response_cache
 
 class CRUDBookChapter(CRUDBase[BookChapter, BookChapterCreate, BookChapterUpdate]):
+
+    def cache_tags(self, obj: BookChapter) -> List[str]:
+        # Chapter edits also change the parent book's TOC
+        return super().cache_tags(obj) + [entity_tag("content", obj.book_id)]
+
+    async def touch_book(self, db: AsyncSession, *, book_id: Optional[UUID] = None, chapter_id: Optional[UUID] = None) -> None:
+        """
+        Bump the parent book's updated_at in the current transaction (call before commit).
+        The TOC is versioned and cached on the book's updated_at alone, so every chapter
+        and section write has to move it. Pass the chapter id when the book id isn't at hand.
+        Also marks the chapter/book reading statistics for the rollup at commit.
+        """
+        mark_stale(db.sync_session, book_id=book_id, chapter_id=chapter_id)
+        if book_id is None:
+            book_id = select(BookChapter.book_id).where(BookChapter.id == chapter_id).scalar_subquery()
+        await db.execute(
+            update(Content).where(Content.id == book_id).values(updated_at=func.now()).execution_options(synchronize_session=False)
+        )
+    
+    async def update(self, db: AsyncSession, *, db_obj: BookChapter, obj_in) -> BookChapter:
+        # The generic update commits the touch together with the chapter
+        await self.touch_book(db, book_id=db_obj.book_id)
+        return await super().update(db, db_obj=db_obj, obj_in=obj_in)
     
     async def get_max_chapter_number(self, db: AsyncSession, book_id: UUID) -> int:
         """Gets the maximum chapter_number for a given book_id."""
@@ -35,8 +60,10 @@ class CRUDBookChapter(CRUDBase[BookChapter, BookChapterCreate, BookChapterUpdate
             chapter_number=next_chapter_num # Set auto-generated number
         )
         db.add(db_obj)
+        await self.touch_book(db, book_id=book_id)
         await db.commit()
         await db.refresh(db_obj)
+        await self.invalidate_cache(db_obj)
         return db_obj
 
     async def get_chapters_for_book(
@@ -102,6 +129,69 @@ class CRUDBookChapter(CRUDBase[BookChapter, BookChapterCreate, BookChapterUpdate
         result = await db.execute(query)
         return result.scalar_one_or_none()
 
+    async def get_chapter_version(
+        self, db: AsyncSession, *, chapter_id: UUID, book_id: UUID, include_sections: bool = True
+    ):
+        """
+        (id, updated_at[, section count, latest section updated_at]) for the chapter ETag.
+        Only timestamps are selected, so a 304 never reads the section bodies.
+        """
+        if not include_sections:
+            return await self.get_version(db, BookChapter.id == chapter_id, BookChapter.book_id == book_id)
+        result = await db.execute(
+            select(
+                BookChapter.id,
+                BookChapter.updated_at,
+                func.count(BookSection.id),
+                func.max(BookSection.updated_at),
+            )
+            .outerjoin(BookSection, BookSection.chapter_id == BookChapter.id)
+            .where(BookChapter.id == chapter_id, BookChapter.book_id == book_id)
+            .group_by(BookChapter.id, BookChapter.updated_at)
+        )
+        return result.first()
+
+    async def get_chapter_range_versions(
+        self, db: AsyncSession, *, book_id: UUID, from_number: int, to_number: int, include_sections: bool = True
+    ):
+        """
+        get_chapter_version() for every chapter numbered from_number..to_number, in order, plus
+        chapter_number - one aggregate query, so unchanged chapters are never loaded.
+        """
+        columns = [BookChapter.id, BookChapter.updated_at]
+        if include_sections:
+            columns += [func.count(BookSection.id), func.max(BookSection.updated_at)]
+        query = (
+            select(BookChapter.chapter_number, *columns)
+            .where(BookChapter.book_id == book_id, BookChapter.chapter_number.between(from_number, to_number))
+            .order_by(BookChapter.chapter_number)
+        )
+        if include_sections:
+            query = (
+                query.outerjoin(BookSection, BookSection.chapter_id == BookChapter.id)
+                .group_by(BookChapter.chapter_number, BookChapter.id, BookChapter.updated_at)
+            )
+        return (await db.execute(query)).all()
+
+    async def get_chapter_range(
+        self, db: AsyncSession, *, book_id: UUID, from_number: int, to_number: int,
+        chapter_ids: Optional[List[UUID]] = None, load_sections: bool = False
+    ) -> List[BookChapter]:
+        """
+        Chapters numbered from_number..to_number (optionally only `chapter_ids` among them), in
+        order; with load_sections, all of their sections come in one more query (selectinload).
+        """
+        query = (
+            select(self.model)
+            .where(BookChapter.book_id == book_id, BookChapter.chapter_number.between(from_number, to_number))
+            .order_by(BookChapter.chapter_number)
+        )
+        if chapter_ids is not None:
+            query = query.where(BookChapter.id.in_(chapter_ids))
+        if load_sections:
+            query = query.options(selectinload(self.model.sections))
+        return (await db.execute(query)).scalars().all()
+
     async def get_by_book_and_chapter_number(
         self, db: AsyncSession, *, book_id: UUID, chapter_number: int
     ) -> Optional[BookChapter]:
@@ -126,15 +216,29 @@ class CRUDBookChapter(CRUDBase[BookChapter, BookChapterCreate, BookChapterUpdate
             if existing_chapter_num and existing_chapter_num.id != db_obj.id:
                 raise ValueError(f"Chapter number {obj_in.chapter_number} already exists for this book.")
         
-        # Use the generic update from CRUDBase
-        return await super().update(db, db_obj=db_obj, obj_in=obj_in)
+        return await self.update(db, db_obj=db_obj, obj_in=obj_in)
+
+    async def reorder_chapters(self, db: AsyncSession, *, book_id: UUID, chapter_ids: List[UUID]) -> None:
+        """Renumber all of a book's chapters (1, 2, ...) in the given order, in one transaction."""
+        await self.reorder(
+            db, parent_column=BookChapter.book_id, parent_id=book_id,
+            order_column=BookChapter.chapter_number, ids=chapter_ids, start=1,
+        )
+        await self.touch_book(db, book_id=book_id)
+        await db.commit()
+        await response_cache.invalidate_tags(
+            [entity_tag(self.model.__tablename__), entity_tag("content", book_id)]
+            + [entity_tag(self.model.__tablename__, chapter_id) for chapter_id in chapter_ids]
+        )
 
     async def remove_chapter(self, db: AsyncSession, *, id: Union[UUID, int, str]) -> Optional[BookChapter]:
         # For async, db.get is not directly available, so we fetch first
         obj = await self.get_chapter_by_id(db, chapter_id=id)
         if obj:
+            await self.touch_book(db, book_id=obj.book_id)
             await db.delete(obj)
             await db.commit()
+            await self.invalidate_cache(obj)
 
         return obj
 
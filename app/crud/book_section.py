@@ -1,17 +1,39 @@
 # app/crud/book_section.py
-from typing import List, Optional, Tuple, Union
+import hashlib
+from typing import AsyncIterator, Dict, List, Optional, Tuple, Union
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import and_
+from sqlalchemy import and_, over
 from sqlalchemy.sql import func
 from app.crud.base import CRUDBase
-from app.models.content import BookSection # Using specific BookSection model
+from app.crud.book_chapter import book_chapter_crud
+from app.models.content import BookChapter, BookSection # Using specific BookSection model
 from app.schemas.book_section import BookSectionCreate, BookSectionUpdate
+from app.utils.cache import entity_tag, response_cache
+from app.utils.text_search import highlight, match_and_rank, query_terms
+
+def section_content_hash(title: Optional[str], body: str) -> str:
+    """BookSection.content_hash: lets importers tell an unchanged section from an edited one without reading bodies."""
+    return hashlib.sha256(f"{title or ''}\x00{body}".encode("utf-8")).hexdigest()
+
 
 class CRUDBookSection(CRUDBase[BookSection, BookSectionCreate, BookSectionUpdate]):
+
+    def cache_tags(self, obj: BookSection) -> List[str]:
+        # Sections are served inside their chapter; the book's TOC moves via touch_book()
+        return super().cache_tags(obj) + [entity_tag("book_chapters", obj.chapter_id)]
     
 
+    async def update(self, db: AsyncSession, *, db_obj: BookSection, obj_in) -> BookSection:
+        update_data = dict(obj_in) if isinstance(obj_in, dict) else obj_in.model_dump(exclude_unset=True)
+        update_data["content_hash"] = section_content_hash(
+            update_data.get("title", db_obj.title), update_data.get("body", db_obj.body)
+        )
+        # Moves the book's updated_at (the TOC version) in the same commit
+        await book_chapter_crud.touch_book(db, chapter_id=db_obj.chapter_id)
+        return await super().update(db, db_obj=db_obj, obj_in=update_data)
+
     async def get_max_section_order(self, db: AsyncSession, chapter_id: UUID) -> int:
         """Gets the maximum section_order for a given chapter_id."""
         result = await db.execute(
@@ -32,11 +54,14 @@ class CRUDBookSection(CRUDBase[BookSection, BookSectionCreate, BookSectionUpdate
         db_obj = BookSection(
             **section_data, 
             chapter_id=chapter_id,
-            section_order=next_section_order # Set auto-generated order
+            section_order=next_section_order, # Set auto-generated order
+            content_hash=section_content_hash(section_data.get("title"), section_data["body"]),
         )
         db.add(db_obj)
+        await book_chapter_crud.touch_book(db, chapter_id=chapter_id)
         await db.commit()
         await db.refresh(db_obj)
+        await self.invalidate_cache(db_obj)
         return db_obj
 
     async def get_sections_for_chapter_and_count( # Renamed and modified
@@ -81,6 +106,82 @@ class CRUDBookSection(CRUDBase[BookSection, BookSectionCreate, BookSectionUpdate
         )
         return result.scalars().all()
 
+    async def stream_sections_for_chapter(
+        self, db: AsyncSession, *, chapter_id: UUID, batch_size: int = 20
+    ) -> AsyncIterator[BookSection]:
+        """
+        Sections in reading order from a server-side cursor, `batch_size` rows per fetch.
+        Only the current batch is held in memory however long the chapter is.
+        """
+        result = await db.stream_scalars(
+            select(self.model)
+            .filter(BookSection.chapter_id == chapter_id)
+            .order_by(BookSection.section_order)
+            .execution_options(yield_per=batch_size)
+        )
+        async for section in result:
+            yield section
+
+    async def search_book(
+        self, db: AsyncSession, *, book_id: UUID, query: str, skip: int = 0, limit: int = 20
+    ) -> Tuple[List[Dict], int]:
+        """
+        Sections of one book matching a web-search style query (words, "quoted phrases",
+        -excluded, OR), best first, as (hits, total_count). The match and ranking run on the
+        GIN-indexed search_vector; bodies are read only for the returned page, to cut snippets.
+        """
+        terms = query_terms(query)
+        if not terms:
+            return [], 0
+        match, rank = match_and_rank(BookSection.search_vector, query, terms, db.bind.dialect.name)
+        page = (
+            await db.execute(
+                select(
+                    BookSection.id,
+                    BookSection.chapter_id,
+                    BookChapter.chapter_number,
+                    BookChapter.title.label("chapter_title"),
+                    BookSection.section_order,
+                    BookSection.title.label("section_title"),
+                    rank.label("rank"),
+                    over(func.count()).label("total_count"),
+                )
+                .join(BookChapter, BookChapter.id == BookSection.chapter_id)
+                .where(BookChapter.book_id == book_id, *match)
+                .order_by(rank.desc(), BookChapter.chapter_number, BookSection.section_order)
+                .offset(skip)
+                .limit(limit)
+            )
+        ).all()
+        if not page:
+            # Past the last page the window count isn't available; count the matches directly
+            total_count = 0 if skip == 0 else (
+                await db.execute(
+                    select(func.count(BookSection.id))
+                    .join(BookChapter, BookChapter.id == BookSection.chapter_id)
+                    .where(BookChapter.book_id == book_id, *match)
+                )
+            ).scalar_one()
+            return [], total_count
+
+        bodies = dict(
+            (await db.execute(select(BookSection.id, BookSection.body).where(BookSection.id.in_([row.id for row in page])))).all()
+        )
+        hits = [
+            {
+                "section_id": row.id,
+                "chapter_id": row.chapter_id,
+                "chapter_number": row.chapter_number,
+                "chapter_title": row.chapter_title,
+                "section_order": row.section_order,
+                "section_title": row.section_title,
+                "rank": row.rank,
+                "snippet": highlight(bodies.get(row.id) or "", terms),
+            }
+            for row in page
+        ]
+        return hits, page[0].total_count
+
     async def get_section_by_id(
         self, db: AsyncSession, *, section_id: UUID, chapter_id: Optional[UUID] = None
     ) -> Optional[BookSection]:
@@ -117,15 +218,30 @@ class CRUDBookSection(CRUDBase[BookSection, BookSectionCreate, BookSectionUpdate
             if existing_section_order and existing_section_order.id != db_obj.id:
                 raise ValueError(f"Section order {update_data['section_order']} already exists for this chapter.")
         
-        return await super().update(db, db_obj=db_obj, obj_in=update_data) # Pass dict to base update
+        return await self.update(db, db_obj=db_obj, obj_in=update_data) # Pass dict to base update
 
 
+    async def reorder_sections(self, db: AsyncSession, *, chapter_id: UUID, section_ids: List[UUID]) -> None:
+        """Renumber all of a chapter's sections (0, 1, ...) in the given order, in one transaction."""
+        await self.reorder(
+            db, parent_column=BookSection.chapter_id, parent_id=chapter_id,
+            order_column=BookSection.section_order, ids=section_ids, start=0,
+        )
+        await book_chapter_crud.touch_book(db, chapter_id=chapter_id)
+        await db.commit()
+        await response_cache.invalidate_tags(
+            [entity_tag(self.model.__tablename__), entity_tag("book_chapters", chapter_id)]
+            + [entity_tag(self.model.__tablename__, section_id) for section_id in section_ids]
+        )
+
     async def remove_section(self, db: AsyncSession, *, id: Union[UUID, int, str]) -> Optional[BookSection]:
         # For async, db.get is not directly available, so we fetch first
         obj = await self.get_section_by_id(db, section_id=id)
         if obj:
+            await book_chapter_crud.touch_book(db, chapter_id=obj.chapter_id)
             await db.delete(obj)
             await db.commit()
+            await self.invalidate_cache(obj)
 
         return obj
 
@@ -3,15 +3,33 @@ from typing import List, Optional, Tuple
 from uuid import UUID as PyUUID
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import func, and_
-from sqlalchemy.orm import selectinload, joinedload
+from sqlalchemy import func, and_, delete, insert, literal, true
+from sqlalchemy.orm import selectinload, joinedload, aliased
 
 from app.crud.base import CRUDBase
-from app.models.category import Category, CategoryScopeType
+from app.models.category import Category, CategoryScopeType, CategoryClosure
 from app.schemas.category import CategoryCreate, CategoryUpdate
+from app.services.category_tree import category_tree
 from app.utils.helpers import generate_slug
 
+
+def category_filter(column, category_id: PyUUID, include_descendants: bool = False):
+    """
+    `column == category_id`, or - with include_descendants - membership in the category's whole
+    subtree, resolved through the closure table's (ancestor_id, descendant_id) primary key.
+    """
+    if not include_descendants:
+        return column == category_id
+    return column.in_(
+        select(CategoryClosure.descendant_id).where(CategoryClosure.ancestor_id == category_id)
+    )
+
+
 class CRUDCategory(CRUDBase[Category, CategoryCreate, CategoryUpdate]):
+
+    async def invalidate_cache(self, obj: Optional[Category]) -> None:
+        await super().invalidate_cache(obj)
+        category_tree.invalidate()
     
     async def create_category(self, db: AsyncSession, *, obj_in: CategoryCreate) -> Category:
         slug_to_use = await generate_slug(db, self.model, obj_in.name)
@@ -32,12 +50,15 @@ class CRUDCategory(CRUDBase[Category, CategoryCreate, CategoryUpdate]):
                  raise ValueError(f"Invalid parent_id format: {obj_in.parent_id}.")
         
         db.add(db_obj)
+        await db.flush() # Need the id for the closure rows, committed together below
+        await self._link_new_node(db, db_obj.id, db_obj.parent_id)
         await db.commit()
         await db.refresh(db_obj)
+        await self.invalidate_cache(db_obj)
         return db_obj
 
     async def get_category_by_slug(self, db: AsyncSession, *, slug: str) -> Optional[Category]:
-        result = await db.execute(select(Category).filter(Category.slug == slug)).filter(Category.is_deleted.is_(False))
+        result = await db.execute(select(Category).filter(Category.slug == slug).filter(Category.is_deleted.is_(False)))
         return result.scalar_one_or_none()
 
     async def get_categories_by_type( # Assuming 'scope' is your 'type'
@@ -81,6 +102,83 @@ class CRUDCategory(CRUDBase[Category, CategoryCreate, CategoryUpdate]):
         
         return items, total_count
 
+    async def get_subtree(self, db: AsyncSession, category_id: PyUUID) -> List[Category]:
+        """
+        The category and all its live descendants in one query, ordered parent-before-child
+        (by depth, then sort_order/name) so they can be nested in a single pass.
+        """
+        result = await db.execute(
+            select(Category)
+            .join(CategoryClosure, CategoryClosure.descendant_id == Category.id)
+            .where(CategoryClosure.ancestor_id == category_id, Category.is_deleted.is_(False))
+            .order_by(CategoryClosure.depth, Category.sort_order, Category.name)
+        )
+        return result.scalars().all()
+
+    async def is_in_subtree(self, db: AsyncSession, *, root_id: PyUUID, category_id: PyUUID) -> bool:
+        result = await db.execute(
+            select(CategoryClosure.depth)
+            .where(CategoryClosure.ancestor_id == root_id, CategoryClosure.descendant_id == category_id)
+        )
+        return result.first() is not None
+
+    async def _link_new_node(self, db: AsyncSession, category_id: PyUUID, parent_id: Optional[PyUUID]) -> None:
+        # Self row, then one row per ancestor of the parent (the parent's own self row included)
+        await db.execute(insert(CategoryClosure).values(ancestor_id=category_id, descendant_id=category_id, depth=0))
+        if parent_id is not None:
+            await db.execute(
+                insert(CategoryClosure).from_select(
+                    ["ancestor_id", "descendant_id", "depth"],
+                    select(
+                        CategoryClosure.ancestor_id,
+                        literal(category_id, CategoryClosure.descendant_id.type),
+                        CategoryClosure.depth + 1,
+                    ).where(CategoryClosure.descendant_id == parent_id),
+                )
+            )
+
+    async def _move_subtree(self, db: AsyncSession, category_id: PyUUID, new_parent_id: Optional[PyUUID]) -> None:
+        subtree = select(CategoryClosure.descendant_id).where(CategoryClosure.ancestor_id == category_id)
+        # Detach: drop every link from an ancestor outside the subtree to a node inside it
+        await db.execute(
+            delete(CategoryClosure).where(
+                CategoryClosure.descendant_id.in_(subtree),
+                CategoryClosure.ancestor_id.not_in(subtree),
+            )
+        )
+        if new_parent_id is None:
+            return
+        # Attach: every ancestor of the new parent x every node of the subtree
+        above = aliased(CategoryClosure)
+        below = aliased(CategoryClosure)
+        await db.execute(
+            insert(CategoryClosure).from_select(
+                ["ancestor_id", "descendant_id", "depth"],
+                select(above.ancestor_id, below.descendant_id, above.depth + below.depth + 1)
+                .select_from(above)
+                .join(below, true())
+                .where(above.descendant_id == new_parent_id, below.ancestor_id == category_id),
+            )
+        )
+
+    async def rebuild_closure(self, db: AsyncSession) -> int:
+        """Recompute the closure table from parent_id (backfill / repair). Returns the row count."""
+        result = await db.execute(select(Category.id, Category.parent_id))
+        parent_of = {row.id: row.parent_id for row in result}
+        rows = []
+        for category_id in parent_of:
+            node, depth, seen = category_id, 0, set()
+            while node is not None and node not in seen: # `seen` guards against cycles in bad data
+                seen.add(node)
+                rows.append({"ancestor_id": node, "descendant_id": category_id, "depth": depth})
+                node, depth = parent_of.get(node), depth + 1
+        await db.execute(delete(CategoryClosure))
+        if rows:
+            await db.execute(insert(CategoryClosure), rows)
+        await db.commit()
+        category_tree.invalidate()
+        return len(rows)
+
     async def get_category_with_children(self, db: AsyncSession, category_id: PyUUID) -> Optional[Category]:
         result = await db.execute(
             select(Category)
@@ -105,6 +203,7 @@ class CRUDCategory(CRUDBase[Category, CategoryCreate, CategoryUpdate]):
                 raise ValueError(f"Slug '{update_data['slug']}' already exists.")
         
         if "parent_id" in update_data:
+            old_parent_id = db_obj.parent_id
             if update_data["parent_id"] is None:
                 db_obj.parent_id = None # Make it top-level
             else:
@@ -116,10 +215,14 @@ class CRUDCategory(CRUDBase[Category, CategoryCreate, CategoryUpdate]):
                     parent_category = await self.get(db, id=parent_uuid)
                     if not parent_category:
                          raise ValueError(f"New parent category with ID {parent_uuid} not found.")
-                    # Optional: Check for circular dependencies if reparenting
-                    db_obj.parent_id = parent_uuid
                 except ValueError:
                     raise ValueError(f"Invalid parent_id format: {update_data['parent_id']}.")
+                if await self.is_in_subtree(db, root_id=db_obj.id, category_id=parent_uuid):
+                    raise ValueError("Category cannot be moved under one of its own descendants.")
+                db_obj.parent_id = parent_uuid
+            if db_obj.parent_id != old_parent_id:
+                # Closure rows change in the same transaction the generic update commits
+                await self._move_subtree(db, db_obj.id, db_obj.parent_id)
             del update_data["parent_id"] # Remove so generic update doesn't try to set it as string
 
         return await super().update(db=db, db_obj=db_obj, obj_in=update_data) # Pass dict
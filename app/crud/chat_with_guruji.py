@@ -19,6 +19,7 @@ class CRUDChatWithGuruji(CRUDBase[ChatWithGuruji, ChatWithGurujiCreate, ChatWith
         db.add(db_obj)
         await db.commit()
         await db.refresh(db_obj)
+        await self.invalidate_cache(db_obj)
         return db_obj
 
 
@@ -58,6 +59,7 @@ class CRUDChatWithGuruji(CRUDBase[ChatWithGuruji, ChatWithGurujiCreate, ChatWith
             obj.is_deleted = True
             await db.commit()
             await db.refresh(obj)  # Refresh to re-fetch any auto-updated fields (optional)
+            await self.invalidate_cache(obj)
 
         return obj
 
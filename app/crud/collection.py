@@ -8,8 +8,10 @@ from sqlalchemy import and_, func
 
 from app.crud.base import CRUDBase
 from app.models.collection import Collection, CollectionItem
+from app.models.content import Content
 from app.schemas.collection import CollectionCreate, CollectionUpdate, CollectionItemCreate, CollectionItemUpdate
 from app.utils.helpers import generate_slug
+from app.utils.cache import entity_tag
 
 class CRUDCollection(CRUDBase[Collection, CollectionCreate, CollectionUpdate]):
     async def create_collection(
@@ -26,6 +28,7 @@ class CRUDCollection(CRUDBase[Collection, CollectionCreate, CollectionUpdate]):
         db.add(db_obj)
         await db.commit()
         await db.refresh(db_obj)
+        await self.invalidate_cache(db_obj)
         # For create response, db_obj.items will be empty, which is fine
         return db_obj
 
@@ -55,6 +58,30 @@ class CRUDCollection(CRUDBase[Collection, CollectionCreate, CollectionUpdate]):
         result = await db.execute(query)
         return result.scalar_one_or_none()
         
+    async def get_public_collection_version(self, db: AsyncSession, id_or_slug: str):
+        """
+        Collection id/updated_at plus item count and the latest item / embedded content updated_at.
+        Private collections return None, same as the detail route's 404.
+        """
+        result = await db.execute(
+            select(
+                Collection.id,
+                Collection.updated_at,
+                func.count(CollectionItem.id),
+                func.max(CollectionItem.updated_at),
+                func.max(Content.updated_at),
+            )
+            .outerjoin(CollectionItem, CollectionItem.collection_id == Collection.id)
+            .outerjoin(Content, Content.id == CollectionItem.content_id)
+            .where(
+                self.id_or_slug_filter(id_or_slug),
+                Collection.is_public.is_(True),
+                Collection.is_deleted.is_(False),
+            )
+            .group_by(Collection.id, Collection.updated_at)
+        )
+        return result.first()
+
     async def get_all_collections_and_count( # For pagination
         self, db: AsyncSession, *, skip: int = 0, limit: int = 100, 
         is_public: Optional[bool] = None, 
@@ -97,6 +124,10 @@ class CRUDCollection(CRUDBase[Collection, CollectionCreate, CollectionUpdate]):
 collection_crud = CRUDCollection(Collection)
 
 class CRUDCollectionItem(CRUDBase[CollectionItem, CollectionItemCreate, CollectionItemUpdate]):
+    def cache_tags(self, obj: CollectionItem) -> List[str]:
+        # Items are only ever served as part of their collection
+        return [entity_tag("collections"), entity_tag("collections", obj.collection_id)]
+
     async def add_item_to_collection(
         self, db: AsyncSession, *, obj_in: CollectionItemCreate, collection_id: UUID
     ) -> CollectionItem:
@@ -130,6 +161,7 @@ class CRUDCollectionItem(CRUDBase[CollectionItem, CollectionItemCreate, Collecti
         await db.refresh(db_obj)
         # Eagerly load the associated content for the response
         await db.refresh(db_obj, attribute_names=['content'])
+        await self.invalidate_cache(db_obj)
         return db_obj
 
     async def get_item_in_collection( # Check if specific content is in collection
@@ -159,6 +191,7 @@ class CRUDCollectionItem(CRUDBase[CollectionItem, CollectionItemCreate, Collecti
             item.is_deleted = True
             await db.commit()
             await db.refresh(item)  # Refresh to re-fetch any auto-updated fields (optional)
+            await self.invalidate_cache(item)
 
             return item # Return the deleted item (or just its ID)
         return None
@@ -180,6 +213,7 @@ class CRUDCollectionItem(CRUDBase[CollectionItem, CollectionItemCreate, Collecti
         await db.commit()
         await db.refresh(db_item)
         await db.refresh(db_item, attribute_names=['content']) # For response
+        await self.invalidate_cache(db_item)
         return db_item
     
     async def get_items_for_collection_paginated(
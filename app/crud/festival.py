@@ -62,6 +62,7 @@ class CRUDFestival(CRUDBase[Festival, FestivalCreate, FestivalUpdate]):
         db.add(db_obj)
         await db.commit()
         await db.refresh(db_obj)
+        await self.invalidate_cache(db_obj)
         return db_obj
 
     async def get_by_name(self, db: AsyncSession, *, name: str) -> Optional[Festival]:
@@ -77,11 +78,12 @@ class CRUDFestival(CRUDBase[Festival, FestivalCreate, FestivalUpdate]):
         state_id: Optional[PyUUID] = None,
         # category_id: Optional[PyUUID] = None,
         is_major: Optional[bool] = None,
-        search_query: Optional[str] = None
+        search_query: Optional[str] = None,
+        columns: Optional[List[str]] = None # Sparse fieldsets: only load these columns
     ) -> Tuple[List[Festival], int]:
         
         count_query = select(func.count(self.model.id)).select_from(self.model).where(self.model.is_deleted.is_(False))
-        data_query = select(self.model).where(self.model.is_deleted.is_(False)) # .options(selectinload(self.model.state)) # Eager load state
+        data_query = self.only_columns(select(self.model), columns).where(self.model.is_deleted.is_(False)) # .options(selectinload(self.model.state)) # Eager load state
 
         filters = []
         if state_id is not None:
@@ -162,6 +164,7 @@ class CRUDFestival(CRUDBase[Festival, FestivalCreate, FestivalUpdate]):
         # db.add(db_obj) # Not strictly necessary if db_obj is already in session and modified
         await db.commit()
         await db.refresh(db_obj)
+        await self.invalidate_cache(db_obj)
         return db_obj
 
 festival_crud = CRUDFestival(Festival)
\ No newline at end of file
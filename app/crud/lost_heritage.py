@@ -18,6 +18,7 @@ class CRUDLostHeritage(CRUDBase[LostHeritage, LostHeritageCreate, LostHeritageUp
         db.add(db_obj)
         await db.commit()
         await db.refresh(db_obj)
+        await self.invalidate_cache(db_obj)
         return db_obj
 
     async def get_by_title(self, db: AsyncSession, title: str) -> Optional[LostHeritage]:
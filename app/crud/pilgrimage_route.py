@@ -29,6 +29,7 @@ class CRUDPilgrimageRoute(CRUDBase[PilgrimageRoute, PilgrimageRouteCreate, Pilgr
         db.add(db_obj)
         await db.commit()
         await db.refresh(db_obj)
+        await self.invalidate_cache(db_obj)
         return db_obj
 
 
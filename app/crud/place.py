@@ -6,6 +6,7 @@ from uuid import UUID
 from app.models import Place
 from app.schemas import PlaceCreate, PlaceUpdate
 from app.crud.base import CRUDBase
+from app.crud.category import category_filter
 from sqlalchemy import func
 
 
@@ -17,6 +18,7 @@ class CRUDPlace(CRUDBase[Place, PlaceCreate, PlaceUpdate]):
         db.add(db_obj)
         await db.commit()
         await db.refresh(db_obj)
+        await self.invalidate_cache(db_obj)
         return db_obj
 
 
@@ -30,21 +32,9 @@ class CRUDPlace(CRUDBase[Place, PlaceCreate, PlaceUpdate]):
         return result.scalar_one_or_none()
 
 
-    async def get_by_ids(self, db: AsyncSession, ids: List[UUID]) -> List[Place]:
-        if not ids:
-            return []
+    async def get_all(self, db: AsyncSession, *, columns: Optional[List[str]] = None) -> List[Place]:
         result = await db.execute(
-            select(self.model).where(
-                self.model.id.in_(ids),
-                self.model.is_deleted.is_(False)
-            )
-        )
-        return result.scalars().all()
-
-
-    async def get_all(self, db: AsyncSession) -> List[Place]:
-        result = await db.execute(
-            select(self.model).where(
+            self.only_columns(select(self.model), columns).where(
                 self.model.is_deleted.is_(False)
             )
         )
@@ -60,6 +50,8 @@ class CRUDPlace(CRUDBase[Place, PlaceCreate, PlaceUpdate]):
             state_id: Optional[UUID] = None,
             city_id: Optional[UUID] = None,
             country_id: Optional[UUID] = None,
+            include_descendants: bool = False, # Also match sub-categories of category_id
+            columns: Optional[List[str]] = None, # Sparse fieldsets: only load these columns
     ) -> Tuple[List[Place], int]:
         filters = []
         if name is not None:
@@ -72,7 +64,7 @@ class CRUDPlace(CRUDBase[Place, PlaceCreate, PlaceUpdate]):
             except KeyError: pass
         if category_id is not None:
             try:
-                filters.append(self.model.category_id == category_id)
+                filters.append(category_filter(self.model.category_id, category_id, include_descendants))
             except KeyError: pass
         if region_id is not None:
             try:
@@ -95,7 +87,7 @@ class CRUDPlace(CRUDBase[Place, PlaceCreate, PlaceUpdate]):
         total_result = await db.execute(count_query)
         total_count = total_result.scalar_one()
 
-        data_query = (select(self.model).where(*filters,self.model.is_deleted.is_(False)).offset(skip).limit(limit))
+        data_query = (self.only_columns(select(self.model), columns).where(*filters,self.model.is_deleted.is_(False)).offset(skip).limit(limit))
         result = await db.execute(data_query)
         items = result.scalars().all()
 
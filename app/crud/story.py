@@ -6,9 +6,11 @@ from sqlalchemy.future import select
 from sqlalchemy import func, or_
 
 from app.crud.base import CRUDBase
+from app.crud.category import category_filter
 from app.models.content import Content, ContentSubType, ContentType as ModelContentTypeEnum, ContentStatus, LanguageCode as ModelLanguageCode
 from app.schemas.story import StoryCreate, StoryUpdate # Use specific Story schemas
 from app.utils.helpers import generate_slug
+from app.models.category import Category
 
 class CRUDStory(CRUDBase[Content, StoryCreate, StoryUpdate]): # Typed with Story schemas
     
@@ -37,11 +39,12 @@ class CRUDStory(CRUDBase[Content, StoryCreate, StoryUpdate]): # Typed with Story
         db.add(db_obj)
         await db.commit()
         await db.refresh(db_obj)
+        await self.invalidate_cache(db_obj)
         return db_obj
 
-    async def get_story(self, db: AsyncSession, story_id: PyUUID) -> Optional[Content]:
+    async def get_story(self, db: AsyncSession, story_id: PyUUID, *, columns: Optional[List[str]] = None) -> Optional[Content]:
         result = await db.execute(
-            select(self.model) # self.model is Content
+            self.only_columns(select(self.model), columns) # self.model is Content
             .filter(self.model.id == story_id)
             .filter(self.model.sub_type == ContentSubType.STORY.value)
             .filter(self.model.is_deleted.is_(False))
@@ -50,9 +53,13 @@ class CRUDStory(CRUDBase[Content, StoryCreate, StoryUpdate]): # Typed with Story
         )
         return result.scalar_one_or_none()
 
-    async def get_story_by_slug(self, db: AsyncSession, slug: str) -> Optional[Content]:
+    async def get_stories_by_ids(self, db: AsyncSession, ids: List[PyUUID], *, columns: Optional[List[str]] = None) -> List[Content]:
+        """Stories among `ids`, in request order (one IN query)."""
+        return await self.get_by_ids(db, ids, self.model.sub_type == ContentSubType.STORY.value, columns=columns)
+
+    async def get_story_by_slug(self, db: AsyncSession, slug: str, *, columns: Optional[List[str]] = None) -> Optional[Content]:
         result = await db.execute(
-            select(self.model)
+            self.only_columns(select(self.model), columns)
             .filter(self.model.slug == slug)
             .filter(self.model.sub_type == ContentSubType.STORY.value)
             .filter(self.model.is_deleted.is_(False))
@@ -60,12 +67,25 @@ class CRUDStory(CRUDBase[Content, StoryCreate, StoryUpdate]): # Typed with Story
         )
         return result.scalar_one_or_none()
 
+    async def get_story_version(self, db: AsyncSession, id_or_slug: str):
+        """(id, updated_at, category updated_at) - the response embeds the category name."""
+        result = await db.execute(
+            select(self.model.id, self.model.updated_at, Category.updated_at)
+            .outerjoin(Category, Category.id == self.model.category_id)
+            .filter(self.id_or_slug_filter(id_or_slug))
+            .filter(self.model.sub_type == ContentSubType.STORY.value)
+            .filter(self.model.is_deleted.is_(False))
+        )
+        return result.first()
+
     async def get_stories_list_and_count(
         self, db: AsyncSession, *, skip: int = 0, limit: int = 10,
         status_str: Optional[str] = None, # Allow filtering by any status
         category_id_str: Optional[str] = None,
         language_str: Optional[str] = None,
-        search_query: Optional[str] = None
+        search_query: Optional[str] = None,
+        include_descendants: bool = False, # Also match sub-categories of category_id
+        columns: Optional[List[str]] = None # Sparse fieldsets: only load these columns
     ) -> Tuple[List[Content], int]:
         
         filters = [
@@ -76,7 +96,7 @@ class CRUDStory(CRUDBase[Content, StoryCreate, StoryUpdate]): # Typed with Story
             try: filters.append(self.model.status == ContentStatus[status_str.upper()].value)
             except KeyError: pass
         if category_id_str:
-            try: filters.append(self.model.category_id == PyUUID(category_id_str))
+            try: filters.append(category_filter(self.model.category_id, PyUUID(category_id_str), include_descendants))
             except ValueError: pass
         if language_str:
             try: filters.append(self.model.language == ModelLanguageCode[language_str.upper()].value)
@@ -90,7 +110,7 @@ class CRUDStory(CRUDBase[Content, StoryCreate, StoryUpdate]): # Typed with Story
         total_result = await db.execute(count_query)
         total_count = total_result.scalar_one()
 
-        data_query = select(self.model).where(*filters, self.model.is_deleted.is_(False)).order_by(self.model.created_at.desc()).offset(skip).limit(limit)
+        data_query = self.only_columns(select(self.model), columns).where(*filters, self.model.is_deleted.is_(False)).order_by(self.model.created_at.desc()).offset(skip).limit(limit)
         items_result = await db.execute(data_query)
         items = items_result.scalars().all()
         
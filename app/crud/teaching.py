@@ -6,6 +6,7 @@ from sqlalchemy.future import select
 from sqlalchemy import func, or_
 
 from app.crud.base import CRUDBase
+from app.crud.category import category_filter
 from app.models.content import Content, ContentSubType, ContentType as ModelContentTypeEnum, ContentStatus, LanguageCode as ModelLanguageCode
 from app.schemas.teaching import TeachingCreate, TeachingUpdate # Use specific Teaching schemas
 from app.utils.helpers import generate_slug
@@ -39,33 +40,46 @@ class CRUDTeaching(CRUDBase[Content, TeachingCreate, TeachingUpdate]): # Typed w
         db.add(db_obj)
         await db.commit()
         await db.refresh(db_obj)
+        await self.invalidate_cache(db_obj)
         return db_obj
 
-    async def get_teaching(self, db: AsyncSession, teaching_id: PyUUID) -> Optional[Content]:
+    async def get_teaching(self, db: AsyncSession, teaching_id: PyUUID, *, columns: Optional[List[str]] = None) -> Optional[Content]:
         result = await db.execute(
-            select(self.model)
+            self.only_columns(select(self.model), columns)
             .filter(self.model.id == teaching_id)
             .filter(self.model.sub_type == ContentSubType.TEACHING.value)
             .filter(self.model.is_deleted.is_(False))
         )
         return result.scalar_one_or_none()
 
-    async def get_teaching_by_slug(self, db: AsyncSession, slug: str) -> Optional[Content]:
+    async def get_teachings_by_ids(self, db: AsyncSession, ids: List[PyUUID], *, columns: Optional[List[str]] = None) -> List[Content]:
+        """Teachings among `ids`, in request order (one IN query)."""
+        return await self.get_by_ids(db, ids, self.model.sub_type == ContentSubType.TEACHING.value, columns=columns)
+
+    async def get_teaching_by_slug(self, db: AsyncSession, slug: str, *, columns: Optional[List[str]] = None) -> Optional[Content]:
         result = await db.execute(
-            select(self.model)
+            self.only_columns(select(self.model), columns)
             .filter(self.model.slug == slug)
             .filter(self.model.sub_type == ContentSubType.TEACHING.value)
             .filter(self.model.is_deleted.is_(False))
         )
         return result.scalar_one_or_none()
 
+    async def get_teaching_version(self, db: AsyncSession, id_or_slug: str):
+        """(id, updated_at) for the teaching detail ETag."""
+        return await self.get_version(
+            db, self.id_or_slug_filter(id_or_slug), self.model.sub_type == ContentSubType.TEACHING.value
+        )
+
     async def get_teachings_list_and_count(
         self, db: AsyncSession, *, skip: int = 0, limit: int = 10,
         content_type_str: Optional[str] = None, # Client sends "ARTICLE", "AUDIO", "VIDEO"
         status_str: Optional[str] = None,
         category_id_str: Optional[str] = None,
         language_str: Optional[str] = None,
-        search_query: Optional[str] = None
+        search_query: Optional[str] = None,
+        include_descendants: bool = False, # Also match sub-categories of category_id
+        columns: Optional[List[str]] = None # Sparse fieldsets: only load these columns
     ) -> Tuple[List[Content], int]:
         
         filters = [self.model.sub_type == ContentSubType.TEACHING.value]
@@ -78,7 +92,7 @@ class CRUDTeaching(CRUDBase[Content, TeachingCreate, TeachingUpdate]): # Typed w
             try: filters.append(self.model.status == ContentStatus[status_str.upper()].value)
             except KeyError: pass
         if category_id_str:
-            try: filters.append(self.model.category_id == PyUUID(category_id_str))
+            try: filters.append(category_filter(self.model.category_id, PyUUID(category_id_str), include_descendants))
             except ValueError: pass
         if language_str:
             try: filters.append(self.model.language == ModelLanguageCode[language_str.upper()].value)
@@ -92,7 +106,7 @@ class CRUDTeaching(CRUDBase[Content, TeachingCreate, TeachingUpdate]): # Typed w
         total_result = await db.execute(count_query)
         total_count = total_result.scalar_one()
 
-        data_query = select(self.model).where(*filters, self.model.is_deleted.is_(False)).order_by(self.model.created_at.desc()).offset(skip).limit(limit)
+        data_query = self.only_columns(select(self.model), columns).where(*filters, self.model.is_deleted.is_(False)).order_by(self.model.created_at.desc()).offset(skip).limit(limit)
         items_result = await db.execute(data_query)
         items = items_result.scalars().all()
         print(f"Retrieved {len(items)} items with total count {total_count} from the database.")
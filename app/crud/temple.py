@@ -18,6 +18,7 @@ class CRUDTemple(CRUDBase[Temple, TempleCreate, TempleUpdate]):
         db.add(db_obj)
         await db.commit()
         await db.refresh(db_obj)
+        await self.invalidate_cache(db_obj)
         return db_obj
 
 
@@ -34,6 +35,7 @@ class CRUDTemple(CRUDBase[Temple, TempleCreate, TempleUpdate]):
     async def get_filtered_with_count(
             self, db: AsyncSession, *, skip: int = 0, limit: int = 100,
             search: Optional[str] = None,
+            columns: Optional[List[str]] = None, # Sparse fieldsets: only load these columns
     ) -> Tuple[List[Temple], int]:
         filters = []
         if search is not None:
@@ -45,7 +47,7 @@ class CRUDTemple(CRUDBase[Temple, TempleCreate, TempleUpdate]):
         total_result = await db.execute(count_query)
         total_count = total_result.scalar_one()
 
-        data_query = select(self.model).where(*filters,self.model.is_deleted.is_(False)).offset(skip).limit(limit)
+        data_query = self.only_columns(select(self.model), columns).where(*filters,self.model.is_deleted.is_(False)).offset(skip).limit(limit)
         result = await db.execute(data_query)
         items = result.scalars().all()
 
@@ -0,0 +1,116 @@
+# app/crud/transcript_segment.py
+from typing import Dict, List, Tuple
+from uuid import UUID
+from sqlalchemy import delete, insert, over
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.sql import func
+from app.crud.base import CRUDBase
+from app.crud.book_chapter import book_chapter_crud
+from app.models.content import BookChapter, TranscriptSegment
+from app.schemas.transcript import TranscriptSegmentIn
+from app.utils.text_search import highlight, match_and_rank, query_terms
+
+
+class CRUDTranscriptSegment(CRUDBase[TranscriptSegment, TranscriptSegmentIn, TranscriptSegmentIn]):
+
+    async def replace_for_chapter(
+        self, db: AsyncSession, *, chapter: BookChapter, segments: List[TranscriptSegmentIn], batch_size: int = 1000
+    ) -> int:
+        """
+        Swap the chapter's segments for `segments` (sorted by start time) and write their text
+        to chapter.transcript, in one transaction. Returns the number of segments stored.
+        """
+        ordered = sorted(segments, key=lambda segment: (segment.start_seconds, segment.end_seconds))
+        await db.execute(delete(TranscriptSegment).where(TranscriptSegment.chapter_id == chapter.id))
+        rows = [
+            {
+                "chapter_id": chapter.id, "segment_index": index, "start_seconds": segment.start_seconds,
+                "end_seconds": segment.end_seconds, "text": segment.text, "search_vector": segment.text,
+            }
+            for index, segment in enumerate(ordered)
+        ]
+        for start in range(0, len(rows), batch_size):
+            await db.execute(insert(TranscriptSegment), rows[start:start + batch_size])
+        # Commits; updated_at is set even when only timings changed, since it versions the transcript windows
+        await book_chapter_crud.update(
+            db, db_obj=chapter,
+            obj_in={"transcript": "\n".join(segment.text for segment in ordered), "updated_at": func.now()},
+        )
+        return len(rows)
+
+    async def get_window(
+        self, db: AsyncSession, *, chapter_id: UUID, from_seconds: float, to_seconds: float, limit: int
+    ) -> List[TranscriptSegment]:
+        """Segments overlapping [from_seconds, to_seconds], in playback order."""
+        result = await db.execute(
+            select(self.model)
+            .where(
+                TranscriptSegment.chapter_id == chapter_id,
+                TranscriptSegment.start_seconds <= to_seconds,
+                TranscriptSegment.end_seconds >= from_seconds,
+            )
+            .order_by(TranscriptSegment.start_seconds)
+            .limit(limit)
+        )
+        return result.scalars().all()
+
+    async def search_book(
+        self, db: AsyncSession, *, book_id: UUID, query: str, skip: int = 0, limit: int = 20
+    ) -> Tuple[List[Dict], int]:
+        """
+        Transcript segments of one book's chapters matching a web-search style query, best
+        first, as (hits, total_count). Served from the segment index; segment texts are short,
+        so the snippet is cut from the matched row itself.
+        """
+        terms = query_terms(query)
+        if not terms:
+            return [], 0
+        match, rank = match_and_rank(TranscriptSegment.search_vector, query, terms, db.bind.dialect.name)
+        filters = [BookChapter.book_id == book_id, *match]
+        page = (
+            await db.execute(
+                select(
+                    TranscriptSegment.chapter_id,
+                    BookChapter.chapter_number,
+                    BookChapter.title.label("chapter_title"),
+                    TranscriptSegment.segment_index,
+                    TranscriptSegment.start_seconds,
+                    TranscriptSegment.end_seconds,
+                    TranscriptSegment.text,
+                    rank.label("rank"),
+                    over(func.count()).label("total_count"),
+                )
+                .join(BookChapter, BookChapter.id == TranscriptSegment.chapter_id)
+                .where(*filters)
+                .order_by(rank.desc(), BookChapter.chapter_number, TranscriptSegment.start_seconds)
+                .offset(skip)
+                .limit(limit)
+            )
+        ).all()
+        if not page:
+            total_count = 0 if skip == 0 else (
+                await db.execute(
+                    select(func.count(TranscriptSegment.id))
+                    .join(BookChapter, BookChapter.id == TranscriptSegment.chapter_id)
+                    .where(*filters)
+                )
+            ).scalar_one()
+            return [], total_count
+        hits = [
+            {
+                "chapter_id": row.chapter_id,
+                "chapter_number": row.chapter_number,
+                "chapter_title": row.chapter_title,
+                "segment_index": row.segment_index,
+                "start_seconds": row.start_seconds,
+                "end_seconds": row.end_seconds,
+                "rank": row.rank,
+                "snippet": highlight(row.text, terms),
+            }
+            for row in page
+        ]
+        return hits, page[0].total_count
+
+
+transcript_segment_crud = CRUDTranscriptSegment(TranscriptSegment)
@@ -9,11 +9,16 @@ from app.api.v1 import (
     auth, users, homepage, categories, collections, contact,
     place, webhooks, book, s3_upload, stories, teachings,
     location, temple, lost_heritage, festivals, pilgrimage_route,
-    chat_with_guruji
+    chat_with_guruji, exports, progress
 )
      # , admin, places, calendar # Placeholder for future routers
 
 from app.config import settings
+from app.utils.cache import response_cache
+from app.services.progress_buffer import progress_buffer
+from app.utils.slug_cache import slug_cache
+from app.utils.serialization import ORJSONResponse
+from app.utils.compression import CompressionMiddleware, compressed_body_cache
 from app.database import Base, sync_engine # Use sync_engine for initial table creation
 from fastapi.staticfiles import StaticFiles
 
@@ -28,7 +33,8 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
-    openapi_url="/api/v1/openapi.json" # Good practice for versioned OpenAPI
+    openapi_url="/api/v1/openapi.json", # Good practice for versioned OpenAPI
+    default_response_class=ORJSONResponse, # orjson instead of stdlib json for every route
 )
 
 # Mount static files directory
@@ -55,6 +61,10 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware, minimum_size=settings.COMPRESSION_MIN_SIZE, body_cache=compressed_body_cache
+    )
 # app.add_middleware(TrustedHostMiddleware, allowed_hosts=settings.ALLOWED_HOSTS if settings.ALLOWED_HOSTS else ["*"])
 
 
@@ -79,6 +89,14 @@ app.include_router(s3_upload.router, prefix="/api/v1/s3_upload", tags=["S3 Uploa
 app.include_router(temple.router, prefix="/api/v1/temples", tags=["Temple"])
 app.include_router(pilgrimage_route.router, prefix="/api/v1/pilgrimage_route", tags=["Pilgrimage Route"])
 app.include_router(chat_with_guruji.router, prefix="/api/v1/chat_with_guruji", tags=["Chat With Guruji"])
+app.include_router(exports.router, prefix="/api/v1/exports", tags=["Exports"])
+app.include_router(progress.router, prefix="/api/v1/progress", tags=["Reading Progress"])
+
+
+@app.on_event("shutdown")
+async def flush_progress():
+    # Write the reading positions still waiting in this worker's buffer
+    await progress_buffer.close()
 
 
 @app.get("/", tags=["Root"])
@@ -90,5 +108,15 @@ async def health_check():
     # Add database connectivity check here if desired
     return {"status": "healthy"}
 
+@app.get("/health/cache", tags=["Health Check"])
+async def cache_metrics():
+    # Per-worker counters: hits, misses, stale serves, coalesced waiters, background refreshes
+    return {
+        **response_cache.metrics.snapshot(),
+        "compressed_bodies": compressed_body_cache.snapshot(),
+        "progress_buffer": progress_buffer.snapshot(),
+        "slug_cache": slug_cache.snapshot(),
+    }
+
 # Example of how to run with uvicorn for development:
 # uvicorn app.main:app --reload
\ No newline at end of file
@@ -2,17 +2,20 @@
 from app.database import Base
 
 from .user import User, UserRole, LanguageCode
-from .category import Category
+from .category import Category, CategoryClosure
 from .lost_heritage import LostHeritage
 from .temple import Temple
 from .place import Place
 from .location import Country, Region, State, City
 from .pilgrimage_route import PilgrimageRoute
-from .content import Content, ContentType, ContentStatus, BookChapter, BookSection
+from .content import Content, ContentType, ContentStatus, BookChapter, BookSection, TranscriptSegment
 from .collection import Collection, CollectionItem
 from .festival import Festival
 from .contact_submission import ContactSubmission, ContactStatus
 from .chat_with_guruji import ChatWithGuruji
+from .user_progress import UserProgress
+from . import reading_stats  # registers the reading statistics listeners
+from . import section_search  # registers the search vector listener
 
 # from .content import ContentChapter, ContentTranslation # Add when created
 # from .places import SacredPlace, PlaceType # Add when created
@@ -1,6 +1,6 @@
 # app/models/category.py
 from sqlalchemy import (
-    Column, Integer, String, Text, DateTime, Boolean, ForeignKey,
+    Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Index,
     Enum as SQLAlchemyEnum # Import SQLAlchemyEnum
 )
 from sqlalchemy.orm import relationship
@@ -57,4 +57,23 @@ class Category(Base):
     # content_items = relationship("Content", back_populates="category") # This is defined via backref on Content.category
 
     def __repr__(self):
-        return f"<Category(id={self.id}, name='{self.name}', type='{self.type if self.type else None}')>"
\ No newline at end of file
+        return f"<Category(id={self.id}, name='{self.name}', type='{self.type if self.type else None}')>"
+
+
+class CategoryClosure(Base):
+    """
+    Ancestor/descendant pairs for Category.parent_id, including each category paired with
+    itself at depth 0. "Everything under X" is then one indexed lookup on ancestor_id
+    instead of a recursive walk. Maintained by CRUDCategory on create/reparent; rebuild
+    with `python -m app.scripts.rebuild_category_closure`.
+    """
+    __tablename__ = "category_closure"
+
+    ancestor_id = Column(UUID(as_uuid=True), ForeignKey("categories.id", ondelete="CASCADE"), primary_key=True)
+    descendant_id = Column(UUID(as_uuid=True), ForeignKey("categories.id", ondelete="CASCADE"), primary_key=True)
+    depth = Column(Integer, nullable=False)
+
+    __table_args__ = (
+        # PK (ancestor_id, descendant_id) serves subtree lookups; this one serves ancestor lookups
+        Index('idx_category_closure_descendant', 'descendant_id', 'ancestor_id'),
+    )
@@ -3,14 +3,17 @@ from sqlalchemy import (
     Column, Integer, String, Text, DateTime, Boolean, Float, 
     ForeignKey, Enum as SQLAlchemyEnum, JSON, Index, UniqueConstraint
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 from enum import Enum as PyEnum
 from datetime import datetime
 import uuid
+from typing import Optional
 from sqlalchemy.dialects.postgresql import UUID
 
 from app.database import Base # Corrected import
+from app.utils.compressed_text import LongText
+from app.utils.text_search import SearchVector
 from app.models.user import User # Import User for relationship
 from app.models.user import LanguageCode
 
@@ -78,7 +81,7 @@ class Content(Base):
     published_at = Column(DateTime, nullable=True)
     featured = Column(Boolean, default=False)
     is_deleted = Column(Boolean, default=False, nullable=True)
-    content = Column(Text, nullable=True)
+    content = Column(LongText, nullable=True)
     premium_content = Column(Boolean, default=False)
     view_count = Column(Integer, default=0)
     download_count = Column(Integer, default=0)
@@ -89,6 +92,11 @@ class Content(Base):
     meta_title = Column(String(160), nullable=True)
     meta_description = Column(String(320), nullable=True)
     keywords = Column(JSON, nullable=True)
+    # Reading statistics (app/models/reading_stats.py): of `content`, or for books the sum of the chapters. NULL = not computed yet
+    word_count = Column(Integer, nullable=True)
+    char_count = Column(Integer, nullable=True)
+    reading_time_seconds = Column(Integer, nullable=True)
+    listening_time_seconds = Column(Integer, nullable=True)
     created_at = Column(DateTime, default=func.now(), nullable=False)
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
     
@@ -125,6 +133,19 @@ class Content(Base):
     def status_enum(self, value: ContentStatus):
         self.status = value.value
 
+    @property
+    def book_format(self) -> Optional[str]:
+        # Read by BookResponse.book_format (from_attributes), so book lists serialize straight from rows
+        if self.sub_type != ContentSubType.BOOK.value:
+            return None
+        if self.content_type == ContentType.AUDIO.value:
+            return BookType.AUDIO.value
+        if self.content_type == ContentType.BOOK.value:
+            return BookType.TEXT.value
+        if self.content_type == ContentType.VIDEO.value:
+            return BookType.VIDEO.value
+        return BookType.PDF.value
+
     def __repr__(self):
         return f"<Content(id={self.id}, title='{self.title}')>"
 
@@ -141,10 +162,17 @@ class BookChapter(Base):
     audio_url = Column(String(500), nullable=True)
     video_url = Column(String(500), nullable=True) # Added video_url if distinct from audio
     duration = Column(Integer, nullable=True)  # Duration of this chapter in seconds
-    transcript = Column(Text, nullable=True)    # Transcript for audio/video
+    transcript = Column(LongText, nullable=True)    # Transcript for audio/video
     summary = Column(Text, nullable=True)
     key_points = Column(JSON, nullable=True) # Array of key points or takeaways
     is_preview_allowed = Column(Boolean, default=False) # Can this chapter be previewed for free?
+    # Reading statistics: the transcript's own counts, and totals over transcript + sections
+    transcript_word_count = Column(Integer, nullable=True)
+    transcript_char_count = Column(Integer, nullable=True)
+    word_count = Column(Integer, nullable=True)
+    char_count = Column(Integer, nullable=True)
+    reading_time_seconds = Column(Integer, nullable=True)
+    listening_time_seconds = Column(Integer, nullable=True) # duration when known, else estimated from the transcript
     created_at = Column(DateTime, default=func.now(), nullable=False)
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)
     content = relationship("Content", back_populates="chapters")
@@ -154,6 +182,14 @@ class BookChapter(Base):
         cascade="all, delete-orphan",
         order_by="BookSection.section_order"
     )
+    # Removed by the database's ON DELETE CASCADE; never loaded just to delete a chapter
+    transcript_segments = relationship(
+        "TranscriptSegment",
+        back_populates="chapter",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        order_by="TranscriptSegment.segment_index"
+    )
     __table_args__ = (
         UniqueConstraint('book_id', 'chapter_number', name='uq_book_chapter_number'),
         # FIX THIS LINE: Change 'content_id' to 'book_id'
@@ -170,8 +206,13 @@ class BookSection(Base):
     chapter_id = Column(UUID(as_uuid=True), ForeignKey("book_chapters.id"), nullable=False)
     
     title = Column(String(500), nullable=True) # Section title can be optional if it's just a block of text
-    body = Column(Text, nullable=False)        # The actual text content of the section
+    body = Column(LongText, nullable=False)        # The actual text content of the section
     section_order = Column(Integer, nullable=False, default=0) # For ordering sections within a chapter
+    content_hash = Column(String(64), nullable=True) # sha256 of title + body, lets re-imports skip unchanged sections
+    word_count = Column(Integer, nullable=True)
+    char_count = Column(Integer, nullable=True)
+    # title + body for in-book search (app/utils/text_search.py); set on write, never loaded
+    search_vector = deferred(Column(SearchVector, nullable=True))
     created_at = Column(DateTime, default=func.now(), nullable=False)
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)
 
@@ -182,8 +223,35 @@ class BookSection(Base):
         # Consider a unique constraint on chapter_id and title if titles must be unique per chapter
         # UniqueConstraint('chapter_id', 'title', name='uq_chapter_section_title'),
         Index('idx_book_section_chapter_id_order', 'chapter_id', 'section_order'),
+        Index('idx_book_section_search_vector', 'search_vector', postgresql_using='gin'),
     )
 
     def __repr__(self):
         return f"<BookSection(id={self.id}, title='{self.title}', order={self.section_order})>"
 
+
+class TranscriptSegment(Base):
+    """One timed cue of an audio/video chapter's transcript (see app/services/transcripts.py)."""
+    __tablename__ = "transcript_segments"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    chapter_id = Column(UUID(as_uuid=True), ForeignKey("book_chapters.id", ondelete="CASCADE"), nullable=False)
+    segment_index = Column(Integer, nullable=False)  # 0-based, in playback order
+    start_seconds = Column(Float, nullable=False)
+    end_seconds = Column(Float, nullable=False)
+    text = Column(Text, nullable=False)
+    # Set on write, never loaded (app/utils/text_search.py)
+    search_vector = deferred(Column(SearchVector, nullable=True))
+    created_at = Column(DateTime, default=func.now(), nullable=False)
+
+    chapter = relationship("BookChapter", back_populates="transcript_segments")
+
+    __table_args__ = (
+        UniqueConstraint('chapter_id', 'segment_index', name='uq_transcript_segment_index'),
+        Index('idx_transcript_segment_chapter_start', 'chapter_id', 'start_seconds'),
+        Index('idx_transcript_segment_search_vector', 'search_vector', postgresql_using='gin'),
+    )
+
+    def __repr__(self):
+        return f"<TranscriptSegment(chapter_id={self.chapter_id}, index={self.segment_index}, start={self.start_seconds})>"
+
@@ -1,5 +1,6 @@
 # app/models/lost_heritage.py
 from app.database import Base
+from app.utils.compressed_text import LongText
 from enum import Enum
 
 from sqlalchemy import (
@@ -21,7 +22,7 @@ class LostHeritage(Base):
     content_type =  Column(String(100), nullable=False)
 
     # Content
-    article_content = Column(Text, nullable=True)
+    article_content = Column(LongText, nullable=True)
     video_url = Column(String(1000), nullable=True)
     gallery_images = Column(JSON, nullable=True)       # list of images
 
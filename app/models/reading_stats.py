@@ -0,0 +1,167 @@
+# app/models/reading_stats.py
+"""
+Word count, character count and estimated reading/listening time, kept up to date on write
+so list, TOC and detail responses read them as plain columns.
+
+Row level: before_insert/before_update mapper listeners recount a BookSection body, a
+BookChapter transcript or a (non-book) Content.content only when that attribute changed,
+so a title or status edit never re-reads the text. The importers' Core multi-row INSERTs
+bypass the mapper and include text_stats() in their rows instead.
+
+Rollups: chapter totals (transcript + sections) and book totals (sum of the chapters) are
+recomputed from those stored integers - never from the text - right before commit, for the
+chapters/books marked with mark_stale() in the transaction. book_chapter_crud.touch_book()
+marks them, and every chapter and section write already goes through it.
+
+Reading time uses READING_WORDS_PER_MINUTE; listening time is a chapter's `duration` when
+set, else its transcript at LISTENING_WORDS_PER_MINUTE.
+"""
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import event, func, inspect, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.content import BookChapter, BookSection, Content, ContentSubType
+
+_PENDING_KEY = "reading_stats_pending"
+
+
+def text_stats(text: Optional[str]) -> Dict[str, int]:
+    """{"word_count", "char_count"} of a text; words are whitespace separated (Latin and Indic scripts alike)."""
+    if not text:
+        return {"word_count": 0, "char_count": 0}
+    return {"word_count": len(text.split()), "char_count": len(text)}
+
+
+def estimated_seconds(words: int, words_per_minute: int) -> int:
+    return -(-words * 60 // words_per_minute)  # ceiling division
+
+
+def _sql_seconds(words, words_per_minute: int):
+    return (words * 60 + words_per_minute - 1) // words_per_minute
+
+
+def _changed(target, *attributes: str) -> bool:
+    state = inspect(target)
+    return any(state.attrs[name].history.has_changes() for name in attributes)
+
+
+# --- row level ---
+
+@event.listens_for(BookSection, "before_insert")
+@event.listens_for(BookSection, "before_update")
+def _section_stats(mapper, connection, target: BookSection) -> None:
+    if target.word_count is None or _changed(target, "body"):
+        stats = text_stats(target.body)
+        target.word_count, target.char_count = stats["word_count"], stats["char_count"]
+
+
+@event.listens_for(BookChapter, "before_insert")
+@event.listens_for(BookChapter, "before_update")
+def _transcript_stats(mapper, connection, target: BookChapter) -> None:
+    if target.transcript_word_count is None or _changed(target, "transcript"):
+        stats = text_stats(target.transcript)
+        target.transcript_word_count, target.transcript_char_count = stats["word_count"], stats["char_count"]
+
+
+@event.listens_for(Content, "before_insert")
+@event.listens_for(Content, "before_update")
+def _content_stats(mapper, connection, target: Content) -> None:
+    if target.sub_type == ContentSubType.BOOK.value:
+        # Books are rolled up from their chapters
+        if target.word_count is None:
+            target.word_count = target.char_count = target.reading_time_seconds = 0
+        return
+    if target.word_count is None or _changed(target, "content", "duration"):
+        stats = text_stats(target.content)
+        target.word_count, target.char_count = stats["word_count"], stats["char_count"]
+        target.reading_time_seconds = estimated_seconds(stats["word_count"], settings.READING_WORDS_PER_MINUTE)
+        target.listening_time_seconds = target.duration
+
+
+# --- rollups ---
+
+def mark_stale(session: Session, *, book_id=None, chapter_id=None) -> None:
+    """Recompute this book's (or chapter's and its book's) totals when the transaction commits."""
+    pending = session.info.setdefault(_PENDING_KEY, {"books": set(), "chapters": set()})
+    if book_id is not None:
+        pending["books"].add(book_id)
+    if chapter_id is not None:
+        pending["chapters"].add(chapter_id)
+
+
+def roll_up(session: Session, *, book_ids: Iterable = (), chapter_ids: Iterable = ()) -> None:
+    """
+    Chapter totals for `chapter_ids` and every chapter of `book_ids`, then the totals of all
+    those books. Integer aggregates over indexed child rows; chapters whose totals didn't
+    change are not written, and updated_at is left alone (the book was already touched).
+    """
+    book_ids, chapter_ids = set(book_ids), set(chapter_ids)
+    if chapter_ids:
+        book_ids |= set(
+            session.execute(select(BookChapter.book_id).where(BookChapter.id.in_(chapter_ids))).scalars()
+        )
+    if not book_ids:
+        return
+
+    chapters, sections, content = BookChapter.__table__, BookSection.__table__, Content.__table__
+    section_words = (
+        select(func.coalesce(func.sum(sections.c.word_count), 0)).where(sections.c.chapter_id == chapters.c.id).scalar_subquery()
+    )
+    section_chars = (
+        select(func.coalesce(func.sum(sections.c.char_count), 0)).where(sections.c.chapter_id == chapters.c.id).scalar_subquery()
+    )
+    words = func.coalesce(chapters.c.transcript_word_count, 0) + section_words
+    chars = func.coalesce(chapters.c.transcript_char_count, 0) + section_chars
+    reading = _sql_seconds(words, settings.READING_WORDS_PER_MINUTE)
+    transcript_listening = _sql_seconds(func.coalesce(chapters.c.transcript_word_count, 0), settings.LISTENING_WORDS_PER_MINUTE)
+    listening = func.coalesce(chapters.c.duration, func.nullif(transcript_listening, 0))
+    scope = chapters.c.id.in_(chapter_ids) if chapter_ids else None
+    scope = or_(scope, chapters.c.book_id.in_(book_ids)) if scope is not None else chapters.c.book_id.in_(book_ids)
+    session.execute(
+        update(chapters)
+        .where(
+            scope,
+            or_(
+                chapters.c.word_count.is_distinct_from(words),
+                chapters.c.char_count.is_distinct_from(chars),
+                chapters.c.reading_time_seconds.is_distinct_from(reading),
+                chapters.c.listening_time_seconds.is_distinct_from(listening),
+            ),
+        )
+        .values(
+            word_count=words, char_count=chars, reading_time_seconds=reading,
+            listening_time_seconds=listening, updated_at=chapters.c.updated_at,
+        )
+    )
+
+    def chapter_sum(column):
+        return select(func.sum(column)).where(chapters.c.book_id == content.c.id).scalar_subquery()
+
+    book_words = func.coalesce(chapter_sum(chapters.c.word_count), 0)
+    session.execute(
+        update(content)
+        .where(content.c.id.in_(book_ids))
+        .values(
+            word_count=book_words,
+            char_count=func.coalesce(chapter_sum(chapters.c.char_count), 0),
+            reading_time_seconds=_sql_seconds(book_words, settings.READING_WORDS_PER_MINUTE),
+            listening_time_seconds=chapter_sum(chapters.c.listening_time_seconds),
+            updated_at=content.c.updated_at,
+        )
+    )
+
+
+@event.listens_for(Session, "before_commit")
+def _roll_up_pending(session: Session) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        session.flush()
+        roll_up(session, book_ids=pending["books"], chapter_ids=pending["chapters"])
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
@@ -0,0 +1,18 @@
+# app/models/section_search.py
+"""
+Keeps BookSection.search_vector in step with the section text (see app/utils/text_search.py).
+Recomputed only when the title or body changed; the importers' Core INSERTs bypass the
+mapper and include section_document() in their rows instead.
+"""
+from sqlalchemy import event, inspect
+
+from app.models.content import BookSection
+from app.utils.text_search import section_document
+
+
+@event.listens_for(BookSection, "before_insert")
+@event.listens_for(BookSection, "before_update")
+def _section_search_vector(mapper, connection, target: BookSection) -> None:
+    state = inspect(target)
+    if state.key is None or any(state.attrs[name].history.has_changes() for name in ("title", "body")):
+        target.search_vector = section_document(target.title, target.body)
@@ -0,0 +1,44 @@
+# app/models/user_progress.py
+from sqlalchemy import Column, Boolean, DateTime, Float, ForeignKey, Index, Integer, String, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+import uuid
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+
+class UserProgress(Base):
+    """
+    Where a user is in a book / story / teaching ("continue where you left off").
+    Written by app/services/progress_buffer.py as batched upserts, not per heartbeat.
+    """
+    __tablename__ = "user_progress"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    content_id = Column(UUID(as_uuid=True), ForeignKey("content.id", ondelete="CASCADE"), nullable=False)
+
+    # Position. Chapter/section ids are deliberately not foreign keys: books get re-imported, and a
+    # position pointing at a removed section should fall back to the chapter/book start, not fail the batch
+    chapter_id = Column(UUID(as_uuid=True), nullable=True)
+    section_id = Column(UUID(as_uuid=True), nullable=True)
+    audio_position_seconds = Column(Integer, nullable=True)
+    progress_percentage = Column(Float, default=0.0) # 0-100
+    device_id = Column(String(100), nullable=True) # Device that reported the position
+    position_updated_at = Column(DateTime, nullable=False) # Server time the position was received; newest wins across devices
+
+    time_spent = Column(Integer, default=0, nullable=False) # Seconds, accumulated from heartbeats
+    is_completed = Column(Boolean, default=False, nullable=False)
+    completion_date = Column(DateTime, nullable=True)
+
+    created_at = Column(DateTime, default=func.now(), nullable=False)
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint('user_id', 'content_id', name='uq_user_progress_user_content'),
+        # "Continue reading" list: a user's most recent positions first
+        Index('idx_user_progress_user_position_updated', 'user_id', 'position_updated_at'),
+    )
+
+    def __repr__(self):
+        return f"<UserProgress(user_id={self.user_id}, content_id={self.content_id}, progress={self.progress_percentage})>"
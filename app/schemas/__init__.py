@@ -2,14 +2,14 @@
 from .auth import Token, TokenData, UserLogin, Msg
 from .user import UserBase, UserCreate, UserUpdate, UserResponse
 from .place import PlaceBase, PlaceResponse, PlaceCreate, PlaceUpdate
-from .location import CountryResponse, RegionResponse, StateResponse, CityResponse
+from .location import CountryResponse, RegionResponse, StateResponse, CityResponse, CountryTreeNode
 # ...
 from .book import BookBase, BookCreate, BookUpdate, BookResponse
 from .book_chapter import BookChapterBase, BookChapterCreate, BookChapterUpdate, BookChapterResponse
 from .book_section import BookSectionBase, BookSectionCreate, BookSectionUpdate, BookSectionResponse
 from .book_toc import TOCChapterItem, TOCSectionItem, BookTableOfContentsResponse
 from .homepage import HomepageCard, HomepageCardsResponse
-from .category import CategoryBase, CategoryCreate, CategoryUpdate, CategoryResponse
+from .category import CategoryBase, CategoryCreate, CategoryUpdate, CategoryResponse, CategoryTreeNode
 from .lost_heritage import LostHeritageBase, LostHeritageCreate, LostHeritageUpdate, LostHeritageResponse, LostHeritageContentType
 #from .collection import CollectionBase, CollectionCreate, CollectionUpdate, CollectionItemBase, CollectionItemCreate, CollectionItemUpdate, CollectionItemResponse
 from .story import StoryBase, StoryCreate, StoryUpdate, StoryResponse
@@ -21,6 +21,7 @@ from .collection import (
 from .s3_upload import PresignRequest
 from .temple import TempleBase, TempleCreate, TempleUpdate, TempleResponse
 from .pagination import PaginatedResponse
+from .batch import BatchGetResponse
 
 #from .collection import CollectionBase, CollectionCreate, CollectionUpdate, CollectionItemBase, CollectionItemCreate, CollectionItemUpdate, CollectionItemResponse
 from .pilgrimage_route import (
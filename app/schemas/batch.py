@@ -0,0 +1,10 @@
+# app/schemas/batch.py
+from pydantic import BaseModel, Field
+from typing import List, TypeVar, Generic
+from uuid import UUID
+
+DataType = TypeVar('DataType')
+
+class BatchGetResponse(BaseModel, Generic[DataType]):
+    items: List[DataType] = Field(..., description="The items found, in the order their ids were requested.")
+    missing: List[UUID] = Field(..., description="Requested ids with no matching item (unknown, deleted or of another type).")
@@ -56,6 +56,11 @@ class BookResponse(BookBase):
     review_count: int
     page_count: Optional[int] = None
     duration: Optional[int] = None # Useful for audio books
+    # Reading statistics, precomputed on write (app/models/reading_stats.py)
+    word_count: Optional[int] = None
+    char_count: Optional[int] = None
+    reading_time_seconds: Optional[int] = None
+    listening_time_seconds: Optional[int] = None
     created_at: datetime
     updated_at: datetime
     
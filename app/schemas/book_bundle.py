@@ -0,0 +1,8 @@
+# app/schemas/book_bundle.py
+from pydantic import BaseModel
+
+
+class BookBundleStatus(BaseModel):
+    """Body of the 202 answer while a book's offline bundle is being built."""
+    status: str = "building"
+    retry_after: int  # seconds
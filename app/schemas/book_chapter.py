@@ -1,6 +1,6 @@
 # app/schemas/book_chapter.py
 from pydantic import BaseModel, Field, HttpUrl, model_validator
-from typing import Optional, List, Any
+from typing import Optional, List, Any, Union
 from pydantic import ValidationInfo
 from app.models.content import BookChapter  # Import your SQLAlchemy model
 from uuid import UUID
@@ -25,6 +25,11 @@ class BookChapterResponseWithoutSections(BookChapterBase):
     id: UUID
     book_id: UUID
     chapter_number: int
+    # Reading statistics, precomputed on write (app/models/reading_stats.py)
+    word_count: Optional[int] = None
+    char_count: Optional[int] = None
+    reading_time_seconds: Optional[int] = None
+    listening_time_seconds: Optional[int] = None
     created_at: datetime
     updated_at: datetime
 
@@ -35,4 +40,20 @@ class BookChapterResponse(BookChapterResponseWithoutSections):
     sections: Optional[List[BookSectionResponse]] = None # Added sections
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class BookChapterReorderRequest(BaseModel):
+    chapter_ids: List[UUID] = Field(..., description="Every chapter of the book, in the new reading order")
+
+class BookChapterRangeItem(BaseModel):
+    id: UUID
+    chapter_number: int
+    etag: str = Field(..., description="Same ETag as GET /books/{book_id}/chapters/{chapter_id} with the same include_sections")
+    not_modified: bool = Field(False, description="The client's copy (sent in If-None-Match) is current; `chapter` is omitted")
+    chapter: Optional[Union[BookChapterResponse, BookChapterResponseWithoutSections]] = None
+
+class BookChapterRangeResponse(BaseModel):
+    book_id: UUID
+    from_chapter: int
+    to_chapter: int
+    chapters: List[BookChapterRangeItem] = []
@@ -0,0 +1,49 @@
+# app/schemas/book_import.py
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from uuid import UUID
+
+from app.schemas.book import BookCreate
+from app.schemas.book_chapter import BookChapterBase
+
+
+class BookImportSection(BaseModel):
+    title: Optional[str] = Field(None, max_length=500)
+    body: str
+
+
+class BookImportChapter(BookChapterBase):
+    duration: Optional[int] = None
+    transcript: Optional[str] = None
+    summary: Optional[str] = None
+    key_points: Optional[List[str]] = None
+    is_preview_allowed: bool = False
+    sections: List[BookImportSection] = []
+
+
+class BookImportDocument(BookCreate):
+    """A whole book: the book fields of BookCreate plus its chapters and their sections, in order."""
+    # Identifies the book on re-runs; derived from the title when omitted
+    slug: Optional[str] = Field(None, max_length=350)
+    chapters: List[BookImportChapter] = []
+
+
+class BookImportResponse(BaseModel):
+    book_id: UUID
+    slug: str
+    created: bool  # False when an existing book with this slug was resumed/left as is
+    chapters_skipped: int  # already present from an earlier (interrupted) run
+    chapters_inserted: int
+    sections_inserted: int
+
+
+class BookSourceImportResponse(BaseModel):
+    book_id: UUID
+    slug: str
+    created: bool
+    chapters_created: int = 0
+    chapters_updated: int = 0  # retitled
+    chapters_deleted: int = 0  # past the end of the source
+    sections_inserted: int = 0  # new or edited
+    sections_unchanged: int = 0  # matched by content hash, not rewritten
+    sections_deleted: int = 0
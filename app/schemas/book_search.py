@@ -0,0 +1,15 @@
+# app/schemas/book_search.py
+from pydantic import BaseModel, Field
+from typing import Optional
+from uuid import UUID
+
+
+class BookSearchHit(BaseModel):
+    section_id: UUID
+    chapter_id: UUID
+    chapter_number: int
+    chapter_title: str
+    section_order: int
+    section_title: Optional[str] = None
+    rank: float = Field(..., description="Relevance; only meaningful relative to the other hits of the same query")
+    snippet: str = Field(..., description="HTML-escaped excerpt of the section body with the matched words in <mark>")
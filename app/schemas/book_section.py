@@ -1,6 +1,6 @@
 # app/schemas/book_section.py
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
 from datetime import datetime
 
@@ -20,10 +20,15 @@ class BookSectionResponse(BookSectionBase):
     created_at: datetime
     updated_at: datetime
     section_order: int
+    word_count: Optional[int] = None
+    char_count: Optional[int] = None
     class Config:
         from_attributes = True
 
 class BookSectionUpdatePayload(BaseModel): # A dedicated schema for update payload
     title: Optional[str] = Field(None, max_length=500)
     body: Optional[str] = None
-    section_order: Optional[int] = Field(None, ge=0)
\ No newline at end of file
+    section_order: Optional[int] = Field(None, ge=0)
+
+class BookSectionReorderRequest(BaseModel):
+    section_ids: List[UUID] = Field(..., description="Every section of the chapter, in the new order")
@@ -17,6 +17,9 @@ class TOCChapterItem(BaseModel):
     chapter_number: int
     sections: List[TOCSectionItem] = []
     audio_url: Optional[str] = None
+    word_count: Optional[int] = None
+    reading_time_seconds: Optional[int] = None
+    listening_time_seconds: Optional[int] = None
 
     class Config:
         from_attributes = True
@@ -27,6 +30,9 @@ class BookTableOfContentsResponse(BaseModel):
     chapters: List[TOCChapterItem] = []
     cover_image_url: Optional[str] = None
     thumbnail_url: Optional[str] = None
+    word_count: Optional[int] = None
+    reading_time_seconds: Optional[int] = None
+    listening_time_seconds: Optional[int] = None
 
     class Config:
         from_attributes = True
\ No newline at end of file
@@ -36,4 +36,19 @@ class CategoryResponse(CategoryBase): # Inherit from CategoryBase to get most fi
         from_attributes = True
 
 # Resolve forward reference for children (Pydantic v2 handles this better, but good practice)
-# CategoryResponse.model_rebuild() # For Pydantic v1
\ No newline at end of file
+# CategoryResponse.model_rebuild() # For Pydantic v1
+
+class CategoryTreeNode(BaseModel):
+    id: UUID
+    name: str
+    slug: str
+    type: Optional[str] = None
+    parent_id: Optional[UUID] = None
+    sort_order: Optional[int] = 0
+    icon_url: Optional[str] = None
+    color_code: Optional[str] = None
+    is_featured: Optional[bool] = False
+    children: List["CategoryTreeNode"] = []
+
+    class Config:
+        from_attributes = True
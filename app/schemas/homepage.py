@@ -1,6 +1,8 @@
 # app/schemas/homepage.py
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import Any, List, Optional
+from uuid import UUID
+from datetime import datetime
 
 class HomepageCard(BaseModel):
     title: str
@@ -11,4 +13,45 @@ class HomepageCard(BaseModel):
     # or 'target_id' (e.g., a specific category slug or feature identifier)
 
 class HomepageCardsResponse(BaseModel):
-    cards: List[HomepageCard]
\ No newline at end of file
+    cards: List[HomepageCard]
+
+# --- /homepage/feed: lightweight projections, one list per homepage section ---
+
+class FeedContentItem(BaseModel):
+    id: UUID
+    title: str
+    slug: str
+    subtitle: Optional[str] = None
+    content_type: str
+    cover_image_url: Optional[str] = None
+    thumbnail_url: Optional[str] = None
+    author_name: Optional[str] = None
+    published_at: Optional[datetime] = None
+
+class FeedCollectionItem(BaseModel):
+    id: UUID
+    name: str
+    slug: str
+    cover_image_url: Optional[str] = None
+
+class FeedFestivalItem(BaseModel):
+    id: UUID
+    name: str
+    start_date: Optional[datetime] = None
+    end_date: Optional[datetime] = None
+    images: Optional[Any] = None
+
+class FeedTempleItem(BaseModel):
+    id: UUID
+    name: str
+    main_deity: Optional[str] = None
+    cover_image: Optional[Any] = None
+    place_id: UUID
+
+class HomepageFeedResponse(BaseModel):
+    featured_books: List[FeedContentItem]
+    featured_collections: List[FeedCollectionItem]
+    major_festivals: List[FeedFestivalItem]
+    featured_temples: List[FeedTempleItem]
+    stories: List[FeedContentItem]
+    teachings: List[FeedContentItem]
@@ -36,4 +36,27 @@ class CityResponse(BaseModel):
     name: str
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+# Nested shape of GET /location/tree
+class CityTreeNode(BaseModel):
+    id: UUID
+    name: str
+
+
+class StateTreeNode(BaseModel):
+    id: UUID
+    name: str
+    cities: List[CityTreeNode] = []
+
+
+class RegionTreeNode(BaseModel):
+    id: UUID
+    name: str
+    states: List[StateTreeNode] = []
+
+
+class CountryTreeNode(BaseModel):
+    id: UUID
+    name: str
+    regions: List[RegionTreeNode] = []
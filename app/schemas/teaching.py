@@ -64,6 +64,11 @@ class TeachingResponse(TeachingBase): # Inherits fields from TeachingBase
     published_at: Optional[datetime] = None
     featured: bool
     premium_content: bool
+    # Reading statistics, precomputed on write (app/models/reading_stats.py)
+    word_count: Optional[int] = None
+    char_count: Optional[int] = None
+    reading_time_seconds: Optional[int] = None
+    listening_time_seconds: Optional[int] = None
     created_at: datetime
     updated_at: datetime
 
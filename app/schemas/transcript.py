@@ -0,0 +1,55 @@
+# app/schemas/transcript.py
+from pydantic import BaseModel, Field, model_validator
+from typing import List, Optional
+from uuid import UUID
+
+
+class TranscriptSegmentIn(BaseModel):
+    start_seconds: float = Field(..., ge=0)
+    end_seconds: float = Field(..., ge=0)
+    text: str = Field(..., min_length=1)
+
+    @model_validator(mode="after")
+    def check_times(self):
+        if self.end_seconds < self.start_seconds:
+            raise ValueError("end_seconds must not be before start_seconds")
+        return self
+
+
+class TranscriptSegmentsReplace(BaseModel):
+    """Replaces every segment of the chapter; also becomes the chapter's plain `transcript`."""
+    segments: List[TranscriptSegmentIn] = Field(..., max_length=50000)
+
+
+class TranscriptSegmentResponse(BaseModel):
+    segment_index: int
+    start_seconds: float
+    end_seconds: float
+    text: str
+
+    class Config:
+        from_attributes = True
+
+
+class TranscriptWindowResponse(BaseModel):
+    chapter_id: UUID
+    from_seconds: float
+    to_seconds: float
+    segments: List[TranscriptSegmentResponse] = []
+
+
+class TranscriptReplaceResponse(BaseModel):
+    chapter_id: UUID
+    segment_count: int
+    end_seconds: Optional[float] = None  # end of the last segment
+
+
+class TranscriptSearchHit(BaseModel):
+    chapter_id: UUID
+    chapter_number: int
+    chapter_title: str
+    segment_index: int
+    start_seconds: float = Field(..., description="Seek the chapter's audio/video here")
+    end_seconds: float
+    rank: float = Field(..., description="Relevance; only meaningful relative to the other hits of the same query")
+    snippet: str = Field(..., description="HTML-escaped segment text with the matched words in <mark>")
@@ -0,0 +1,33 @@
+# app/schemas/user_progress.py
+from pydantic import BaseModel, Field
+from typing import Optional
+from uuid import UUID
+from datetime import datetime
+
+
+class ProgressHeartbeat(BaseModel):
+    """Sent by the reader/player every few seconds; only the latest position of a burst is written."""
+    chapter_id: Optional[UUID] = None
+    section_id: Optional[UUID] = None
+    audio_position_seconds: Optional[int] = Field(None, ge=0)
+    progress_percentage: Optional[float] = Field(None, ge=0, le=100)
+    # Seconds read/listened since the previous heartbeat; summed, not overwritten
+    time_spent_delta: int = Field(0, ge=0, le=3600)
+    is_completed: bool = False
+    device_id: Optional[str] = Field(None, max_length=100)
+
+
+class ProgressResponse(BaseModel):
+    content_id: UUID
+    chapter_id: Optional[UUID] = None
+    section_id: Optional[UUID] = None
+    audio_position_seconds: Optional[int] = None
+    progress_percentage: Optional[float] = None
+    device_id: Optional[str] = None
+    position_updated_at: datetime
+    time_spent: int = 0
+    is_completed: bool = False
+    completion_date: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
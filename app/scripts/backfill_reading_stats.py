@@ -0,0 +1,112 @@
+# app/scripts/backfill_reading_stats.py
+# Adds the reading statistics columns (app/models/reading_stats.py) to an existing database
+# (create_all doesn't alter tables) and computes them for rows written before they existed.
+#
+#   python -m app.scripts.backfill_reading_stats [--batch-size 500] [--recount]
+#
+# Batched and resumable: only rows whose counts are still NULL are read (all rows with
+# --recount, e.g. after changing how words are counted). Book and chapter totals are then
+# rolled up from the stored counts, a batch of books at a time.
+import argparse
+import asyncio
+
+from sqlalchemy import bindparam, inspect, update
+from sqlalchemy.future import select
+
+from app.config import settings
+from app.database import AsyncSessionLocal, async_engine
+from app.models.content import BookChapter, BookSection, Content, ContentSubType
+from app.models.reading_stats import estimated_seconds, roll_up, text_stats
+
+NEW_COLUMNS = {
+    "book_sections": ["word_count", "char_count"],
+    "book_chapters": [
+        "transcript_word_count", "transcript_char_count", "word_count", "char_count",
+        "reading_time_seconds", "listening_time_seconds",
+    ],
+    "content": ["word_count", "char_count", "reading_time_seconds", "listening_time_seconds"],
+}
+
+
+async def add_columns() -> None:
+    async with async_engine.begin() as conn:
+        for table, columns in NEW_COLUMNS.items():
+            existing = await conn.run_sync(lambda sync_conn: {c["name"] for c in inspect(sync_conn).get_columns(table)})
+            for column in columns:
+                if column not in existing:
+                    await conn.exec_driver_sql(f"ALTER TABLE {table} ADD COLUMN {column} integer")
+
+
+async def count_rows(model, text_column, marker_column, extra_filter, make_values, batch_size: int, recount: bool) -> int:
+    """Keyset-paginated recount of one text column; returns the number of rows updated."""
+    table = model.__table__
+    # updated_at is kept: the text didn't change, so neither should ETags / bundle versions
+    statement = update(table).where(table.c.id == bindparam("row_id")).values(updated_at=table.c.updated_at)
+    done, last_id = 0, None
+    async with AsyncSessionLocal() as db:
+        while True:
+            query = select(model.id, text_column, *extra_filter["columns"]).where(*extra_filter["where"])
+            if not recount:
+                query = query.where(marker_column.is_(None))
+            if last_id is not None:
+                query = query.where(model.id > last_id)
+            rows = (await db.execute(query.order_by(model.id).limit(batch_size))).all()
+            if not rows:
+                return done
+            await db.execute(statement, [{"row_id": row[0], **make_values(row)} for row in rows])
+            await db.commit()
+            done += len(rows)
+            last_id = rows[-1][0]
+            print(f"  {table.name}: {done} rows counted so far")
+
+
+def _content_values(row) -> dict:
+    stats = text_stats(row.content)
+    return {
+        **stats,
+        "reading_time_seconds": estimated_seconds(stats["word_count"], settings.READING_WORDS_PER_MINUTE),
+        "listening_time_seconds": row.duration,
+    }
+
+
+async def backfill(batch_size: int, recount: bool) -> None:
+    await add_columns()
+    no_filter = {"columns": [], "where": []}
+    sections = await count_rows(
+        BookSection, BookSection.body, BookSection.word_count, no_filter,
+        lambda row: text_stats(row.body), batch_size, recount,
+    )
+    chapters = await count_rows(
+        BookChapter, BookChapter.transcript, BookChapter.transcript_word_count, no_filter,
+        lambda row: {f"transcript_{name}": value for name, value in text_stats(row.transcript).items()},
+        batch_size, recount,
+    )
+    content = await count_rows(
+        Content, Content.content, Content.word_count,
+        {"columns": [Content.duration], "where": [Content.sub_type.is_distinct_from(ContentSubType.BOOK.value)]},
+        _content_values, batch_size, recount,
+    )
+    print(f"✅ Counted {sections} sections, {chapters} chapter transcripts, {content} articles/stories/teachings")
+
+    books, last_id = 0, None
+    async with AsyncSessionLocal() as db:
+        while True:
+            query = select(Content.id).where(Content.sub_type == ContentSubType.BOOK.value)
+            if last_id is not None:
+                query = query.where(Content.id > last_id)
+            book_ids = (await db.execute(query.order_by(Content.id).limit(batch_size))).scalars().all()
+            if not book_ids:
+                break
+            await db.run_sync(lambda session: roll_up(session, book_ids=book_ids))
+            await db.commit()
+            books += len(book_ids)
+            last_id = book_ids[-1]
+    print(f"✅ Rolled up chapter and book totals for {books} books")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Add and backfill the reading statistics columns")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--recount", action="store_true", help="recount every row, not just those never counted")
+    args = parser.parse_args()
+    asyncio.run(backfill(args.batch_size, args.recount))
@@ -0,0 +1,61 @@
+# app/scripts/backfill_section_hashes.py
+# Adds book_sections.content_hash to an existing database (create_all doesn't alter tables)
+# and fills it for rows written before it existed, so source re-imports can match them.
+#
+#   python -m app.scripts.backfill_section_hashes [--batch-size 500]
+#
+# Batched and resumable: only rows with a NULL hash are read.
+import argparse
+import asyncio
+
+from sqlalchemy import bindparam, inspect, update
+from sqlalchemy.future import select
+
+from app.crud.book_section import section_content_hash
+from app.database import AsyncSessionLocal, async_engine
+from app.models.content import BookSection
+
+
+async def add_column() -> None:
+    async with async_engine.begin() as conn:
+        if conn.dialect.name == "postgresql":
+            await conn.exec_driver_sql("ALTER TABLE book_sections ADD COLUMN IF NOT EXISTS content_hash varchar(64)")
+        else:
+            columns = await conn.run_sync(lambda sync_conn: [c["name"] for c in inspect(sync_conn).get_columns("book_sections")])
+            if "content_hash" not in columns:
+                await conn.exec_driver_sql("ALTER TABLE book_sections ADD COLUMN content_hash varchar(64)")
+
+
+async def backfill(batch_size: int) -> None:
+    await add_column()
+    statement = (
+        update(BookSection.__table__)
+        .where(BookSection.__table__.c.id == bindparam("section_id"))
+        .values(content_hash=bindparam("content_hash"))
+    )
+    filled = 0
+    last_id = None
+    async with AsyncSessionLocal() as db:
+        while True:
+            query = select(BookSection.id, BookSection.title, BookSection.body).where(BookSection.content_hash.is_(None))
+            if last_id is not None:
+                query = query.where(BookSection.id > last_id)
+            rows = (await db.execute(query.order_by(BookSection.id).limit(batch_size))).all()
+            if not rows:
+                break
+            await db.execute(
+                statement,
+                [{"section_id": row.id, "content_hash": section_content_hash(row.title, row.body)} for row in rows],
+            )
+            await db.commit()
+            filled += len(rows)
+            last_id = rows[-1].id
+            print(f"  {filled} sections hashed so far")
+    print(f"✅ content_hash filled for {filled} sections")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Add and backfill book_sections.content_hash")
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(backfill(args.batch_size))
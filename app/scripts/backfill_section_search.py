@@ -0,0 +1,66 @@
+# app/scripts/backfill_section_search.py
+# Adds BookSection.search_vector and its GIN index to an existing database (create_all
+# doesn't alter tables) and fills it for sections written before in-book search existed.
+#
+#   python -m app.scripts.backfill_section_search [--batch-size 500] [--reindex]
+#
+# Batched and resumable: only sections without a vector are read (all of them with
+# --reindex, e.g. after changing BOOK_SEARCH_CONFIG). Section updated_at is left alone,
+# so chapter ETags and bundle versions don't move.
+import argparse
+import asyncio
+
+from sqlalchemy import bindparam, inspect, update
+from sqlalchemy.future import select
+
+from app.database import AsyncSessionLocal, async_engine
+from app.models.content import BookSection
+from app.utils.text_search import section_document
+
+INDEX_NAME = "idx_book_section_search_vector"
+
+
+async def add_column() -> None:
+    table = BookSection.__table__
+    async with async_engine.begin() as conn:
+        existing = await conn.run_sync(lambda sync_conn: {c["name"] for c in inspect(sync_conn).get_columns(table.name)})
+        if "search_vector" not in existing:
+            column_type = "tsvector" if conn.dialect.name == "postgresql" else "text"
+            await conn.exec_driver_sql(f"ALTER TABLE {table.name} ADD COLUMN search_vector {column_type}")
+        index = next(index for index in table.indexes if index.name == INDEX_NAME)
+        await conn.run_sync(lambda sync_conn: index.create(sync_conn, checkfirst=True))
+
+
+async def backfill(batch_size: int, reindex: bool) -> None:
+    await add_column()
+    table = BookSection.__table__
+    statement = (
+        update(table)
+        .where(table.c.id == bindparam("row_id"))
+        .values(search_vector=bindparam("document", type_=table.c.search_vector.type), updated_at=table.c.updated_at)
+    )
+    done, last_id = 0, None
+    async with AsyncSessionLocal() as db:
+        while True:
+            query = select(BookSection.id, BookSection.title, BookSection.body)
+            if not reindex:
+                query = query.where(BookSection.search_vector.is_(None))
+            if last_id is not None:
+                query = query.where(BookSection.id > last_id)
+            rows = (await db.execute(query.order_by(BookSection.id).limit(batch_size))).all()
+            if not rows:
+                break
+            await db.execute(statement, [{"row_id": row.id, "document": section_document(row.title, row.body)} for row in rows])
+            await db.commit()
+            done += len(rows)
+            last_id = rows[-1].id
+            print(f"  {done} sections indexed so far")
+    print(f"✅ Indexed {done} sections for in-book search")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Add and fill the in-book search vector of book sections")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--reindex", action="store_true", help="recompute every section, not just those never indexed")
+    args = parser.parse_args()
+    asyncio.run(backfill(args.batch_size, args.reindex))
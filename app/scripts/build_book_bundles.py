@@ -0,0 +1,64 @@
+# app/scripts/build_book_bundles.py
+# Pre-build the offline bundles (app/services/book_bundles.py) so no reader waits on a 202.
+#
+#   python -m app.scripts.build_book_bundles [book-slug-or-id ...] [--force]
+#
+# Without arguments every live book is checked; books whose current version already has a
+# bundle are skipped unless --force. Run it from cron / a worker after bulk imports.
+import argparse
+import asyncio
+import sys
+import time
+
+from sqlalchemy.future import select
+
+from app.crud.book import book_crud
+from app.database import AsyncSessionLocal
+from app.models.content import Content, ContentSubType
+from app.services.book_bundles import build_bundle, bundle_key, bundle_store
+
+
+async def main(books, force: bool) -> int:
+    async with AsyncSessionLocal() as db:
+        if books:
+            headers = [await book_crud.get_book_toc_header(db, book) for book in books]
+            for book, header in zip(books, headers):
+                if header is None:
+                    print(f"❌ {book}: no such book")
+            headers = [header for header in headers if header is not None]
+        else:
+            headers = (
+                await db.execute(
+                    select(Content.id, Content.updated_at)
+                    .where(Content.sub_type == ContentSubType.BOOK.value, Content.is_deleted.is_(False))
+                    .order_by(Content.id)
+                )
+            ).all()
+    built = skipped = failed = 0
+    for header in headers:
+        if not force and await bundle_store.size(bundle_key(header.id, header.updated_at)) is not None:
+            skipped += 1
+            continue
+        started = time.perf_counter()
+        try:
+            key = await build_bundle(header.id)
+        except Exception as e:
+            failed += 1
+            print(f"❌ {header.id}: {e}")
+            continue
+        if key is None:
+            failed += 1
+            print(f"❌ {header.id}: deleted or edited during the build, run again")
+            continue
+        built += 1
+        print(f"✅ {key} ({await bundle_store.size(key):,} bytes, {time.perf_counter() - started:.1f}s)")
+    print(f"{built} built, {skipped} already current, {failed} failed")
+    return 1 if failed or (books and len(headers) < len(books)) else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build offline book bundles")
+    parser.add_argument("books", nargs="*", help="book ids or slugs (default: all books)")
+    parser.add_argument("--force", action="store_true", help="rebuild even if the current bundle exists")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.books, args.force)))
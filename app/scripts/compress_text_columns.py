@@ -0,0 +1,125 @@
+# app/scripts/compress_text_columns.py
+# Convert the long-text columns (app.utils.compressed_text.COMPRESSED_COLUMNS) between
+# plain `text` and compressed `bytea` storage. PostgreSQL only.
+#
+#   1. (optional, needs `pip install zstandard`) train a shared dictionary on the corpus:
+#        python -m app.scripts.compress_text_columns --train-dictionary /data/sanatani-text.dict
+#      and set COMPRESSED_TEXT_ZSTD_DICTS=/data/sanatani-text.dict
+#   2. convert and re-encode every row (batched, resumable - already-encoded rows are skipped):
+#        python -m app.scripts.compress_text_columns
+#   3. set COMPRESSED_TEXT_COLUMNS=true and restart the app.
+#
+# Between steps 2 and 3 the running app still maps these columns as text, so do 2 and 3
+# together in a maintenance window (or with the API stopped).
+#
+# To go back: python -m app.scripts.compress_text_columns --decompress, then unset the flag.
+# Re-running step 2 after adding a new dictionary (listed first) re-encodes everything with it.
+import argparse
+import asyncio
+import random
+
+from sqlalchemy import LargeBinary, bindparam, text
+
+from app.database import AsyncSessionLocal
+from app.utils.compressed_text import COMPRESSED_COLUMNS, compress_text, decompress_text, zstandard
+
+
+async def column_type(db, table: str, column: str) -> str:
+    result = await db.execute(
+        text("SELECT data_type FROM information_schema.columns WHERE table_name = :table AND column_name = :column"),
+        {"table": table, "column": column},
+    )
+    return result.scalar_one()
+
+
+async def table_size(db, table: str) -> int:
+    return (await db.execute(text("SELECT pg_total_relation_size(CAST(:table AS regclass))"), {"table": table})).scalar_one()
+
+
+async def rewrite_rows(db, table: str, column: str, encode, batch_size: int) -> int:
+    """Keyset-paginated read/encode/write, one commit per batch. Returns the number of rows changed."""
+    update = text(f"UPDATE {table} SET {column} = :value WHERE id = :id").bindparams(bindparam("value", type_=LargeBinary))
+    changed = 0
+    last_id = None
+    while True:
+        query = f"SELECT id, {column} FROM {table} WHERE {column} IS NOT NULL"
+        params = {"limit": batch_size}
+        if last_id is not None:
+            query += " AND id > :last_id"
+            params["last_id"] = last_id
+        rows = (await db.execute(text(query + " ORDER BY id LIMIT :limit"), params)).all()
+        if not rows:
+            return changed
+        updates = []
+        for row_id, stored in rows:
+            stored = bytes(stored)
+            encoded = encode(decompress_text(stored))
+            if encoded != stored:
+                updates.append({"id": row_id, "value": encoded})
+        if updates:
+            await db.execute(update, updates)
+        await db.commit()
+        changed += len(updates)
+        last_id = rows[-1][0]
+        print(f"  {table}.{column}: {changed} rows re-encoded so far")
+
+
+async def compress_columns(batch_size: int) -> None:
+    async with AsyncSessionLocal() as db:
+        for table, column in COMPRESSED_COLUMNS:
+            before = await table_size(db, table)
+            if await column_type(db, table, column) == "text":
+                # The bytes are the UTF-8 text itself, which decompress_text() reads as-is
+                await db.execute(text(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE bytea USING convert_to({column}, 'UTF8')"))
+                await db.commit()
+            changed = await rewrite_rows(db, table, column, compress_text, batch_size)
+            print(f"✅ {table}.{column}: {changed} rows compressed, {before:,} -> {await table_size(db, table):,} bytes")
+    print("Old row versions are reclaimed by VACUUM; run VACUUM FULL on these tables to shrink them on disk now.")
+
+
+async def decompress_columns(batch_size: int) -> None:
+    async with AsyncSessionLocal() as db:
+        for table, column in COMPRESSED_COLUMNS:
+            if await column_type(db, table, column) != "bytea":
+                print(f"{table}.{column} is already text, skipping")
+                continue
+            changed = await rewrite_rows(db, table, column, lambda value: value.encode("utf-8"), batch_size)
+            await db.execute(text(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE text USING convert_from({column}, 'UTF8')"))
+            await db.commit()
+            print(f"✅ {table}.{column}: {changed} rows decompressed, column is text again")
+
+
+async def train_dictionary(path: str, samples: int, dict_size: int) -> None:
+    if zstandard is None:
+        raise SystemExit("Training a dictionary needs the zstandard package: pip install zstandard")
+    corpus = []
+    async with AsyncSessionLocal() as db:
+        for table, column in COMPRESSED_COLUMNS:
+            result = await db.execute(
+                text(f"SELECT {column} FROM {table} WHERE {column} IS NOT NULL ORDER BY random() LIMIT :limit"),
+                {"limit": samples},
+            )
+            for (stored,) in result:
+                value = stored if isinstance(stored, str) else decompress_text(stored)
+                corpus.append(value.encode("utf-8"))
+    random.shuffle(corpus)
+    dictionary = zstandard.train_dictionary(dict_size, corpus)
+    with open(path, "wb") as fh:
+        fh.write(dictionary.as_bytes())
+    print(f"✅ Trained a {len(dictionary.as_bytes()):,} byte dictionary (id {dictionary.dict_id()}) on {len(corpus)} samples: {path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compress/decompress the long text columns in place")
+    parser.add_argument("--decompress", action="store_true", help="convert back to plain text columns")
+    parser.add_argument("--train-dictionary", metavar="PATH", help="train a zstd dictionary and write it to PATH")
+    parser.add_argument("--samples", type=int, default=2000, help="rows sampled per column for --train-dictionary")
+    parser.add_argument("--dict-size", type=int, default=112640, help="dictionary size in bytes")
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+    if args.train_dictionary:
+        asyncio.run(train_dictionary(args.train_dictionary, args.samples, args.dict_size))
+    elif args.decompress:
+        asyncio.run(decompress_columns(args.batch_size))
+    else:
+        asyncio.run(compress_columns(args.batch_size))
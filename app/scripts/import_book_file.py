@@ -0,0 +1,64 @@
+# app/scripts/import_book_file.py
+# Create or update books from Markdown (`#` chapter / `##` section headings) or EPUB files.
+#
+#   python -m app.scripts.import_book_file gita.md upanishads.epub [--slug bhagavad-gita] [--split-paragraphs]
+#
+# The file is read as a stream, chapter by chapter. Running it again on an edited file
+# only rewrites the sections whose text changed (matched by BookSection.content_hash);
+# run app.scripts.backfill_section_hashes once first for books imported before that column existed.
+import argparse
+import asyncio
+import sys
+import time
+import uuid
+
+from app.database import AsyncSessionLocal
+from app.models.content import BookType
+from app.schemas.book import BookCreate
+from app.services.book_import import sync_book_from_source
+from app.services.book_sources import iter_source, source_title
+from app.utils.helpers import slugify
+
+
+async def main(paths, slug, title, split_paragraphs: bool, chapters_per_commit: int, author_id) -> int:
+    failures = 0
+    for path in paths:
+        started = time.perf_counter()
+        try:
+            with open(path, "rb") as fh:
+                book_title = title or source_title(fh, path)
+                async with AsyncSessionLocal() as db:
+                    result = await sync_book_from_source(
+                        db,
+                        iter_source(fh, path, split_paragraphs=split_paragraphs),
+                        slug=slug or slugify(book_title),
+                        book_in=BookCreate(title=book_title, book_format=BookType.TEXT),
+                        author_id=author_id,
+                        chapters_per_commit=chapters_per_commit,
+                        progress=lambda message: print(f"   {message}"),
+                    )
+        except Exception as e:
+            failures += 1
+            print(f"❌ {path}: {e}")
+            continue
+        print(
+            f"✅ {result.slug}: {'created' if result.created else 'updated'}, chapters "
+            f"+{result.chapters_created} ~{result.chapters_updated} -{result.chapters_deleted}, sections "
+            f"+{result.sections_inserted} -{result.sections_deleted} ({result.sections_unchanged} unchanged) "
+            f"({time.perf_counter() - started:.1f}s)"
+        )
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import or update books from Markdown / EPUB files")
+    parser.add_argument("paths", nargs="+", help=".md / .markdown / .epub files")
+    parser.add_argument("--slug", default=None, help="book to create or update (single file only); derived from the title by default")
+    parser.add_argument("--title", default=None, help="title for a new book (single file only); defaults to the EPUB title or file name")
+    parser.add_argument("--split-paragraphs", action="store_true", help="make every paragraph its own section")
+    parser.add_argument("--chapters-per-commit", type=int, default=50, help="commit (and report progress) every N chapters")
+    parser.add_argument("--author-id", type=uuid.UUID, default=None, help="user id recorded as the author of new books")
+    args = parser.parse_args()
+    if (args.slug or args.title) and len(args.paths) > 1:
+        parser.error("--slug / --title apply to a single file")
+    sys.exit(asyncio.run(main(args.paths, args.slug, args.title, args.split_paragraphs, args.chapters_per_commit, args.author_id)))
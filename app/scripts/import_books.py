@@ -0,0 +1,72 @@
+# app/scripts/import_books.py
+# Bulk-load books (with chapters and sections) from JSON / JSONL files.
+#
+#   python -m app.scripts.import_books gita.json upanishads.jsonl [--chapters-per-commit 50] [--author-id <uuid>]
+#
+# A .jsonl file holds one book document per line (see app/schemas/book_import.py); a .json
+# file holds one document or a list of them. Interrupted? Run the same command again:
+# books are matched by slug and continue after their last committed chapter.
+import argparse
+import asyncio
+import json
+import sys
+import time
+import uuid
+from typing import Iterator
+
+from pydantic import ValidationError
+
+from app.database import AsyncSessionLocal
+from app.schemas.book_import import BookImportDocument
+from app.services.book_import import import_book
+
+
+def read_documents(path: str) -> Iterator[dict]:
+    with open(path, encoding="utf-8") as fh:
+        if path.endswith(".jsonl"):
+            # One book per line, so a multi-GB file is never loaded whole
+            for line in fh:
+                if line.strip():
+                    yield json.loads(line)
+            return
+        data = json.load(fh)
+    yield from (data if isinstance(data, list) else [data])
+
+
+async def main(paths, chapters_per_commit: int, author_id) -> int:
+    failures = 0
+    for path in paths:
+        for position, raw in enumerate(read_documents(path), start=1):
+            label = f"{path}#{position}"
+            try:
+                document = BookImportDocument.model_validate(raw)
+            except ValidationError as e:
+                failures += 1
+                print(f"❌ {label}: invalid document\n{e}")
+                continue
+            started = time.perf_counter()
+            try:
+                async with AsyncSessionLocal() as db:
+                    result = await import_book(
+                        db, document, author_id=author_id, chapters_per_commit=chapters_per_commit,
+                        progress=lambda message: print(f"   {message}"),
+                    )
+            except ValueError as e:
+                failures += 1
+                print(f"❌ {label}: {e}")
+                continue
+            print(
+                f"✅ {result.slug}: {'created' if result.created else 'resumed'}, "
+                f"{result.chapters_inserted} chapters / {result.sections_inserted} sections inserted, "
+                f"{result.chapters_skipped} already present ({time.perf_counter() - started:.1f}s)"
+            )
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk-import books with chapters and sections")
+    parser.add_argument("paths", nargs="+", help=".json or .jsonl files")
+    parser.add_argument("--chapters-per-commit", type=int, default=50, help="commit (and report progress) every N chapters")
+    parser.add_argument("--author-id", type=uuid.UUID, default=None, help="user id recorded as the books' author")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.paths, args.chapters_per_commit, args.author_id)))
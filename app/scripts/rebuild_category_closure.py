@@ -0,0 +1,17 @@
+# app/scripts/rebuild_category_closure.py
+# Backfill / repair the category_closure table from categories.parent_id.
+# Run once after the table is created (python -m app.init_db), and any time parent_id
+# was edited outside the API:  python -m app.scripts.rebuild_category_closure
+import asyncio
+
+from app.crud.category import category_crud
+from app.database import AsyncSessionLocal
+
+
+async def main():
+    async with AsyncSessionLocal() as db:
+        count = await category_crud.rebuild_closure(db)
+    print(f"✅ category_closure rebuilt with {count} rows.")
+
+if __name__ == "__main__":
+    asyncio.run(main())
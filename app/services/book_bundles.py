@@ -0,0 +1,292 @@
+# app/services/book_bundles.py
+"""
+Offline bundles: one gzipped JSON file per book version holding everything the mobile
+app needs to read the book without a connection - book metadata, the table of contents,
+every chapter with all of its sections, and a manifest of the media URLs to prefetch.
+
+A bundle is named after the book's updated_at, which every chapter/section write moves
+(see book_chapter_crud.touch_book), so a stored bundle is never stale: an edit changes
+the name, the next request finds nothing and schedules a rebuild, and the superseded file
+is pruned once the new one is stored.
+
+Bundles are built off the request path - by the in-process builder below (a few
+concurrent asyncio tasks per worker) or ahead of time by `python -m app.scripts.build_book_bundles` -
+and stored on local disk (served with Range support, only through the bundle route: the
+directory may not be under the public UPLOAD_DIR) or in S3 (served by a presigned
+redirect; S3 handles Range itself).
+
+Bundle layout (BUNDLE_FORMAT 1):
+    {"format", "book_id", "version", "built_at", "book": BookResponse,
+     "chapters": [chapter fields + "sections": [BookSectionResponse, ...]],
+     "toc": BookTableOfContentsResponse, "media": [{"kind", "url", "chapter_id"}]}
+"""
+import asyncio
+import gzip
+import logging
+import os
+import tempfile
+import uuid
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from botocore.exceptions import ClientError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.config import settings
+from app.crud.book import book_crud
+from app.crud.book_section import book_section_crud
+from app.database import AsyncSessionLocal
+from app.models.content import BookChapter, Content, ContentType
+from app.schemas.book import BookResponse
+from app.schemas.book_section import BookSectionResponse
+from app.schemas.book_toc import BookTableOfContentsResponse, TOCChapterItem, TOCSectionItem
+from app.utils.s3_utils import s3_client
+from app.utils.serialization import json_dumps
+
+logger = logging.getLogger(__name__)
+
+# Bump when the layout changes: every book gets a new bundle name, old ones are pruned on rebuild
+BUNDLE_FORMAT = 1
+BUNDLE_MEDIA_TYPE = "application/gzip"
+
+# Chapter columns copied into the bundle (sections are added separately)
+_CHAPTER_FIELDS = (
+    "id", "book_id", "title", "chapter_number", "description", "audio_url", "video_url", "duration",
+    "transcript", "summary", "key_points", "is_preview_allowed", "word_count", "char_count",
+    "reading_time_seconds", "listening_time_seconds", "created_at", "updated_at",
+)
+
+
+def bundle_key(book_id: uuid.UUID, updated_at: Optional[datetime]) -> str:
+    stamp = updated_at.strftime("%Y%m%dT%H%M%S%f") if updated_at else "0"
+    return f"{book_id}/v{BUNDLE_FORMAT}-{stamp}.json.gz"
+
+
+def bundle_filename(slug_or_id: str, key: str) -> str:
+    return f"{slug_or_id}-{os.path.basename(key)}"
+
+
+class LocalBundleStore:
+    def __init__(self, root: str):
+        self.root = root
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.root, key)
+
+    async def size(self, key: str) -> Optional[int]:
+        try:
+            return os.path.getsize(self.path(key))
+        except OSError:
+            return None
+
+    async def save(self, key: str, local_path: str) -> None:
+        target = self.path(key)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        # Same filesystem (the temp file is created under root), so readers never see a partial file
+        os.replace(local_path, target)
+
+    async def prune(self, book_id: uuid.UUID, keep: str) -> None:
+        directory = os.path.join(self.root, str(book_id))
+        for name in os.listdir(directory) if os.path.isdir(directory) else []:
+            if f"{book_id}/{name}" != keep and name.endswith(".json.gz"):
+                os.remove(os.path.join(directory, name))
+
+    def temp_dir(self) -> str:
+        os.makedirs(self.root, exist_ok=True)
+        return self.root
+
+
+class S3BundleStore:
+    def __init__(self, bucket: str, prefix: str):
+        self.client = s3_client
+        self.bucket = bucket
+        self.prefix = prefix
+
+    async def size(self, key: str) -> Optional[int]:
+        try:
+            head = await asyncio.to_thread(self.client.head_object, Bucket=self.bucket, Key=self.prefix + key)
+        except ClientError:
+            return None
+        return head["ContentLength"]
+
+    async def save(self, key: str, local_path: str) -> None:
+        try:
+            await asyncio.to_thread(
+                self.client.upload_file, local_path, self.bucket, self.prefix + key,
+                ExtraArgs={"ContentType": BUNDLE_MEDIA_TYPE},
+            )
+        finally:
+            os.remove(local_path)
+
+    async def prune(self, book_id: uuid.UUID, keep: str) -> None:
+        listing = await asyncio.to_thread(
+            self.client.list_objects_v2, Bucket=self.bucket, Prefix=f"{self.prefix}{book_id}/"
+        )
+        stale = [{"Key": item["Key"]} for item in listing.get("Contents", []) if item["Key"] != self.prefix + keep]
+        if stale:
+            await asyncio.to_thread(self.client.delete_objects, Bucket=self.bucket, Delete={"Objects": stale})
+
+    def url(self, key: str, filename: str) -> str:
+        return self.client.generate_presigned_url(
+            ClientMethod="get_object",
+            Params={
+                "Bucket": self.bucket,
+                "Key": self.prefix + key,
+                "ResponseContentDisposition": f'attachment; filename="{filename}"',
+            },
+            ExpiresIn=settings.BOOK_BUNDLE_URL_TTL,
+        )
+
+    def temp_dir(self) -> Optional[str]:
+        return None
+
+
+def _check_not_public(directory: str) -> None:
+    """Bundles (and their temp files) must only be reachable through the authenticated bundle route."""
+    root, public = os.path.realpath(directory), os.path.realpath(settings.UPLOAD_DIR)
+    if os.path.commonpath([root, public]) == public:
+        raise ValueError(
+            f"BOOK_BUNDLE_DIR ({directory}) is inside UPLOAD_DIR ({settings.UPLOAD_DIR}), "
+            "which is served without authentication at /static; use a directory outside it"
+        )
+
+
+def _make_store():
+    if settings.BOOK_BUNDLE_STORAGE == "s3":
+        return S3BundleStore(settings.AWS_S3_BUCKET_NAME, settings.BOOK_BUNDLE_S3_PREFIX)
+    _check_not_public(settings.BOOK_BUNDLE_DIR)
+    return LocalBundleStore(settings.BOOK_BUNDLE_DIR)
+
+
+bundle_store = _make_store()
+
+
+async def write_bundle(db: AsyncSession, book_id: uuid.UUID, fh) -> Optional[str]:
+    """
+    Stream the bundle of the book's current version into the binary file `fh` (gzip applied
+    here) and return its key. Sections are read chapter by chapter from a server-side cursor,
+    so memory stays flat for any book size. Returns None if the book doesn't exist or was
+    edited while it was being read (the file then mixes two versions and must be discarded).
+    """
+    book = await book_crud.get_book(db, content_id=book_id)
+    if book is None:
+        return None
+    key = bundle_key(book.id, book.updated_at)
+    is_audio = book.content_type == ContentType.AUDIO.value
+    toc_sections = book.content_type == ContentType.BOOK.value  # as in the /toc route: text books only
+    media: List[Dict] = [
+        {"kind": kind, "url": url, "chapter_id": None}
+        for kind, url in (("cover", book.cover_image_url), ("thumbnail", book.thumbnail_url), ("file", book.file_url))
+        if url
+    ]
+    toc: List[TOCChapterItem] = []
+    chapter_ids = (
+        await db.execute(select(BookChapter.id).where(BookChapter.book_id == book.id).order_by(BookChapter.chapter_number))
+    ).scalars().all()
+
+    with gzip.GzipFile(fileobj=fh, mode="wb", compresslevel=settings.BOOK_BUNDLE_GZIP_LEVEL, mtime=0) as out:
+        header = {
+            "format": BUNDLE_FORMAT,
+            "book_id": book.id,
+            "version": book.updated_at,
+            "built_at": datetime.now(timezone.utc),
+            "book": BookResponse.model_validate(book),
+        }
+        out.write(json_dumps(header)[:-1] + b',"chapters":[')
+        for position, chapter_id in enumerate(chapter_ids):
+            chapter = (await db.execute(select(BookChapter).where(BookChapter.id == chapter_id))).scalar_one()
+            fields = {name: getattr(chapter, name) for name in _CHAPTER_FIELDS}
+            media.extend(
+                {"kind": kind, "url": url, "chapter_id": chapter.id}
+                for kind, url in (("audio", chapter.audio_url), ("video", chapter.video_url))
+                if url
+            )
+            toc_item = TOCChapterItem(
+                id=chapter.id, title=chapter.title, chapter_number=chapter.chapter_number,
+                audio_url=chapter.audio_url if is_audio else None, word_count=chapter.word_count,
+                reading_time_seconds=chapter.reading_time_seconds, listening_time_seconds=chapter.listening_time_seconds,
+            )
+            toc.append(toc_item)
+            db.expunge(chapter)  # Transcripts can be long; don't keep them in the identity map
+
+            out.write((b"," if position else b"") + json_dumps(fields)[:-1] + b',"sections":[')
+            first = True
+            async for section in book_section_crud.stream_sections_for_chapter(
+                db, chapter_id=chapter_id, batch_size=settings.CHAPTER_STREAM_BATCH_SIZE
+            ):
+                out.write((b"" if first else b",") + json_dumps(BookSectionResponse.model_validate(section)))
+                first = False
+                if toc_sections:
+                    toc_item.sections.append(
+                        TOCSectionItem(id=section.id, title=section.title, section_order=section.section_order)
+                    )
+                db.expunge(section)
+            out.write(b"]}")
+
+        toc_body = BookTableOfContentsResponse(
+            book_id=book.id, book_title=book.title, cover_image_url=book.cover_image_url,
+            thumbnail_url=book.thumbnail_url, word_count=book.word_count, reading_time_seconds=book.reading_time_seconds,
+            listening_time_seconds=book.listening_time_seconds, chapters=toc,
+        )
+        out.write(b'],"toc":' + json_dumps(toc_body) + b',"media":' + json_dumps(media) + b"}")
+    current = (await db.execute(select(Content.updated_at).where(Content.id == book.id))).scalar_one_or_none()
+    return key if current == book.updated_at else None
+
+
+async def build_bundle(book_id: uuid.UUID) -> Optional[str]:
+    """Build and store the current bundle of a book, then prune its older ones. Returns the key (None: see write_bundle)."""
+    handle, temp_path = tempfile.mkstemp(suffix=".json.gz.part", dir=bundle_store.temp_dir())
+    try:
+        with os.fdopen(handle, "wb") as fh:
+            async with AsyncSessionLocal() as db:
+                key = await write_bundle(db, book_id, fh)
+        if key is None:
+            os.remove(temp_path)
+            return None
+        await bundle_store.save(key, temp_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    await bundle_store.prune(book_id, key)
+    return key
+
+
+class BundleBuilder:
+    """
+    In-process background builds, at most one per bundle key and BOOK_BUNDLE_MAX_BUILDS at once.
+    Another worker may build the same bundle concurrently; both write identical content and
+    the store replaces atomically, so that only costs the duplicate work.
+    """
+
+    def __init__(self, max_builds: int):
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._max_builds = max_builds
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def is_building(self, key: str) -> bool:
+        return key in self._tasks
+
+    def schedule(self, book_id: uuid.UUID, key: str) -> None:
+        if key in self._tasks:
+            return
+        if self._semaphore is None:
+            # Created lazily so it binds to the running event loop
+            self._semaphore = asyncio.Semaphore(self._max_builds)
+
+        async def run() -> None:
+            try:
+                async with self._semaphore:
+                    built = await build_bundle(book_id)
+                if built != key:
+                    logger.info("Book %s changed while its bundle was built (%s, wanted %s)", book_id, built, key)
+            except Exception:
+                logger.warning("Bundle build failed for book %s", book_id, exc_info=True)
+
+        task = asyncio.create_task(run())
+        self._tasks[key] = task  # Keep a reference until done; the loop only holds weak refs
+        task.add_done_callback(lambda _: self._tasks.pop(key, None))
+
+
+bundle_builder = BundleBuilder(settings.BOOK_BUNDLE_MAX_BUILDS)
@@ -0,0 +1,313 @@
+# app/services/book_import.py
+"""
+Bulk import of a whole book (book row, chapters, sections) from one nested document.
+
+Chapter numbers, section orders and ids are assigned in memory, so a batch of chapters
+and all of their sections go in as two multi-row INSERTs (SQLAlchemy's insertmanyvalues)
+instead of the per-row get_max_*/INSERT/commit/refresh cycle of the single-item routes.
+
+Re-running an import is safe and resumes it: the book is matched by slug, and a chapter
+is only ever committed together with all of its sections, so the chapters already stored
+are complete and the import continues after the last of them. With chapters_per_commit
+unset (the API) the whole book is one transaction; the CLI commits every N chapters so a
+large scripture interrupted half way doesn't start over.
+
+sync_book_from_source() does the same from a streamed Markdown/EPUB source
+(app/services/book_sources.py) and also handles re-imports of an edited source: chapters
+are matched by position, sections by BookSection.content_hash, so only new or edited
+sections are inserted and only vanished ones deleted; unchanged rows are not rewritten
+unless their position changed.
+"""
+import uuid
+from collections import defaultdict, deque
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, func, insert, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.config import settings
+from app.crud.book import book_crud
+from app.crud.book_chapter import book_chapter_crud
+from app.crud.book_section import book_section_crud, section_content_hash
+from app.models.content import BookChapter, BookSection, Content, ContentSubType
+from app.models.reading_stats import text_stats
+from app.schemas.book import BookCreate
+from app.schemas.book_import import BookImportChapter, BookImportDocument, BookImportResponse, BookSourceImportResponse
+from app.services.book_sources import ChapterStart, SourceEvent
+from app.utils.cache import entity_tag, response_cache
+from app.utils.helpers import slugify
+from app.utils.text_search import section_document
+
+Progress = Callable[[str], None]
+
+
+def _rows(book_id: uuid.UUID, chapters: List[BookImportChapter], first_number: int):
+    chapter_rows, section_rows = [], []
+    for number, chapter in enumerate(chapters, start=first_number):
+        chapter_id = uuid.uuid4()
+        chapter_rows.append({
+            "id": chapter_id,
+            "book_id": book_id,
+            "chapter_number": number,
+            **chapter.model_dump(exclude={"sections"}),
+            # Core INSERTs skip the mapper listeners, so the row-level stats are filled in here
+            **{f"transcript_{name}": value for name, value in text_stats(chapter.transcript).items()},
+        })
+        section_rows.extend(
+            {
+                "id": uuid.uuid4(), "chapter_id": chapter_id, "section_order": order, "title": section.title,
+                "body": section.body, "content_hash": section_content_hash(section.title, section.body),
+                **text_stats(section.body), "search_vector": section_document(section.title, section.body),
+            }
+            for order, section in enumerate(chapter.sections)
+        )
+    return chapter_rows, section_rows
+
+
+async def _resolve_book(
+    db: AsyncSession, slug: str, book_in: BookCreate, author_id: Optional[uuid.UUID]
+) -> Tuple[uuid.UUID, bool]:
+    """(book id, created): the live book with this slug, or a new one built from book_in."""
+    if not slug:
+        raise ValueError("The book needs a slug or a title that produces one")
+    existing = (
+        await db.execute(select(Content.id, Content.sub_type).where(Content.slug == slug, Content.is_deleted.is_(False)))
+    ).first()
+    if existing is not None:
+        if existing.sub_type != ContentSubType.BOOK.value:
+            raise ValueError(f"Slug '{slug}' is already used by non-book content")
+        return existing.id, False
+    book = book_crud.build_book(obj_in=book_in, author_id=author_id, slug=slug)
+    db.add(book)
+    await db.flush()
+    return book.id, True
+
+
+async def import_book(
+    db: AsyncSession,
+    document: BookImportDocument,
+    *,
+    author_id: Optional[uuid.UUID] = None,
+    chapters_per_commit: Optional[int] = None,
+    progress: Optional[Progress] = None,
+) -> BookImportResponse:
+    slug = document.slug or slugify(document.title)
+    book_id, created = await _resolve_book(
+        db, slug, BookCreate.model_validate(document.model_dump(exclude={"chapters", "slug"})), author_id
+    )
+    chapters_done, last_number = 0, 0
+    if not created:
+        chapters_done, last_number = (
+            await db.execute(
+                select(func.count(BookChapter.id), func.coalesce(func.max(BookChapter.chapter_number), 0))
+                .where(BookChapter.book_id == book_id)
+            )
+        ).one()
+        if chapters_done > len(document.chapters):
+            raise ValueError(
+                f"Book '{slug}' already has {chapters_done} chapters, more than the {len(document.chapters)} in the document"
+            )
+
+    remaining = document.chapters[chapters_done:]
+    batch_size = chapters_per_commit or len(remaining) or 1
+    chapters_inserted = sections_inserted = 0
+    for start in range(0, len(remaining), batch_size):
+        chapter_rows, section_rows = _rows(book_id, remaining[start:start + batch_size], last_number + 1)
+        await db.execute(insert(BookChapter), chapter_rows)
+        if section_rows:
+            await db.execute(insert(BookSection), section_rows)
+        last_number += len(chapter_rows)
+        chapters_inserted += len(chapter_rows)
+        sections_inserted += len(section_rows)
+        if chapters_per_commit:
+            await book_chapter_crud.touch_book(db, book_id=book_id)
+            await db.commit()
+            if progress:
+                progress(f"{slug}: {chapters_done + chapters_inserted}/{len(document.chapters)} chapters")
+
+    if chapters_inserted and not chapters_per_commit:
+        await book_chapter_crud.touch_book(db, book_id=book_id)
+    await db.commit()
+    await response_cache.invalidate_tags([entity_tag("content"), entity_tag("content", book_id), entity_tag("book_chapters")])
+
+    return BookImportResponse(
+        book_id=book_id,
+        slug=slug,
+        created=created,
+        chapters_skipped=chapters_done,
+        chapters_inserted=chapters_inserted,
+        sections_inserted=sections_inserted,
+    )
+
+
+class _ChapterSync:
+    """
+    Re-imports one chapter's sections, fed one at a time in source order.
+
+    New/edited sections are buffered and inserted batch_size at a time at a temporary
+    order -(position + 1), which can't collide with stored rows. finish() deletes the
+    stored sections that weren't matched and moves the new rows to their positions: with
+    one UPDATE of just those rows when every kept row already sits at its final position
+    (the usual edit-in-place case), else with the two-phase CRUDBase.reorder().
+    """
+
+    def __init__(self, db: AsyncSession, chapter_id: uuid.UUID, stored: Iterable, batch_size: int):
+        self.db = db
+        self.chapter_id = chapter_id
+        self.batch_size = batch_size
+        # Several identical sections (a repeated refrain) are matched in order
+        self.by_hash: Dict[str, Deque[Tuple[uuid.UUID, int]]] = defaultdict(deque)
+        self.unmatched: Dict[uuid.UUID, int] = {}
+        for row in stored:
+            self.unmatched[row.id] = row.section_order
+            if row.content_hash:
+                self.by_hash[row.content_hash].append((row.id, row.section_order))
+        self.final_ids: List[uuid.UUID] = []
+        self.moved = False
+        self.buffer: List[dict] = []
+        self.inserted = self.unchanged = self.deleted = 0
+
+    async def add(self, title: Optional[str], body: str) -> None:
+        position = len(self.final_ids)
+        content_hash = section_content_hash(title, body)
+        candidates = self.by_hash.get(content_hash)
+        if candidates:
+            section_id, order = candidates.popleft()
+            del self.unmatched[section_id]
+            self.moved = self.moved or order != position
+            self.final_ids.append(section_id)
+            self.unchanged += 1
+            return
+        section_id = uuid.uuid4()
+        self.final_ids.append(section_id)
+        self.buffer.append({
+            "id": section_id, "chapter_id": self.chapter_id, "section_order": -(position + 1),
+            "title": title, "body": body, "content_hash": content_hash, **text_stats(body),
+            "search_vector": section_document(title, body),
+        })
+        if len(self.buffer) >= self.batch_size:
+            await self.flush()
+
+    async def flush(self) -> None:
+        if self.buffer:
+            await self.db.execute(insert(BookSection), self.buffer)
+            self.inserted += len(self.buffer)
+            self.buffer = []
+
+    async def finish(self) -> bool:
+        """Returns whether anything in the chapter changed."""
+        await self.flush()
+        if self.unmatched:
+            await self.db.execute(delete(BookSection).where(BookSection.id.in_(list(self.unmatched))))
+            self.deleted = len(self.unmatched)
+        if self.moved:
+            await book_section_crud.reorder(
+                self.db, parent_column=BookSection.chapter_id, parent_id=self.chapter_id,
+                order_column=BookSection.section_order, ids=self.final_ids, start=0,
+            )
+        elif self.inserted:
+            await self.db.execute(
+                update(BookSection)
+                .where(BookSection.chapter_id == self.chapter_id, BookSection.section_order < 0)
+                .values(section_order=-BookSection.section_order - 1)
+            )
+        return bool(self.moved or self.inserted or self.deleted)
+
+
+async def sync_book_from_source(
+    db: AsyncSession,
+    events: Iterable[SourceEvent],
+    *,
+    slug: str,
+    book_in: BookCreate,
+    author_id: Optional[uuid.UUID] = None,
+    batch_size: int = settings.BOOK_IMPORT_BATCH_SIZE,
+    chapters_per_commit: Optional[int] = None,
+    progress: Optional[Progress] = None,
+) -> BookSourceImportResponse:
+    """
+    Create or update the book `slug` from a ChapterStart/SourceSection event stream.
+
+    The stream is consumed as it is produced, so only the current chapter's stored
+    (id, hash, order) tuples and one insert batch of new sections are held in memory.
+    book_in is only used when the book doesn't exist yet.
+    """
+    book_id, created = await _resolve_book(db, slug, book_in, author_id)
+    stored_chapters = (
+        await db.execute(
+            select(BookChapter.id, BookChapter.chapter_number, BookChapter.title)
+            .where(BookChapter.book_id == book_id)
+            .order_by(BookChapter.chapter_number)
+        )
+    ).all()
+    last_number = stored_chapters[-1].chapter_number if stored_chapters else 0
+    result = BookSourceImportResponse(book_id=book_id, slug=slug, created=created)
+    changed_chapters: List[uuid.UUID] = []
+    chapter: Optional[_ChapterSync] = None
+    chapters_seen = 0
+
+    async def finish_chapter() -> None:
+        if await chapter.finish():
+            changed_chapters.append(chapter.chapter_id)
+        result.sections_inserted += chapter.inserted
+        result.sections_unchanged += chapter.unchanged
+        result.sections_deleted += chapter.deleted
+        if chapters_per_commit and chapters_seen % chapters_per_commit == 0:
+            if changed_chapters:
+                await book_chapter_crud.touch_book(db, book_id=book_id)
+            await db.commit()
+            if progress:
+                progress(f"{slug}: {chapters_seen} chapters, {result.sections_inserted} sections written")
+
+    for event in events:
+        if isinstance(event, ChapterStart):
+            if chapter is not None:
+                await finish_chapter()
+            if chapters_seen < len(stored_chapters):
+                stored_chapter = stored_chapters[chapters_seen]
+                chapter_id = stored_chapter.id
+                if stored_chapter.title != event.title:
+                    await db.execute(update(BookChapter).where(BookChapter.id == chapter_id).values(title=event.title))
+                    result.chapters_updated += 1
+                    changed_chapters.append(chapter_id)
+                stored_sections = (
+                    await db.execute(
+                        select(BookSection.id, BookSection.content_hash, BookSection.section_order)
+                        .where(BookSection.chapter_id == chapter_id)
+                    )
+                ).all()
+            else:
+                chapter_id = uuid.uuid4()
+                last_number += 1
+                await db.execute(
+                    insert(BookChapter).values(id=chapter_id, book_id=book_id, chapter_number=last_number, title=event.title)
+                )
+                result.chapters_created += 1
+                changed_chapters.append(chapter_id)
+                stored_sections = []
+            chapters_seen += 1
+            chapter = _ChapterSync(db, chapter_id, stored_sections, batch_size)
+        elif chapter is None:
+            raise ValueError("The source has a section before its first chapter")
+        else:
+            await chapter.add(event.title, event.body)
+    if chapter is not None:
+        await finish_chapter()
+
+    extra = [row.id for row in stored_chapters[chapters_seen:]]
+    if extra:
+        deleted_sections = await db.execute(delete(BookSection).where(BookSection.chapter_id.in_(extra)))
+        result.sections_deleted += deleted_sections.rowcount
+        await db.execute(delete(BookChapter).where(BookChapter.id.in_(extra)))
+        result.chapters_deleted = len(extra)
+        changed_chapters.extend(extra)
+
+    if changed_chapters:
+        await book_chapter_crud.touch_book(db, book_id=book_id)
+    await db.commit()
+    if created or changed_chapters:
+        await response_cache.invalidate_tags(
+            [entity_tag("content"), entity_tag("content", book_id), entity_tag("book_chapters"), entity_tag("book_sections")]
+        )
+    return result
@@ -0,0 +1,244 @@
+# app/services/book_sources.py
+"""
+Incremental readers for book source files (structured Markdown and EPUB).
+
+Both yield a flat event stream - ChapterStart, then the SourceSections of that chapter,
+then the next ChapterStart ... - while reading the input, so the importer can write a
+chapter's rows before the next one has been parsed. Neither reader holds more than the
+section being assembled (plus, for EPUB, one read buffer of the current spine document).
+
+Markdown
+    `# Title`            starts a chapter
+    `## Title` .. `######` starts a titled section
+    other lines          section body; text before the first `##` of a chapter is an untitled section
+
+EPUB
+    every (linear) spine document is a chapter, titled by its first heading (or <title>);
+    h2-h6 after that start titled sections and block text (p, div, li, ...) is body.
+    Navigation documents and documents without text are skipped.
+
+With split_paragraphs every paragraph becomes its own section (a verse per section),
+the heading's title going to the first one.
+"""
+import codecs
+import io
+import posixpath
+import re
+import zipfile
+from html.parser import HTMLParser
+from typing import IO, Iterable, Iterator, List, NamedTuple, Optional, Union
+from xml.etree import ElementTree
+
+
+class ChapterStart(NamedTuple):
+    title: str
+
+
+class SourceSection(NamedTuple):
+    title: Optional[str]
+    body: str
+
+
+SourceEvent = Union[ChapterStart, SourceSection]
+
+_HEADING = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+
+
+class _SectionBuilder:
+    """Accumulates body lines and emits SourceSections at headings / paragraph breaks."""
+
+    def __init__(self, split_paragraphs: bool):
+        self.split_paragraphs = split_paragraphs
+        self.title: Optional[str] = None
+        self.lines: List[str] = []
+
+    def flush(self) -> Iterator[SourceSection]:
+        body = "\n".join(self.lines).strip()
+        if body:
+            yield SourceSection(self.title, body)
+            self.title = None
+        self.lines = []
+
+    def heading(self, title: str) -> Iterator[SourceSection]:
+        # A heading with no text under it before the next one is dropped
+        yield from self.flush()
+        self.title = title
+
+    def paragraph_break(self) -> Iterator[SourceSection]:
+        if self.split_paragraphs:
+            yield from self.flush()
+        elif self.lines and self.lines[-1] != "":
+            self.lines.append("")
+
+
+def iter_markdown(lines: Iterable[str], *, split_paragraphs: bool = False) -> Iterator[SourceEvent]:
+    sections = _SectionBuilder(split_paragraphs)
+    in_chapter = False
+    for number, line in enumerate(lines, start=1):
+        line = line.rstrip("\r\n")
+        match = _HEADING.match(line)
+        if match and len(match.group(1)) == 1:
+            yield from sections.flush()
+            sections.title = None
+            in_chapter = True
+            yield ChapterStart(match.group(2))
+        elif not in_chapter:
+            if line.strip():
+                raise ValueError(f"Line {number}: text before the first '# ' chapter heading")
+        elif match:
+            yield from sections.heading(match.group(2))
+        elif not line.strip():
+            yield from sections.paragraph_break()
+        else:
+            sections.lines.append(line)
+    yield from sections.flush()
+
+
+# --- EPUB ---
+
+_CONTAINER_NS = {"c": "urn:oasis:names:tc:opendocument:xmlns:container"}
+_OPF_NS = {"opf": "http://www.idpf.org/2007/opf", "dc": "http://purl.org/dc/elements/1.1/"}
+_BLOCK_TAGS = {"p", "div", "li", "blockquote", "pre", "tr", "section", "article", "br", "dd", "dt"}
+_SKIP_TAGS = {"head", "script", "style", "nav"}
+_HEADING_TAGS = {"h1", "h2", "h3", "h4", "h5", "h6"}
+_READ_SIZE = 64 * 1024
+
+
+class _ChapterParser(HTMLParser):
+    """Fed in chunks; events accumulate in `pending` and are drained by the caller after each feed."""
+
+    def __init__(self, fallback_title: str, split_paragraphs: bool):
+        super().__init__(convert_charrefs=True)
+        self.fallback_title = fallback_title
+        self.sections = _SectionBuilder(split_paragraphs)
+        self.pending: List[SourceEvent] = []
+        self.chapter_started = False
+        self.skip_depth = 0
+        self.heading_text: Optional[List[str]] = None
+        self.head_title: Optional[List[str]] = None
+        self.text: List[str] = []
+
+    def _start_chapter(self, title: Optional[str]) -> None:
+        if not self.chapter_started:
+            self.chapter_started = True
+            self.pending.append(ChapterStart(title or self.fallback_title))
+
+    def _end_line(self) -> None:
+        line = re.sub(r"\s+", " ", "".join(self.text)).strip()
+        self.text = []
+        if line:
+            self._start_chapter(None)
+            self.sections.lines.append(line)
+            if self.sections.split_paragraphs:
+                self.pending.extend(self.sections.flush())
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "title" and not self.chapter_started:
+            self.head_title = []
+        if tag in _SKIP_TAGS:
+            self.skip_depth += 1
+        elif tag in _HEADING_TAGS:
+            self._end_line()
+            self.heading_text = []
+        elif tag in _BLOCK_TAGS:
+            self._end_line()
+
+    def handle_endtag(self, tag):
+        if tag == "title" and self.head_title is not None:
+            self.fallback_title = " ".join("".join(self.head_title).split()) or self.fallback_title
+            self.head_title = None
+        if tag in _SKIP_TAGS:
+            self.skip_depth = max(0, self.skip_depth - 1)
+        elif tag in _HEADING_TAGS and self.heading_text is not None:
+            title = " ".join("".join(self.heading_text).split())
+            self.heading_text = None
+            if not title:
+                return
+            if not self.chapter_started:
+                self._start_chapter(title)
+            else:
+                self.pending.extend(self.sections.heading(title))
+        elif tag in _BLOCK_TAGS:
+            self._end_line()
+
+    def handle_data(self, data):
+        if self.head_title is not None:
+            self.head_title.append(data)
+        if self.skip_depth:
+            return
+        if self.heading_text is not None:
+            self.heading_text.append(data)
+        else:
+            self.text.append(data)
+
+    def finish(self) -> None:
+        self.close()
+        self._end_line()
+        self.pending.extend(self.sections.flush())
+
+
+def _spine(epub: zipfile.ZipFile):
+    container = ElementTree.fromstring(epub.read("META-INF/container.xml"))
+    opf_path = container.find(".//c:rootfile", _CONTAINER_NS).get("full-path")
+    opf = ElementTree.fromstring(epub.read(opf_path))
+    base = posixpath.dirname(opf_path)
+    title = opf.findtext(".//dc:title", default="", namespaces=_OPF_NS).strip()
+    manifest = {item.get("id"): item for item in opf.iterfind(".//opf:manifest/opf:item", _OPF_NS)}
+    documents = []
+    for itemref in opf.iterfind(".//opf:spine/opf:itemref", _OPF_NS):
+        item = manifest.get(itemref.get("idref"))
+        if item is None or itemref.get("linear") == "no" or "nav" in (item.get("properties") or "").split():
+            continue
+        documents.append(posixpath.normpath(posixpath.join(base, item.get("href"))))
+    return title, documents
+
+
+def epub_title(source: Union[str, IO[bytes]]) -> str:
+    with zipfile.ZipFile(source) as epub:
+        return _spine(epub)[0]
+
+
+def iter_epub(source: Union[str, IO[bytes]], *, split_paragraphs: bool = False) -> Iterator[SourceEvent]:
+    """`source` is a path or a seekable binary file (EPUB is a zip, read entry by entry)."""
+    with zipfile.ZipFile(source) as epub:
+        _, documents = _spine(epub)
+        for name in documents:
+            parser = _ChapterParser(posixpath.splitext(posixpath.basename(name))[0], split_paragraphs)
+            # Incremental decoder: a chunk boundary may fall inside a multi-byte character
+            decoder = codecs.getincrementaldecoder("utf-8")()
+            with epub.open(name) as fh:
+                while True:
+                    chunk = fh.read(_READ_SIZE)
+                    parser.feed(decoder.decode(chunk, final=not chunk))
+                    yield from parser.pending
+                    parser.pending = []
+                    if not chunk:
+                        break
+            parser.finish()
+            yield from parser.pending
+
+
+SOURCE_FORMATS = (".md", ".markdown", ".epub")
+
+
+def source_format(filename: str) -> str:
+    extension = posixpath.splitext(filename.lower())[1]
+    if extension not in SOURCE_FORMATS:
+        raise ValueError(f"Unsupported source '{filename}': expected one of {', '.join(SOURCE_FORMATS)}")
+    return extension
+
+
+def source_title(fh: IO[bytes], filename: str) -> str:
+    """The EPUB's dc:title, else the file name; rewinds fh."""
+    title = ""
+    if source_format(filename) == ".epub":
+        title = epub_title(fh)
+        fh.seek(0)
+    return title or posixpath.splitext(posixpath.basename(filename))[0].replace("-", " ").replace("_", " ").title()
+
+
+def iter_source(fh: IO[bytes], filename: str, *, split_paragraphs: bool = False) -> Iterator[SourceEvent]:
+    """Events of a seekable binary source file, the reader picked by the file extension."""
+    if source_format(filename) == ".epub":
+        return iter_epub(fh, split_paragraphs=split_paragraphs)
+    return iter_markdown(io.TextIOWrapper(fh, encoding="utf-8-sig"), split_paragraphs=split_paragraphs)
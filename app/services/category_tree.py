@@ -0,0 +1,84 @@
+# app/services/category_tree.py
+"""
+Per-scope category trees held in memory.
+
+Each CategoryScopeType's tree is built from one query and kept as a serialized
+body. CRUDCategory drops every tree on any category write, and other workers
+rebuild after CATEGORY_TREE_MAX_AGE.
+"""
+import asyncio
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from pydantic import TypeAdapter
+from sqlalchemy.future import select
+
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models.category import Category
+from app.schemas.category import CategoryTreeNode
+
+_tree_adapter = TypeAdapter(List[CategoryTreeNode])
+# Read plain columns only: touching Category.children would trigger a lazy load per row
+_NODE_FIELDS = [name for name in CategoryTreeNode.model_fields if name != "children"]
+
+
+def build_category_tree(categories: Iterable[Category], root_id: Optional[UUID] = None) -> List[CategoryTreeNode]:
+    """
+    Nest an already ordered, flat list of categories. Categories whose parent isn't in the list
+    become roots, unless `root_id` is given, in which case only that category's node is returned.
+    """
+    nodes: Dict[UUID, CategoryTreeNode] = {}
+    for category in categories:
+        nodes[category.id] = CategoryTreeNode.model_validate({name: getattr(category, name) for name in _NODE_FIELDS})
+    roots: List[CategoryTreeNode] = []
+    for node in nodes.values():
+        parent = nodes.get(node.parent_id) if node.parent_id is not None else None
+        if parent is not None and node.id != root_id:
+            parent.children.append(node)
+        else:
+            roots.append(node)
+    if root_id is not None:
+        return [nodes[root_id]] if root_id in nodes else []
+    return roots
+
+
+def dump_category_tree(nodes: List[CategoryTreeNode]) -> bytes:
+    return _tree_adapter.dump_json(nodes)
+
+
+class CategoryTreeService:
+    def __init__(self, max_age: int):
+        self.max_age = max_age
+        self._trees: Dict[str, Tuple[float, bytes]] = {}
+        self._generation = 0
+        self._lock = asyncio.Lock()
+
+    def invalidate(self) -> None:
+        self._generation += 1
+        self._trees.clear()
+
+    async def get(self, scope: str) -> bytes:
+        """Serialized tree for one CategoryScopeType value."""
+        entry = self._trees.get(scope)
+        if entry is not None and time.monotonic() - entry[0] < self.max_age:
+            return entry[1]
+        async with self._lock:
+            entry = self._trees.get(scope)
+            if entry is not None and time.monotonic() - entry[0] < self.max_age:
+                return entry[1]
+            generation = self._generation
+            async with AsyncSessionLocal() as db:
+                result = await db.execute(
+                    select(Category)
+                    .where(Category.type == scope, Category.is_deleted.is_(False))
+                    .order_by(Category.sort_order, Category.name)
+                )
+                body = dump_category_tree(build_category_tree(result.scalars().all()))
+            if generation == self._generation:  # Skip storing if a write landed while we were loading
+                self._trees[scope] = (time.monotonic(), body)
+            return body
+
+
+category_tree = CategoryTreeService(max_age=settings.CATEGORY_TREE_MAX_AGE)
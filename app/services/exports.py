@@ -0,0 +1,123 @@
+# app/services/exports.py
+"""
+Streaming catalog exports for admins (NDJSON or CSV).
+
+Rows are read through a server-side cursor (`AsyncSession.stream` with
+`yield_per`), so only one batch of EXPORT_BATCH_SIZE rows is ever held in
+memory, and each batch is encoded and flushed to the client as one chunk.
+Plain column tuples are selected rather than ORM entities: nothing lands in the
+identity map and no relationship is ever touched.
+
+The generator opens its own session because it keeps running after the route
+function has returned.
+"""
+import csv
+import io
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
+
+from sqlalchemy import inspect
+from sqlalchemy.future import select
+
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models.contact_submission import ContactSubmission
+from app.models.content import Content
+from app.models.festival import Festival
+from app.models.place import Place
+from app.models.temple import Temple
+from app.models.user import User
+from app.utils.serialization import json_dumps
+
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv; charset=utf-8",
+}
+
+
+class ExportSpec:
+    """Which table an export reads and which of its columns it exposes."""
+
+    def __init__(self, model, *, exclude: Sequence[str] = ()):
+        self.model = model
+        self.columns = [
+            column for name, column in inspect(model).columns.items() if name not in exclude
+        ]
+
+    @property
+    def column_names(self) -> List[str]:
+        return [column.key for column in self.columns]
+
+    def query(self, include_deleted: bool = False, updated_since: Optional[datetime] = None):
+        query = select(*self.columns)
+        if not include_deleted and hasattr(self.model, "is_deleted"):
+            query = query.where(self.model.is_deleted.is_(False))
+        if updated_since is not None:
+            query = query.where(self.model.updated_at >= updated_since)
+        # Primary-key order is an index scan and makes exports diffable between runs
+        return query.order_by(self.model.id)
+
+
+EXPORTS: Dict[str, ExportSpec] = {
+    "content": ExportSpec(Content),
+    "places": ExportSpec(Place),
+    "temples": ExportSpec(Temple),
+    "festivals": ExportSpec(Festival),
+    "users": ExportSpec(User, exclude=("hashed_password",)),
+    "contact_submissions": ExportSpec(ContactSubmission),
+}
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return json_dumps(value).decode("utf-8")
+    return value
+
+
+class _CSVEncoder:
+    def __init__(self):
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer)
+
+    def encode(self, rows: Sequence[Sequence[Any]]) -> bytes:
+        self._writer.writerows([_csv_value(value) for value in row] for row in rows)
+        data = self._buffer.getvalue()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return data.encode("utf-8")
+
+
+async def stream_export(
+    spec: ExportSpec,
+    export_format: ExportFormat,
+    *,
+    include_deleted: bool = False,
+    updated_since: Optional[datetime] = None,
+) -> AsyncIterator[bytes]:
+    """Yields one encoded chunk per cursor batch (the CSV header goes out first, before any query)."""
+    names = spec.column_names
+    csv_encoder = _CSVEncoder() if export_format == ExportFormat.CSV else None
+    if csv_encoder is not None:
+        yield csv_encoder.encode([names])
+
+    query = spec.query(include_deleted, updated_since).execution_options(yield_per=settings.EXPORT_BATCH_SIZE)
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(query)
+        async for batch in result.partitions():
+            if csv_encoder is not None:
+                yield csv_encoder.encode(batch)
+            else:
+                yield b"".join(json_dumps(dict(zip(names, row))) + b"\n" for row in batch)
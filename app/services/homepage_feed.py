@@ -0,0 +1,139 @@
+# app/services/homepage_feed.py
+"""
+Composes the /homepage/feed payload.
+
+Every section is a narrow column select (no ORM entities, no relationship loads)
+cached under its own key and TTL, and tagged with the table it reads so the
+CRUD invalidation hooks evict it on edits. Sections run concurrently, each on
+its own session since an AsyncSession cannot be shared between tasks, and the
+cached JSON bodies are spliced into the response without re-serializing.
+"""
+import asyncio
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Tuple, Type
+
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.database import AsyncSessionLocal
+from app.models.collection import Collection
+from app.models.content import Content, ContentStatus, ContentSubType
+from app.models.festival import Festival
+from app.models.temple import Temple
+from app.schemas.homepage import FeedCollectionItem, FeedContentItem, FeedFestivalItem, FeedTempleItem
+from app.utils.cache import entity_tag, response_cache
+
+Loader = Callable[[AsyncSession, int], Awaitable[List[Dict[str, Any]]]]
+
+CONTENT_COLUMNS = (
+    Content.id, Content.title, Content.slug, Content.subtitle, Content.content_type,
+    Content.cover_image_url, Content.thumbnail_url, Content.author_name, Content.published_at,
+)
+
+
+def _rows(result) -> List[Dict[str, Any]]:
+    return [dict(row._mapping) for row in result]
+
+
+def _published_content(sub_type: ContentSubType, featured_only: bool = False):
+    query = select(*CONTENT_COLUMNS).where(
+        Content.sub_type == sub_type.value,
+        Content.status == ContentStatus.PUBLISHED.value,
+        Content.is_deleted.is_(False),
+    )
+    if featured_only:
+        query = query.where(Content.featured.is_(True))
+    return query.order_by(Content.published_at.desc().nullslast(), Content.created_at.desc())
+
+
+async def _featured_books(db: AsyncSession, limit: int) -> List[Dict[str, Any]]:
+    return _rows(await db.execute(_published_content(ContentSubType.BOOK, featured_only=True).limit(limit)))
+
+
+async def _stories(db: AsyncSession, limit: int) -> List[Dict[str, Any]]:
+    return _rows(await db.execute(_published_content(ContentSubType.STORY).limit(limit)))
+
+
+async def _teachings(db: AsyncSession, limit: int) -> List[Dict[str, Any]]:
+    return _rows(await db.execute(_published_content(ContentSubType.TEACHING).limit(limit)))
+
+
+async def _featured_collections(db: AsyncSession, limit: int) -> List[Dict[str, Any]]:
+    result = await db.execute(
+        select(Collection.id, Collection.name, Collection.slug, Collection.cover_image_url)
+        .where(Collection.is_featured.is_(True), Collection.is_public.is_(True), Collection.is_deleted.is_(False))
+        .order_by(Collection.sort_order, Collection.name)
+        .limit(limit)
+    )
+    return _rows(result)
+
+
+async def _major_festivals(db: AsyncSession, limit: int) -> List[Dict[str, Any]]:
+    # Upcoming or ongoing only; festivals without dates can't be placed on the calendar
+    result = await db.execute(
+        select(Festival.id, Festival.name, Festival.start_date, Festival.end_date, Festival.images)
+        .where(
+            Festival.is_major_festival.is_(True),
+            Festival.is_deleted.is_(False),
+            func.coalesce(Festival.end_date, Festival.start_date) >= datetime.utcnow(),
+        )
+        .order_by(Festival.start_date)
+        .limit(limit)
+    )
+    return _rows(result)
+
+
+async def _featured_temples(db: AsyncSession, limit: int) -> List[Dict[str, Any]]:
+    result = await db.execute(
+        select(Temple.id, Temple.name, Temple.main_deity, Temple.cover_image, Temple.place_id)
+        .where(Temple.is_featured.is_(True), Temple.is_deleted.is_(False))
+        .order_by(Temple.visit_count.desc().nullslast(), Temple.name)
+        .limit(limit)
+    )
+    return _rows(result)
+
+
+class FeedSection:
+    def __init__(self, name: str, loader: Loader, item_schema: Type[BaseModel], table: str, ttl: int):
+        self.name = name
+        self.loader = loader
+        self.adapter = TypeAdapter(List[item_schema])
+        self.table = table
+        self.ttl = ttl
+
+    async def fetch(self, limit: int) -> Tuple[bytes, str]:
+        async def build(db: AsyncSession):
+            return self.adapter.dump_json(self.adapter.validate_python(await self.loader(db, limit)))
+
+        async with AsyncSessionLocal() as db:
+            return await response_cache.get_or_set_body(
+                f"{response_cache.namespace}:homepage:{self.name}:{limit}",
+                build,
+                db=db,
+                tags=[entity_tag(self.table)],
+                ttl=self.ttl,
+            )
+
+
+# Order here is the key order of the response. TTLs follow how often each section
+# changes; edits evict immediately regardless, the TTL only bounds date-driven drift.
+FEED_SECTIONS = (
+    FeedSection("featured_books", _featured_books, FeedContentItem, "content", ttl=600),
+    FeedSection("featured_collections", _featured_collections, FeedCollectionItem, "collections", ttl=1800),
+    FeedSection("major_festivals", _major_festivals, FeedFestivalItem, "festivals", ttl=3600),
+    FeedSection("featured_temples", _featured_temples, FeedTempleItem, "temples", ttl=1800),
+    FeedSection("stories", _stories, FeedContentItem, "content", ttl=300),
+    FeedSection("teachings", _teachings, FeedContentItem, "content", ttl=300),
+)
+
+
+async def build_homepage_feed(limit: int) -> Tuple[bytes, Dict[str, str]]:
+    """Returns the composed JSON body and the cache status of each section."""
+    results = await asyncio.gather(*(section.fetch(limit) for section in FEED_SECTIONS))
+    body = b"{" + b",".join(
+        b'"' + section.name.encode("ascii") + b'":' + section_body
+        for section, (section_body, _) in zip(FEED_SECTIONS, results)
+    ) + b"}"
+    return body, {section.name: cache_status for section, (_, cache_status) in zip(FEED_SECTIONS, results)}
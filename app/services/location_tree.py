@@ -0,0 +1,147 @@
+# app/services/location_tree.py
+"""
+In-memory country -> region -> state -> city hierarchy.
+
+The location tables are tiny and almost never change, so they are loaded once (four
+narrow id/name/parent selects) and every location endpoint is answered from
+pre-serialized JSON bodies. Any ORM flush touching a location row marks the
+snapshot dirty and the next read reloads it; other workers pick the change up
+after LOCATION_TREE_MAX_AGE or an explicit POST /location/refresh.
+"""
+import asyncio
+import time
+from typing import Dict, List, Optional
+from uuid import UUID
+
+from sqlalchemy import event
+from sqlalchemy.future import select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models.location import City, Country, Region, State
+from app.utils.etag import make_etag
+from app.utils.serialization import json_dumps
+
+LOCATION_MODELS = (Country, Region, State, City)
+
+
+class LocationSnapshot:
+    """Immutable view of the hierarchy plus the JSON bodies served for it."""
+
+    def __init__(self, countries: List[dict], regions: List[dict], states: List[dict], cities: List[dict]):
+        self.loaded_at = time.monotonic()
+        self.counts = {
+            "countries": len(countries), "regions": len(regions), "states": len(states), "cities": len(cities),
+        }
+
+        self.countries_body = json_dumps([_public(c) for c in countries])
+        self.regions_body = json_dumps([_public(r) for r in regions])
+        self.states_body = json_dumps([_public(s) for s in states])
+        self.cities_body = json_dumps([_public(c) for c in cities])
+
+        self.regions_by_country = _group_bodies(regions, "country_id")
+        self.states_by_region = _group_bodies(states, "region_id")
+        self.cities_by_state = _group_bodies(cities, "state_id")
+
+        self.tree_body = json_dumps(_build_tree(countries, regions, states, cities))
+        self.tree_etag = make_etag("location-tree", self.tree_body.decode("utf-8"))
+
+    @staticmethod
+    def children(bodies: Dict[str, bytes], parent_id: UUID) -> bytes:
+        return bodies.get(str(parent_id), b"[]")
+
+
+def _public(row: dict) -> dict:
+    return {"id": row["id"], "name": row["name"]}
+
+
+def _group(rows: List[dict], parent_key: str) -> Dict[Optional[str], List[dict]]:
+    grouped: Dict[Optional[str], List[dict]] = {}
+    for row in rows:
+        grouped.setdefault(row[parent_key], []).append(row)
+    return grouped
+
+
+def _group_bodies(rows: List[dict], parent_key: str) -> Dict[str, bytes]:
+    return {
+        parent_id: json_dumps([_public(row) for row in children])
+        for parent_id, children in _group(rows, parent_key).items()
+        if parent_id is not None
+    }
+
+
+def _build_tree(countries, regions, states, cities) -> List[dict]:
+    cities_by_state = _group(cities, "state_id")
+    states_by_region = _group(states, "region_id")
+    regions_by_country = _group(regions, "country_id")
+    return [
+        {
+            **_public(country),
+            "regions": [
+                {
+                    **_public(region),
+                    "states": [
+                        {**_public(state), "cities": [_public(city) for city in cities_by_state.get(state["id"], [])]}
+                        for state in states_by_region.get(region["id"], [])
+                    ],
+                }
+                for region in regions_by_country.get(country["id"], [])
+            ],
+        }
+        for country in countries
+    ]
+
+
+class LocationTreeService:
+    def __init__(self, max_age: int):
+        self.max_age = max_age
+        self._snapshot: Optional[LocationSnapshot] = None
+        self._dirty = True
+        self._lock = asyncio.Lock()
+
+    def mark_dirty(self) -> None:
+        self._dirty = True
+
+    async def get(self) -> LocationSnapshot:
+        snapshot = self._snapshot
+        if snapshot is not None and not self._dirty and time.monotonic() - snapshot.loaded_at < self.max_age:
+            return snapshot
+        async with self._lock:
+            # Another request may have reloaded while we waited for the lock
+            if self._snapshot is snapshot or self._dirty:
+                await self.refresh()
+            return self._snapshot
+
+    async def refresh(self) -> LocationSnapshot:
+        self._dirty = False  # Cleared first so a write landing mid-load marks it dirty again
+        async with AsyncSessionLocal() as db:
+            countries = await self._load(db, Country)
+            regions = await self._load(db, Region, Region.country_id)
+            states = await self._load(db, State, State.region_id)
+            cities = await self._load(db, City, City.state_id)
+        self._snapshot = LocationSnapshot(countries, regions, states, cities)
+        return self._snapshot
+
+    @staticmethod
+    async def _load(db, model, parent_column=None) -> List[dict]:
+        columns = [model.id, model.name] + ([parent_column] if parent_column is not None else [])
+        result = await db.execute(
+            select(*columns).where(model.is_deleted.is_(False)).order_by(model.name)
+        )
+        key = parent_column.key if parent_column is not None else None
+        return [
+            {"id": str(row.id), "name": row.name, **({key: str(row[2]) if row[2] else None} if key else {})}
+            for row in result
+        ]
+
+
+location_tree = LocationTreeService(max_age=settings.LOCATION_TREE_MAX_AGE)
+
+
+@event.listens_for(Session, "after_flush")
+def _invalidate_location_tree(session, flush_context):
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, LOCATION_MODELS):
+            location_tree.mark_dirty()
+            return
@@ -0,0 +1,197 @@
+# app/services/progress_buffer.py
+"""
+Coalescing write buffer for reading/listening progress heartbeats.
+
+Readers report their position every few seconds. Each heartbeat is merged into one pending
+entry per (user, content) in this worker's memory - latest position wins, time spent is
+summed, completion is sticky - and every PROGRESS_FLUSH_INTERVAL seconds (or once
+PROGRESS_FLUSH_MAX_PENDING entries are waiting) all pending entries are written as
+multi-row INSERT ... ON CONFLICT DO UPDATE statements. A reader heartbeating every 10s for
+an hour sends 360 requests; with the 60s default interval they become at most 60 row
+writes, each sharing a statement and a commit with everyone else's pending entries.
+
+The same merge rules run in SQL, so several workers (each with its own buffer) and several
+devices converge: a position only replaces the stored one if it was received later.
+Reads overlay this worker's pending entry on the stored row, so a client sees its own
+latest position immediately; another worker's pending entry shows up after its next flush.
+Entries still pending when the process stops are flushed on shutdown (see main.py); a
+crash loses at most one interval of positions.
+
+PROGRESS_FLUSH_INTERVAL = 0 turns the buffer off: every heartbeat is upserted immediately.
+"""
+import asyncio
+import logging
+import uuid
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import case, func, or_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models.content import Content
+from app.models.user_progress import UserProgress
+from app.schemas.user_progress import ProgressHeartbeat
+
+logger = logging.getLogger(__name__)
+
+Key = Tuple[uuid.UUID, uuid.UUID]  # (user_id, content_id)
+
+# Fields that describe where the reader is; a heartbeat that omits one keeps the previous value
+POSITION_FIELDS = ("chapter_id", "section_id", "audio_position_seconds", "progress_percentage", "device_id")
+_UPSERT_CHUNK = 500
+
+
+def combine(stored: Optional[dict], newer: dict) -> dict:
+    """Merge a newer entry into an older one (either pending or stored) - the rules upsert() applies in SQL."""
+    if stored is None:
+        return dict(newer)
+    merged = dict(stored)
+    if newer["position_updated_at"] >= stored["position_updated_at"]:
+        for field in POSITION_FIELDS:
+            if newer.get(field) is not None:
+                merged[field] = newer[field]
+        merged["position_updated_at"] = newer["position_updated_at"]
+    merged["time_spent"] = (stored.get("time_spent") or 0) + (newer.get("time_spent") or 0)
+    merged["is_completed"] = bool(stored.get("is_completed") or newer.get("is_completed"))
+    merged["completion_date"] = stored.get("completion_date") or newer.get("completion_date")
+    return merged
+
+
+def heartbeat_entry(user_id: uuid.UUID, content_id: uuid.UUID, heartbeat: ProgressHeartbeat, received_at: datetime) -> dict:
+    return {
+        "user_id": user_id,
+        "content_id": content_id,
+        **{field: getattr(heartbeat, field) for field in POSITION_FIELDS},
+        "position_updated_at": received_at,
+        "time_spent": heartbeat.time_spent_delta,
+        "is_completed": heartbeat.is_completed,
+        "completion_date": received_at if heartbeat.is_completed else None,
+    }
+
+
+def _insert_for(db: AsyncSession):
+    return postgresql.insert if db.bind.dialect.name == "postgresql" else sqlite.insert
+
+
+async def upsert(db: AsyncSession, entries: List[dict]) -> int:
+    """
+    Write entries as multi-row upserts (the caller commits). Heartbeats are only accepted for
+    existing content; entries whose content row was removed before the flush are dropped
+    rather than failing the whole batch. Returns the number of rows written.
+    """
+    content_ids = {entry["content_id"] for entry in entries}
+    existing = set((await db.execute(select(Content.id).where(Content.id.in_(content_ids)))).scalars())
+    entries = [entry for entry in entries if entry["content_id"] in existing]
+    table = UserProgress.__table__
+    insert = _insert_for(db)
+    for start in range(0, len(entries), _UPSERT_CHUNK):
+        rows = [{"id": uuid.uuid4(), **entry} for entry in entries[start:start + _UPSERT_CHUNK]]
+        statement = insert(table).values(rows)
+        excluded = statement.excluded
+        newer = excluded.position_updated_at >= table.c.position_updated_at
+        position = {
+            field: case((newer, func.coalesce(excluded[field], table.c[field])), else_=table.c[field])
+            for field in POSITION_FIELDS
+        }
+        statement = statement.on_conflict_do_update(
+            index_elements=[table.c.user_id, table.c.content_id],
+            set_={
+                **position,
+                "position_updated_at": case((newer, excluded.position_updated_at), else_=table.c.position_updated_at),
+                "time_spent": table.c.time_spent + excluded.time_spent,
+                "is_completed": or_(table.c.is_completed, excluded.is_completed),
+                "completion_date": func.coalesce(table.c.completion_date, excluded.completion_date),
+                "updated_at": func.now(),
+            },
+        )
+        await db.execute(statement)
+    return len(entries)
+
+
+class ProgressBuffer:
+    def __init__(self, interval: float, max_pending: int):
+        self.interval = interval
+        self.max_pending = max_pending
+        self._pending: Dict[Key, dict] = {}
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._task: Optional[asyncio.Task] = None
+        self._flush_tasks: set = set()
+        self.metrics = {"heartbeats": 0, "flushes": 0, "rows_written": 0, "failures": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.interval > 0
+
+    async def record(self, db: AsyncSession, entry: dict) -> None:
+        """Buffer a heartbeat entry (or, with the buffer disabled, upsert it right away)."""
+        self.metrics["heartbeats"] += 1
+        if not self.enabled:
+            self.metrics["rows_written"] += await upsert(db, [entry])
+            await db.commit()
+            return
+        key = (entry["user_id"], entry["content_id"])
+        self._pending[key] = combine(self._pending.get(key), entry)
+        self._ensure_running()
+        if len(self._pending) >= self.max_pending:
+            task = asyncio.create_task(self.flush())
+            self._flush_tasks.add(task)  # Keep a reference until done; the loop only holds weak refs
+            task.add_done_callback(self._flush_tasks.discard)
+
+    def pending(self, user_id: uuid.UUID, content_id: uuid.UUID) -> Optional[dict]:
+        return self._pending.get((user_id, content_id))
+
+    def pending_for_user(self, user_id: uuid.UUID) -> List[dict]:
+        return [entry for (owner, _), entry in self._pending.items() if owner == user_id]
+
+    def discard(self, user_id: uuid.UUID, content_id: uuid.UUID) -> None:
+        self._pending.pop((user_id, content_id), None)
+
+    async def flush(self) -> int:
+        """Write everything pending in one transaction; on failure the entries go back into the buffer."""
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+            batch, self._pending = self._pending, {}
+            try:
+                async with AsyncSessionLocal() as db:
+                    written = await upsert(db, list(batch.values()))
+                    await db.commit()
+            except Exception:
+                self.metrics["failures"] += 1
+                logger.warning("Progress flush of %d entries failed, retrying next interval", len(batch), exc_info=True)
+                for key, entry in batch.items():
+                    # Anything received during the failed flush is newer than the batch
+                    newer = self._pending.get(key)
+                    self._pending[key] = combine(entry, newer) if newer else entry
+                return 0
+            self.metrics["flushes"] += 1
+            self.metrics["rows_written"] += written
+            return written
+
+    def _ensure_running(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.flush()
+
+    async def close(self) -> None:
+        """Stop the periodic flush and write what is left (application shutdown)."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        await self.flush()
+
+    def snapshot(self) -> dict:
+        return {**self.metrics, "pending": len(self._pending)}
+
+
+progress_buffer = ProgressBuffer(settings.PROGRESS_FLUSH_INTERVAL, settings.PROGRESS_FLUSH_MAX_PENDING)
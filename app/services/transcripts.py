@@ -0,0 +1,49 @@
+# app/services/transcripts.py
+"""
+Timed transcripts for audio/video chapters.
+
+A transcript is stored as TranscriptSegment rows - one per cue, with start/end seconds -
+so search hits map to a seek position and players can fetch the text around the current
+time without reading the whole transcript. Segments are replaced as a whole, from JSON or
+from a WebVTT / SRT caption file, and their text joined with newlines is also written to
+BookChapter.transcript, which the chapter response, reading statistics and offline
+bundles keep using.
+"""
+import re
+from typing import List
+
+from app.schemas.transcript import TranscriptSegmentIn
+
+CAPTION_FORMATS = (".vtt", ".srt")
+
+# 01:02:03.456, 01:02:03,456 (SRT) or 02:03.456 (WebVTT without hours)
+_TIMESTAMP = r"(?:(\d+):)?(\d{1,2}):(\d{2})[.,](\d{1,3})"
+_CUE_TIMING = re.compile(rf"^\s*{_TIMESTAMP}\s*-->\s*{_TIMESTAMP}")
+_TAG = re.compile(r"<[^>]+>")
+
+
+def _seconds(hours, minutes, seconds, fraction) -> float:
+    return int(hours or 0) * 3600 + int(minutes) * 60 + int(seconds) + int(fraction.ljust(3, "0")) / 1000
+
+
+def parse_captions(text: str) -> List[TranscriptSegmentIn]:
+    """
+    Cues of a WebVTT or SRT file, in file order. Cue identifiers, NOTE/STYLE blocks and
+    inline tags (<v Speaker>, <i>, ...) are dropped; a cue's lines are joined with spaces.
+    """
+    segments: List[TranscriptSegmentIn] = []
+    for block in re.split(r"\r?\n\s*\r?\n", text.lstrip("\ufeff")):
+        lines = block.strip().splitlines()
+        for position, line in enumerate(lines):
+            timing = _CUE_TIMING.match(line)
+            if timing:
+                cue_text = " ".join(_TAG.sub("", part).strip() for part in lines[position + 1:])
+                if cue_text.strip():
+                    groups = timing.groups()
+                    segments.append(TranscriptSegmentIn(
+                        start_seconds=_seconds(*groups[:4]), end_seconds=_seconds(*groups[4:]), text=cue_text.strip()
+                    ))
+                break
+    if not segments:
+        raise ValueError("No timed cues found; expected a WebVTT or SRT file")
+    return segments
@@ -0,0 +1,39 @@
+# app/utils/batch_ids.py
+"""
+Batch gets: `?ids=a,b,c` on the /batch endpoints of books, stories, teachings, places and temples.
+
+A client that holds a list of ids (a collection, a saved list, a pilgrimage route) fetches
+them in one request backed by one `IN (...)` query, instead of one detail request each.
+Items come back in the order the ids were asked for; ids with no live item are listed
+under `missing` rather than failing the request. At most BATCH_GET_MAX_IDS ids per request.
+"""
+from typing import List
+from uuid import UUID
+
+from fastapi import HTTPException, status
+
+from app.config import settings
+
+IDS_QUERY_DESCRIPTION = f"Comma-separated ids to fetch, at most {settings.BATCH_GET_MAX_IDS}"
+
+
+def parse_ids(ids: str) -> List[UUID]:
+    """The requested ids, in order and without repeats; 400 if one isn't a UUID or there are too many."""
+    parsed = []
+    for raw in ids.split(","):
+        raw = raw.strip()
+        if not raw:
+            continue
+        try:
+            parsed.append(UUID(raw))
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid id: {raw!r}")
+    parsed = list(dict.fromkeys(parsed))
+    if not parsed:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No ids given")
+    if len(parsed) > settings.BATCH_GET_MAX_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.BATCH_GET_MAX_IDS} ids per request (got {len(parsed)})",
+        )
+    return parsed
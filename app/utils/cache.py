@@ -0,0 +1,380 @@
+# app/utils/cache.py
+"""
+Response cache for read-heavy endpoints.
+
+Cached bodies are the final JSON bytes of a response, keyed by route + normalized
+query params + visibility scope, and tagged with the entity ids they were built
+from. CRUD writes invalidate by tag (see CRUDBase.invalidate_cache), so admins
+never see stale content after an edit.
+"""
+import asyncio
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Set, Tuple, Union
+from urllib.parse import urlencode
+
+from fastapi import Request, Response
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models.user import UserRole
+from app.utils.serialization import json_dumps
+
+logger = logging.getLogger(__name__)
+
+TagsType = Union[Iterable[str], Callable[[Any], Iterable[str]]]
+Producer = Callable[[AsyncSession], Awaitable[Any]]
+
+
+def entity_tag(table: str, id: Any = None) -> str:
+    """`content` for the whole table, `content:<id>` for a single row."""
+    return table if id is None else f"{table}:{id}"
+
+
+def visibility_scope(user: Any = None) -> str:
+    """Admins can see drafts, so their cached pages must never be shared with other users."""
+    if user is not None and getattr(user, "role", None) == UserRole.ADMIN.value:
+        return "admin"
+    return "public"
+
+
+class CacheBackend:
+    async def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: bytes, ttl: int, tags: Iterable[str]) -> None:
+        raise NotImplementedError
+
+    async def invalidate_tags(self, tags: Iterable[str]) -> None:
+        raise NotImplementedError
+
+    async def clear(self) -> None:
+        raise NotImplementedError
+
+
+class InMemoryLRUBackend(CacheBackend):
+    """Per-process LRU. Fine for a single worker or for tests; use Redis with several workers."""
+
+    def __init__(self, max_entries: int = 2048):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[bytes, float, Tuple[str, ...]]]" = OrderedDict()
+        self._tag_index: Dict[str, Set[str]] = {}
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at, _ = entry
+        if expires_at <= time.monotonic():
+            self._drop(key)
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: int, tags: Iterable[str]) -> None:
+        self._drop(key)
+        tags = tuple(tags)
+        self._entries[key] = (value, time.monotonic() + ttl, tags)
+        for tag in tags:
+            self._tag_index.setdefault(tag, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._drop(next(iter(self._entries)))
+
+    async def invalidate_tags(self, tags: Iterable[str]) -> None:
+        for tag in tags:
+            for key in self._tag_index.pop(tag, set()):
+                self._drop(key)
+
+    async def clear(self) -> None:
+        self._entries.clear()
+        self._tag_index.clear()
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[2]:
+            keys = self._tag_index.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tag_index[tag]
+
+
+class RedisBackend(CacheBackend):
+    """
+    Shared cache over the Redis protocol. Each tag is a Redis set of the keys carrying it.
+    Any client exposing the redis.asyncio API works (e.g. a fakeredis instance in tests).
+    """
+
+    TAG_SET_TTL = 24 * 60 * 60  # Tag sets outlive their members; deleting an expired key is a no-op
+
+    def __init__(self, client: Any, prefix: str = "cache"):
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisBackend":
+        import redis.asyncio as redis  # Only needed when the redis backend is configured
+        return cls(redis.from_url(url))
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.prefix}:tag:{tag}"
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.client.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: int, tags: Iterable[str]) -> None:
+        pipe = self.client.pipeline(transaction=False)
+        pipe.set(key, value, ex=ttl)
+        for tag in tags:
+            tag_key = self._tag_key(tag)
+            pipe.sadd(tag_key, key)
+            pipe.expire(tag_key, self.TAG_SET_TTL)
+        await pipe.execute()
+
+    async def invalidate_tags(self, tags: Iterable[str]) -> None:
+        tag_keys = [self._tag_key(tag) for tag in tags]
+        if not tag_keys:
+            return
+        keys: Set[Any] = set()
+        for tag_key in tag_keys:
+            keys.update(await self.client.smembers(tag_key))
+        await self.client.delete(*keys, *tag_keys)
+
+    async def clear(self) -> None:
+        async for key in self.client.scan_iter(match=f"{self.prefix}:*"):
+            await self.client.delete(key)
+
+
+class CacheMetrics:
+    """Per-process counters; exposed on /health/cache."""
+
+    FIELDS = ("hits", "misses", "stale_serves", "coalesced_waiters", "refreshes", "refresh_failures")
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        for name in self.FIELDS:
+            setattr(self, name, 0)
+
+    def snapshot(self) -> Dict[str, int]:
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+
+class ResponseCache:
+    """
+    Entries are stored for `ttl + stale_ttl` seconds. Inside `ttl` they are served as HIT; during the
+    stale window they are served as STALE while a single background task rebuilds them. Concurrent
+    misses for the same key in this process wait on one producer call instead of each querying the DB.
+    """
+
+    def __init__(
+        self,
+        backend: CacheBackend,
+        *,
+        default_ttl: int = 300,
+        stale_ttl: int = 60,
+        enabled: bool = True,
+        namespace: str = "cache",
+    ):
+        self.backend = backend
+        self.default_ttl = default_ttl
+        self.stale_ttl = stale_ttl
+        self.enabled = enabled
+        self.namespace = namespace
+        self.metrics = CacheMetrics()
+        self._inflight: Dict[str, "asyncio.Future[bytes]"] = {}
+        self._refreshing: Set[str] = set()
+        self._refresh_tasks: Set["asyncio.Task[Any]"] = set()
+        self._generation = 0  # Bumped on every invalidation so in-flight builds don't re-store old data
+
+    def build_key(self, request: Request, scope: str = "public", version: Optional[str] = None) -> str:
+        """
+        Route + normalized query params (sorted, empty values dropped) + visibility scope.
+        Routes that send an ETag pass it as `version`, so a body is never served under another version's tag.
+        """
+        params = sorted((k, v) for k, v in request.query_params.multi_items() if v != "")
+        raw = f"{request.method}:{request.url.path}?{urlencode(params)}|{scope}|{version or ''}"
+        return f"{self.namespace}:{hashlib.sha1(raw.encode('utf-8')).hexdigest()}"
+
+    def entity_key(self, kind: str, id: Any, scope: str = "public", version: Optional[str] = None) -> str:
+        """
+        Key for a single-entity response by primary key, so the id and slug URLs of the same row
+        share one entry. `version` (the ETag) must cover every query param that shapes the body.
+        """
+        return f"{self.namespace}:{kind}:{id}|{scope}|{version or ''}"
+
+    @staticmethod
+    def encode(payload: Any) -> bytes:
+        if isinstance(payload, (bytes, bytearray)):
+            return bytes(payload)
+        if isinstance(payload, BaseModel):
+            return payload.model_dump_json().encode("utf-8")
+        return json_dumps(payload)
+
+    async def get_or_set(
+        self,
+        key: str,
+        producer: Producer,
+        *,
+        db: AsyncSession,
+        tags: TagsType,
+        ttl: Optional[int] = None,
+    ) -> Response:
+        """
+        Return the cached body for `key`, or run `producer(db)`, cache its encoded result and return it.
+        The producer takes the session as an argument because stale refreshes run after the request's
+        own session is closed and get a fresh one. `tags` may be a callable receiving the produced
+        payload, for entries whose ids are only known after the fetch (e.g. a detail route addressed by slug).
+        """
+        body, status = await self.get_or_set_body(key, producer, db=db, tags=tags, ttl=ttl)
+        return self._response(body, status)
+
+    async def get_or_set_body(
+        self,
+        key: str,
+        producer: Producer,
+        *,
+        db: AsyncSession,
+        tags: TagsType,
+        ttl: Optional[int] = None,
+    ) -> Tuple[bytes, str]:
+        """Same as get_or_set, but returns the raw (body, HIT/STALE/MISS) for callers composing larger payloads."""
+        if not self.enabled:
+            return self.encode(await producer(db)), "MISS"
+
+        ttl = ttl or self.default_ttl
+        raw = await self._safe_get(key)
+        if raw is not None:
+            fresh_until, body = self._unpack(raw)
+            if fresh_until > time.time():
+                self.metrics.hits += 1
+                return body, "HIT"
+            self.metrics.stale_serves += 1
+            self._schedule_refresh(key, producer, tags, ttl)
+            return body, "STALE"
+
+        self.metrics.misses += 1
+        body = await self._coalesced(key, lambda: self._build_and_store(key, producer, db, tags, ttl))
+        return body, "MISS"
+
+    async def invalidate_tags(self, tags: Iterable[str]) -> None:
+        tags = [tag for tag in tags if tag]
+        if not tags:
+            return
+        self._generation += 1
+        try:
+            await self.backend.invalidate_tags(tags)
+        except Exception:  # Cache outages must never fail a write
+            logger.exception("Response cache invalidation failed for tags %s", tags)
+
+    async def clear(self) -> None:
+        self._generation += 1
+        await self.backend.clear()
+
+    async def _coalesced(self, key: str, build: Callable[[], Awaitable[bytes]]) -> bytes:
+        """Run `build` once per key; callers arriving while it runs share its result (or exception)."""
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.metrics.coalesced_waiters += 1
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise  # This waiter itself was cancelled
+                return await build()  # The leader was cancelled; don't fail the waiters with it
+
+        future: "asyncio.Future[bytes]" = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            body = await build()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            future.exception()  # Mark retrieved so an unwaited future doesn't log a warning
+            raise
+        else:
+            future.set_result(body)
+            return body
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _build_and_store(
+        self, key: str, producer: Producer, db: AsyncSession, tags: TagsType, ttl: int
+    ) -> bytes:
+        generation = self._generation
+        payload = await producer(db)
+        body = self.encode(payload)
+        if generation == self._generation:
+            resolved_tags = tags(payload) if callable(tags) else tags
+            await self._safe_set(key, self._pack(body, time.time() + ttl), ttl + self.stale_ttl, resolved_tags)
+        return body
+
+    def _schedule_refresh(self, key: str, producer: Producer, tags: TagsType, ttl: int) -> None:
+        if key in self._refreshing or key in self._inflight:
+            return  # A refresh (or a cold build) for this key is already running
+        self._refreshing.add(key)
+
+        async def refresh() -> None:
+            try:
+                async with AsyncSessionLocal() as session:
+                    await self._coalesced(key, lambda: self._build_and_store(key, producer, session, tags, ttl))
+                self.metrics.refreshes += 1
+            except Exception:
+                # e.g. the row was deleted (404) - the stale entry simply ages out
+                self.metrics.refresh_failures += 1
+                logger.warning("Background refresh failed for %s", key, exc_info=True)
+            finally:
+                self._refreshing.discard(key)
+
+        task = asyncio.create_task(refresh())
+        self._refresh_tasks.add(task)  # Keep a reference until done; the loop only holds weak refs
+        task.add_done_callback(self._refresh_tasks.discard)
+
+    @staticmethod
+    def _pack(body: bytes, fresh_until: float) -> bytes:
+        return f"{fresh_until:.3f}".encode("ascii") + b"\n" + body
+
+    @staticmethod
+    def _unpack(raw: bytes) -> Tuple[float, bytes]:
+        head, _, body = raw.partition(b"\n")
+        return float(head), body
+
+    async def _safe_get(self, key: str) -> Optional[bytes]:
+        try:
+            return await self.backend.get(key)
+        except Exception:
+            logger.exception("Response cache read failed")
+            return None
+
+    async def _safe_set(self, key: str, body: bytes, ttl: int, tags: Iterable[str]) -> None:
+        try:
+            await self.backend.set(key, body, ttl, tags)
+        except Exception:
+            logger.exception("Response cache write failed")
+
+    @staticmethod
+    def _response(body: bytes, status: str) -> Response:
+        return Response(content=body, media_type="application/json", headers={"X-Cache": status})
+
+
+def _build_backend() -> CacheBackend:
+    if settings.CACHE_BACKEND == "redis" and settings.CACHE_REDIS_URL:
+        return RedisBackend.from_url(settings.CACHE_REDIS_URL)
+    return InMemoryLRUBackend(max_entries=settings.CACHE_MAX_ENTRIES)
+
+
+response_cache = ResponseCache(
+    _build_backend(),
+    default_ttl=settings.CACHE_DEFAULT_TTL,
+    stale_ttl=settings.CACHE_STALE_TTL,
+    enabled=settings.CACHE_ENABLED,
+)
@@ -0,0 +1,112 @@
+# app/utils/compressed_text.py
+"""
+Compressed storage for long text columns (section bodies, transcripts, article text).
+
+CompressedText is a TypeDecorator over a binary column: str in, str out, so models,
+schemas and routes don't change. Values are stored as:
+
+    plain UTF-8 bytes                 short values (< COMPRESSED_TEXT_MIN_SIZE)
+    b"\\xff" + zlib stream             default codec
+    b"\\xfe" + zstd frame              when the optional `zstandard` package is installed;
+                                      with a trained dictionary if COMPRESSED_TEXT_ZSTD_DICTS is set
+
+0xFF/0xFE never occur in UTF-8, so the marker byte can't be confused with text and
+a column converted in place with convert_to(col, 'UTF8') reads back correctly before
+its rows are re-encoded (see app/scripts/compress_text_columns.py).
+
+Decoding happens only when the column is actually selected, so the narrow queries
+(TOC, list pages, sparse fieldsets) never pay for it.
+
+Models opt in through LongText, which is plain Text unless COMPRESSED_TEXT_COLUMNS is
+on - the flag must match the column types in the database, so flip it only together
+with the migration script.
+"""
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+import zlib
+
+from sqlalchemy import LargeBinary, Text
+from sqlalchemy.types import TypeDecorator
+
+from app.config import settings
+
+try:
+    import zstandard  # Optional: pip install zstandard
+except ImportError:
+    zstandard = None
+
+ZLIB_MARKER = b"\xff"
+ZSTD_MARKER = b"\xfe"
+
+
+@lru_cache(maxsize=None)
+def _zstd_dictionaries() -> Tuple[Optional["zstandard.ZstdCompressionDict"], Dict[int, "zstandard.ZstdCompressionDict"]]:
+    """(dictionary used for writes, every configured dictionary by dict_id for reads)."""
+    paths = [path.strip() for path in settings.COMPRESSED_TEXT_ZSTD_DICTS.split(",") if path.strip()]
+    if zstandard is None or not paths:
+        return None, {}
+    dictionaries = []
+    for path in paths:
+        with open(path, "rb") as fh:
+            dictionaries.append(zstandard.ZstdCompressionDict(fh.read()))
+    return dictionaries[0], {dictionary.dict_id(): dictionary for dictionary in dictionaries}
+
+
+@lru_cache(maxsize=None)
+def _zstd_compressor() -> "zstandard.ZstdCompressor":
+    write_dict, _ = _zstd_dictionaries()
+    return zstandard.ZstdCompressor(level=settings.COMPRESSED_TEXT_ZSTD_LEVEL, dict_data=write_dict)
+
+
+@lru_cache(maxsize=None)
+def _zstd_decompressor(dict_id: int) -> "zstandard.ZstdDecompressor":
+    if dict_id == 0:
+        return zstandard.ZstdDecompressor()
+    _, dictionaries = _zstd_dictionaries()
+    if dict_id not in dictionaries:
+        raise ValueError(f"zstd dictionary {dict_id} is not in COMPRESSED_TEXT_ZSTD_DICTS")
+    return zstandard.ZstdDecompressor(dict_data=dictionaries[dict_id])
+
+
+def compress_text(value: str) -> bytes:
+    raw = value.encode("utf-8")
+    if len(raw) < settings.COMPRESSED_TEXT_MIN_SIZE:
+        return raw
+    if zstandard is not None:
+        return ZSTD_MARKER + _zstd_compressor().compress(raw)
+    return ZLIB_MARKER + zlib.compress(raw, settings.COMPRESSED_TEXT_ZLIB_LEVEL)
+
+
+def decompress_text(data: bytes) -> str:
+    data = bytes(data)  # asyncpg/psycopg2 may hand back memoryview
+    marker = data[:1]
+    if marker == ZLIB_MARKER:
+        return zlib.decompress(data[1:]).decode("utf-8")
+    if marker == ZSTD_MARKER:
+        if zstandard is None:
+            raise RuntimeError("zstd-compressed text found but the zstandard package is not installed")
+        frame = data[1:]
+        return _zstd_decompressor(zstandard.get_frame_parameters(frame).dict_id).decompress(frame).decode("utf-8")
+    return data.decode("utf-8")
+
+
+class CompressedText(TypeDecorator):
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return None if value is None else compress_text(value)
+
+    def process_result_value(self, value, dialect):
+        return None if value is None else decompress_text(value)
+
+
+LongText = CompressedText if settings.COMPRESSED_TEXT_COLUMNS else Text
+
+# (table, column) pairs declared with LongText, for the migration script and the benchmark
+COMPRESSED_COLUMNS = (
+    ("book_sections", "body"),
+    ("book_chapters", "transcript"),
+    ("content", "content"),
+    ("lost_heritage", "article_content"),
+)
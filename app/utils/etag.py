@@ -0,0 +1,30 @@
+# app/utils/etag.py
+"""
+Strong ETags for detail endpoints.
+
+Routes compute the tag from a narrow "version" query (ids + updated_at, plus child
+aggregates where the payload embeds children), so a matching If-None-Match can be
+answered with 304 before the heavy columns are loaded or anything is serialized.
+"""
+import hashlib
+from typing import Any
+
+from fastapi import Request, Response
+
+
+def make_etag(*parts: Any) -> str:
+    raw = "|".join("" if part is None else str(part) for part in parts)
+    return '"' + hashlib.sha1(raw.encode("utf-8")).hexdigest() + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """If-None-Match uses weak comparison, so a W/ prefix added by a proxy still matches."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = [c.strip() for c in header.split(",")]
+    return "*" in candidates or any(c.removeprefix("W/") == etag for c in candidates)
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag})
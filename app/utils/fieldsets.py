@@ -0,0 +1,83 @@
+# app/utils/fieldsets.py
+"""
+Sparse fieldsets: `?fields=id,title,slug` on list and detail endpoints.
+
+Each router declares a FieldSet for its response schema. The allowlist is the
+schema fields that map to a column of the model, plus any derived fields the
+router fills in itself (book_format, category_name, place_name) together with the
+columns they are computed from. The selection narrows both sides:
+
+- CRUD queries apply `load_only(...)` with FieldSet.columns(), so unused columns
+  (descriptions, bodies, SEO fields) are never fetched;
+- the payload is validated/serialized with a narrowed copy of the schema, so
+  only the selected attributes are read and encoded.
+
+`id` is always returned. No `fields` means the full schema, as before.
+"""
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple, Type
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel, ConfigDict, create_model
+from sqlalchemy import inspect
+
+FIELDS_QUERY_DESCRIPTION = "Comma-separated subset of fields to return, e.g. id,title,slug"
+
+Selection = Optional[FrozenSet[str]]
+
+
+@lru_cache(maxsize=256)
+def _narrowed_schema(schema: Type[BaseModel], selection: FrozenSet[str]) -> Type[BaseModel]:
+    fields = {name: (schema.model_fields[name].annotation, schema.model_fields[name]) for name in sorted(selection)}
+    return create_model(
+        f"{schema.__name__}Sparse", __config__=ConfigDict(from_attributes=True), **fields
+    )
+
+
+class FieldSet:
+    def __init__(
+        self,
+        schema: Type[BaseModel],
+        model,
+        *,
+        derived: Optional[Dict[str, Tuple[str, ...]]] = None,
+        always: Iterable[str] = ("id",),
+    ):
+        self.schema = schema
+        self.derived = derived or {}
+        self.always = frozenset(always)
+        columns = set(inspect(model).column_attrs.keys())
+        self.allowed = frozenset(
+            name for name in schema.model_fields if name in columns or name in self.derived
+        )
+
+    def parse(self, fields: Optional[str]) -> Selection:
+        """Validate a raw `fields` query value; None means "everything"."""
+        if not fields:
+            return None
+        requested = {name.strip() for name in fields.split(",") if name.strip()}
+        unknown = requested - self.allowed
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown field(s): {', '.join(sorted(unknown))}. Allowed: {', '.join(sorted(self.allowed))}",
+            )
+        return frozenset(requested | self.always)
+
+    def columns(self, selection: Selection) -> Optional[List[str]]:
+        """Model columns to load for the selection (derived fields pull in their source columns)."""
+        if selection is None:
+            return None
+        columns = set()
+        for name in selection:
+            columns.update(self.derived.get(name, (name,)))
+        return sorted(columns)
+
+    def schema_for(self, selection: Selection) -> Type[BaseModel]:
+        if selection is None:
+            return self.schema
+        return _narrowed_schema(self.schema, selection)
+
+    @staticmethod
+    def wants(selection: Selection, name: str) -> bool:
+        return selection is None or name in selection
@@ -0,0 +1,88 @@
+# app/utils/file_ranges.py
+"""
+Serving a local file with HTTP Range support (single byte ranges).
+
+starlette's FileResponse in the pinned version ignores Range, so a mobile client that
+lost its connection half way through a large download had to start over. Multiple
+ranges in one request are answered with the whole file, which RFC 9110 allows.
+"""
+import os
+import re
+from typing import BinaryIO, Iterator, Optional, Tuple
+
+from fastapi import Request, Response
+from fastapi.responses import StreamingResponse
+
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+_CHUNK_SIZE = 64 * 1024
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    (first, last) byte positions, inclusive, for a single-range header; None for no/ignored Range.
+    Raises ValueError for a syntactically valid range that lies outside the file (-> 416).
+    """
+    match = _RANGE.match((header or "").replace(" ", ""))
+    if not match or match.group(1) == match.group(2) == "":
+        return None
+    first, last = match.group(1), match.group(2)
+    if first == "":
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            raise ValueError("empty suffix range")
+        return max(0, size - length), size - 1
+    first = int(first)
+    last = min(int(last), size - 1) if last else size - 1
+    if first >= size or first > last:
+        raise ValueError("range not satisfiable")
+    return first, last
+
+
+def _read(fh: BinaryIO, first: int, length: int) -> Iterator[bytes]:
+    with fh:
+        fh.seek(first)
+        while length > 0:
+            chunk = fh.read(min(_CHUNK_SIZE, length))
+            if not chunk:
+                return
+            length -= len(chunk)
+            yield chunk
+
+
+def range_file_response(
+    request: Request, path: str, *, media_type: str, etag: str, filename: Optional[str] = None, max_age: int = 0
+) -> Response:
+    """
+    200 with the whole file, 206 with the requested range, or 416.
+    The file is opened once, up front, and streamed from that handle, so it may be replaced or
+    deleted once this returns. Raises FileNotFoundError (OSError) if it is already gone.
+    """
+    fh = open(path, "rb")
+    try:
+        size = os.fstat(fh.fileno()).st_size
+    except OSError:
+        fh.close()
+        raise
+    headers = {"Accept-Ranges": "bytes", "ETag": etag, "Cache-Control": f"private, max-age={max_age}"}
+    if filename:
+        headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+
+    byte_range = None
+    if_range = request.headers.get("if-range")
+    # If-Range: resume only if the client's partial copy is of this exact version
+    if if_range is None or if_range.strip() == etag:
+        try:
+            byte_range = parse_range(request.headers.get("range"), size)
+        except ValueError:
+            fh.close()
+            headers["Content-Range"] = f"bytes */{size}"
+            return Response(status_code=416, headers=headers)
+
+    if byte_range is None:
+        headers["Content-Length"] = str(size)
+        return StreamingResponse(_read(fh, 0, size), media_type=media_type, headers=headers)
+    first, last = byte_range
+    headers["Content-Range"] = f"bytes {first}-{last}/{size}"
+    headers["Content-Length"] = str(last - first + 1)
+    return StreamingResponse(_read(fh, first, last - first + 1), status_code=206, media_type=media_type, headers=headers)
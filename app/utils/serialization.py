@@ -0,0 +1,116 @@
+# app/utils/serialization.py
+"""
+orjson-backed JSON encoding shared by the API responses and the response cache.
+
+FastAPI runs every return value through the response_model (or jsonable_encoder)
+before rendering, so by the time render() is called UUIDs, datetimes, enums and
+HttpUrls are already plain JSON types. orjson handles those natively anyway;
+the default hook below only covers what it doesn't (Decimal, sets, pydantic
+models/Urls in hand-built dicts).
+"""
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Iterable, List, Optional, Tuple, Type
+
+import orjson
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, TypeAdapter
+
+from app.schemas.batch import BatchGetResponse
+from app.schemas.pagination import PaginatedResponse
+
+# Non-str keys: chat `messages` and other JSON columns come back as arbitrary dicts
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    # HttpUrl and anything else pydantic/FastAPI know how to encode
+    return jsonable_encoder(value)
+
+
+def json_dumps(value: Any) -> bytes:
+    """Compact UTF-8 JSON bytes."""
+    return orjson.dumps(value, default=_default, option=ORJSON_OPTIONS)
+
+
+class ORJSONResponse(JSONResponse):
+    """Default response class for the app (see FastAPI(default_response_class=...))."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return json_dumps(content)
+
+
+# --- List/page bodies: one TypeAdapter pass from ORM rows straight to JSON bytes ---
+#
+# Routes used to model_validate every row in a loop, wrap the result in
+# PaginatedResponse[...] and let FastAPI validate it all over again against
+# response_model. These helpers validate once (from_attributes) and return bytes;
+# routes return them in a Response (or from a response_cache producer), which
+# FastAPI passes through untouched. response_model stays on the route for the docs.
+
+@lru_cache(maxsize=None)
+def _adapter(schema: Any) -> TypeAdapter:
+    return TypeAdapter(schema)
+
+
+def page_links(request: Request, skip: int, limit: int, total_count: int) -> Tuple[Optional[str], Optional[str]]:
+    """next_page / prev_page URLs, keeping the rest of the query string."""
+    next_page = prev_page = None
+    if (skip + limit) < total_count:
+        next_page = str(request.url.include_query_params(skip=skip + limit, limit=limit))
+    if skip > 0:
+        prev_page = str(request.url.include_query_params(skip=max(0, skip - limit), limit=limit))
+    return next_page, prev_page
+
+
+def list_body(schema: Type[BaseModel], items: Iterable[Any]) -> bytes:
+    """JSON array of `schema` built from ORM objects (or dicts)."""
+    adapter = _adapter(List[schema])
+    return adapter.dump_json(adapter.validate_python(list(items), from_attributes=True))
+
+
+def paginated_body(
+    schema: Type[BaseModel],
+    items: Iterable[Any],
+    *,
+    total_count: int,
+    skip: int,
+    limit: int,
+    request: Optional[Request] = None,
+) -> bytes:
+    """PaginatedResponse[schema] body; next/prev links are filled in when `request` is given."""
+    next_page, prev_page = page_links(request, skip, limit, total_count) if request is not None else (None, None)
+    adapter = _adapter(PaginatedResponse[schema])
+    page = adapter.validate_python(
+        {
+            "total_count": total_count, "limit": limit, "skip": skip,
+            "next_page": next_page, "prev_page": prev_page, "items": list(items),
+        },
+        from_attributes=True,
+    )
+    return adapter.dump_json(page)
+
+
+def batch_body(schema: Type[BaseModel], ids: Iterable[Any], items: Iterable[Any]) -> bytes:
+    """BatchGetResponse[schema] body: `items` (already in request order) and the `ids` none of them has."""
+    items = list(items)
+    found = {item.id for item in items}
+    adapter = _adapter(BatchGetResponse[schema])
+    batch = adapter.validate_python(
+        {"items": items, "missing": [id for id in ids if id not in found]}, from_attributes=True
+    )
+    return adapter.dump_json(batch)
+
+
+def json_bytes_response(body: bytes, status_code: int = 200) -> Response:
+    return Response(content=body, status_code=status_code, media_type="application/json")
@@ -0,0 +1,63 @@
+# app/utils/slug_cache.py
+"""
+Per-process slug -> id map for the `{id_or_slug}` detail routes (CRUDBase.resolve_id).
+
+A cached slug lets the route go straight to primary-key lookups and the id-keyed response
+cache entry, skipping the slug index. Entries are dropped by CRUDBase.invalidate_cache() -
+every update (including slug changes) and delete already goes through it - and expire after
+SLUG_CACHE_TTL, which bounds how long a slug renamed through another worker keeps resolving
+here. Only found slugs are cached, so a new slug is visible immediately.
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from app.config import settings
+
+Key = Tuple[str, str]  # (table, slug)
+
+
+class SlugCache:
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Key, Tuple[Any, float]]" = OrderedDict()  # -> (id, expires_at)
+        self._slugs: Dict[Tuple[str, Any], str] = {}  # (table, id) -> slug, for invalidation by id
+        self.metrics = {"hits": 0, "misses": 0}
+
+    def get(self, table: str, slug: str) -> Optional[Any]:
+        entry = self._entries.get((table, slug))
+        if entry is None or entry[1] < time.monotonic():
+            if entry is not None:
+                self._drop((table, slug))
+            self.metrics["misses"] += 1
+            return None
+        self._entries.move_to_end((table, slug))
+        self.metrics["hits"] += 1
+        return entry[0]
+
+    def set(self, table: str, slug: str, id: Any) -> None:
+        self.forget(table, id)
+        self._entries[(table, slug)] = (id, time.monotonic() + self.ttl)
+        self._slugs[(table, id)] = slug
+        while len(self._entries) > self.max_entries:
+            self._drop(next(iter(self._entries)))
+
+    def forget(self, table: str, id: Any) -> None:
+        slug = self._slugs.pop((table, id), None)
+        if slug is not None:
+            self._entries.pop((table, slug), None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._slugs.clear()
+
+    def _drop(self, key: Key) -> None:
+        id, _ = self._entries.pop(key)
+        self._slugs.pop((key[0], id), None)
+
+    def snapshot(self) -> Dict[str, int]:
+        return {**self.metrics, "entries": len(self._entries)}
+
+
+slug_cache = SlugCache(settings.SLUG_CACHE_MAX_ENTRIES, settings.SLUG_CACHE_TTL)
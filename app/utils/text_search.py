@@ -0,0 +1,127 @@
+# app/utils/text_search.py
+"""
+Full-text search over book sections.
+
+BookSection.search_vector holds the section's title and body as a PostgreSQL tsvector,
+computed on write from the text the application already has in hand: SearchVector
+wraps the bound value in to_tsvector(BOOK_SEARCH_CONFIG, ...). It can't be a generated
+column over `body`, which is bytea when COMPRESSED_TEXT_COLUMNS is on. A GIN index on it
+makes a lookup cost proportional to the number of matches, not to the book's length.
+
+Snippets are cut in Python from the bodies of the returned page only (so they work with
+compressed bodies too): the window of BOOK_SEARCH_SNIPPET_WORDS words holding the most
+query terms, HTML-escaped, with matches wrapped in <mark>.
+
+Transcript segments (TranscriptSegment.search_vector) are indexed the same way.
+
+Other databases (the sqlite dev setup) store the lowercased text instead and match each
+term with LIKE, unranked.
+"""
+import html
+import re
+from typing import Any, List, Optional, Tuple
+
+from sqlalchemy import Text, cast, func, literal
+from sqlalchemy.dialects.postgresql import REGCONFIG, TSVECTOR
+from sqlalchemy.types import TypeDecorator
+
+from app.config import settings
+
+# Stripped from both ends of a word before comparing it with a query term
+_PUNCTUATION = "\"'`.,;:!?()[]{}<>-–—_/\\|*#“”‘’।॥"
+_WORD = re.compile(r"\S+")
+
+
+class SearchVector(TypeDecorator):
+    """Takes plain text on write; stored as a tsvector on PostgreSQL, lowercased text elsewhere. Never read back."""
+    impl = Text
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(TSVECTOR())
+        return dialect.type_descriptor(Text())
+
+    def bind_expression(self, bindvalue):
+        if isinstance(self.impl_instance, TSVECTOR):
+            return func.to_tsvector(search_config(), bindvalue)
+        return bindvalue
+
+    def process_bind_param(self, value, dialect):
+        if value is None or dialect.name == "postgresql":
+            return value
+        return value.casefold()
+
+
+def search_config():
+    return cast(literal(settings.BOOK_SEARCH_CONFIG), REGCONFIG)
+
+
+def match_and_rank(vector, query: str, terms: List[str], dialect_name: str) -> Tuple[list, Any]:
+    """(WHERE criteria, rank expression) for matching a SearchVector column against a query."""
+    if dialect_name == "postgresql":
+        tsquery = func.websearch_to_tsquery(search_config(), query)
+        return [vector.op("@@")(tsquery)], func.ts_rank_cd(vector, tsquery)
+    return [vector.contains(term, autoescape=True) for term in terms], literal(0.0)
+
+
+def section_document(title: Optional[str], body: Optional[str]) -> str:
+    """The text indexed for a section (the value assigned to BookSection.search_vector)."""
+    return f"{title or ''}\n{body or ''}"
+
+
+def _normalize(word: str) -> str:
+    return word.strip(_PUNCTUATION).casefold()
+
+
+def query_terms(query: str) -> List[str]:
+    """
+    The words a web-search style query (as accepted by websearch_to_tsquery) looks for:
+    quoted phrases are split into words, `-excluded` words and the OR operator are dropped.
+    """
+    terms = []
+    for word in query.split():
+        if word.startswith("-") or word.casefold() == "or":
+            continue
+        term = _normalize(word)
+        if term and term not in terms:
+            terms.append(term)
+    return terms
+
+
+def highlight(text: str, terms: List[str], *, words: Optional[int] = None) -> str:
+    """
+    The `words`-long window of `text` with the most words starting with a query term
+    (prefix match, so "dharma" also marks "dharmas"), HTML-escaped, matches in <mark>.
+    Falls back to the start of the text when nothing matches.
+    """
+    words = words or settings.BOOK_SEARCH_SNIPPET_WORDS
+    tokens = list(_WORD.finditer(text))
+    if not tokens:
+        return ""
+    hits = [i for i, token in enumerate(tokens) if terms and _normalize(token.group()).startswith(tuple(terms))]
+
+    # Two pointers over the hit positions: the window [start, start + words) covering the most hits
+    start, best, left = 0, 0, 0
+    for right, position in enumerate(hits):
+        while position - hits[left] >= words:
+            left += 1
+        if right - left + 1 > best:
+            best, start = right - left + 1, hits[left]
+    if best:
+        # Centre the hits in the window instead of starting on the first one
+        span = hits[min(len(hits) - 1, hits.index(start) + best - 1)] - start + 1
+        start = max(0, min(start - (words - span) // 2, len(tokens) - words))
+    end = min(len(tokens), start + words)
+
+    hit_set = set(hits)
+    parts = ["…" if start > 0 else ""]
+    cursor = tokens[start].start()
+    for i in range(start, end):
+        token = tokens[i]
+        parts.append(html.escape(text[cursor:token.start()]))
+        word = html.escape(token.group())
+        parts.append(f"<mark>{word}</mark>" if i in hit_set else word)
+        cursor = token.end()
+    parts.append("…" if end < len(tokens) else "")
+    return "".join(parts)
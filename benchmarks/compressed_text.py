@@ -0,0 +1,161 @@
+# benchmarks/compressed_text.py
+"""
+Plain vs compressed storage for the long text columns (app/utils/compressed_text.py).
+
+codec:    compression ratio and encode/decode throughput of zlib, zstd and zstd with a
+          dictionary trained on half the corpus (zstd rows need `pip install zstandard`)
+postgres: (--postgres, needs DATABASE_URL_ASYNC pointing at PostgreSQL) loads the corpus
+          into a `text` table and a compressed `bytea` table and compares total relation
+          size (heap + TOAST + indexes), buffer cache hit rate and read latency for point
+          reads and a full scan. Note Postgres already pglz-compresses TOASTed values over
+          ~2 KB, so the plain table is not the raw size.
+
+The corpus is the stored section bodies when --from-db is given, otherwise synthetic
+verse + commentary text.
+
+    python -m benchmarks.compressed_text [--sections 2000] [--from-db] [--postgres]
+"""
+import argparse
+import asyncio
+import random
+import time
+import zlib
+from typing import Callable, List, Optional, Tuple
+
+from sqlalchemy import LargeBinary, bindparam, text
+
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.utils.compressed_text import compress_text, decompress_text, zstandard
+
+WORDS = (
+    "dharma karma atman brahman yoga bhakti jnana moksha samsara guru shishya veda upanishad "
+    "sloka arjuna krishna kurukshetra prakriti purusha sattva rajas tamas the of and to in that "
+    "is which by with this who is said one mind self action knowledge devotion renunciation"
+).split()
+
+
+def synthetic_sections(count: int, seed: int = 7) -> List[str]:
+    rng = random.Random(seed)
+    sections = []
+    for number in range(count):
+        verses = []
+        for verse in range(rng.randint(3, 12)):
+            line = " ".join(rng.choice(WORDS) for _ in range(rng.randint(12, 24)))
+            commentary = " ".join(rng.choice(WORDS) for _ in range(rng.randint(60, 180)))
+            verses.append(f"{number}.{verse + 1} {line} ||\nCommentary: {commentary}.")
+        sections.append("\n\n".join(verses))
+    return sections
+
+
+async def db_sections(count: int) -> List[str]:
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(text("SELECT body FROM book_sections ORDER BY random() LIMIT :limit"), {"limit": count})
+        return [value if isinstance(value, str) else decompress_text(value) for (value,) in result]
+
+
+def measure(name: str, corpus: List[bytes], compress: Callable[[bytes], bytes], decompress: Callable[[bytes], bytes]) -> None:
+    start = time.perf_counter()
+    packed = [compress(raw) for raw in corpus]
+    encode_s = time.perf_counter() - start
+    start = time.perf_counter()
+    for blob in packed:
+        decompress(blob)
+    decode_s = time.perf_counter() - start
+    raw_mb = sum(map(len, corpus)) / 1e6
+    ratio = sum(map(len, corpus)) / sum(map(len, packed))
+    print(f"{name:22} {ratio:>6.2f}x {raw_mb / encode_s:>12.1f} {raw_mb / decode_s:>12.1f}")
+
+
+def codec_benchmark(sections: List[str]) -> None:
+    corpus = [section.encode("utf-8") for section in sections]
+    print(f"{len(corpus)} sections, {sum(map(len, corpus)) / 1e6:.1f} MB")
+    print(f"{'codec':22} {'ratio':>7} {'enc MB/s':>12} {'dec MB/s':>12}")
+    level = settings.COMPRESSED_TEXT_ZLIB_LEVEL
+    measure(f"zlib-{level}", corpus, lambda raw: zlib.compress(raw, level), zlib.decompress)
+    if zstandard is None:
+        print("(zstandard not installed: zstd rows skipped)")
+        return
+    zstd_level = settings.COMPRESSED_TEXT_ZSTD_LEVEL
+    plain = zstandard.ZstdCompressor(level=zstd_level)
+    measure(f"zstd-{zstd_level}", corpus, plain.compress, zstandard.ZstdDecompressor().decompress)
+    # Train on one half, measure on the other, so the dictionary can't simply memorize the test rows
+    training, testing = corpus[::2], corpus[1::2]
+    dictionary = zstandard.train_dictionary(112640, training)
+    with_dict = zstandard.ZstdCompressor(level=zstd_level, dict_data=dictionary)
+    measure(f"zstd-{zstd_level}+dict", testing, with_dict.compress, zstandard.ZstdDecompressor(dict_data=dictionary).decompress)
+
+
+async def _io_stats(db, table: str) -> Tuple[int, int]:
+    result = await db.execute(
+        text(
+            "SELECT coalesce(heap_blks_hit, 0) + coalesce(toast_blks_hit, 0), "
+            "coalesce(heap_blks_read, 0) + coalesce(toast_blks_read, 0) "
+            "FROM pg_statio_user_tables WHERE relname = :table"
+        ),
+        {"table": table},
+    )
+    return tuple(result.first() or (0, 0))
+
+
+async def postgres_table(db, table: str, column_type: str, values: List, reads: int) -> None:
+    await db.execute(text(f"DROP TABLE IF EXISTS {table}"))
+    await db.execute(text(f"CREATE TABLE {table} (id integer PRIMARY KEY, body {column_type} NOT NULL)"))
+    insert = text(f"INSERT INTO {table} (id, body) VALUES (:id, :body)")
+    if column_type == "bytea":
+        insert = insert.bindparams(bindparam("body", type_=LargeBinary))
+    await db.execute(insert, [{"id": i, "body": value} for i, value in enumerate(values)])
+    await db.commit()
+    await db.execute(text(f"ANALYZE {table}"))
+    size = (await db.execute(text(f"SELECT pg_total_relation_size('{table}')"))).scalar_one()
+
+    await db.execute(text("SELECT pg_stat_clear_snapshot()"))
+    hit_before, read_before = await _io_stats(db, table)
+    decode: Callable = decompress_text if column_type == "bytea" else (lambda value: value)
+    ids = [random.randrange(len(values)) for _ in range(reads)]
+    start = time.perf_counter()
+    for row_id in ids:
+        decode((await db.execute(text(f"SELECT body FROM {table} WHERE id = :id"), {"id": row_id})).scalar_one())
+    point_ms = (time.perf_counter() - start) / reads * 1000
+    start = time.perf_counter()
+    for (value,) in await db.execute(text(f"SELECT body FROM {table}")):
+        decode(value)
+    scan_ms = (time.perf_counter() - start) * 1000
+    await db.commit()
+    # Stats are flushed asynchronously by the backend; give them a moment
+    await asyncio.sleep(1)
+    await db.execute(text("SELECT pg_stat_clear_snapshot()"))
+    hit_after, read_after = await _io_stats(db, table)
+    hits, misses = hit_after - hit_before, read_after - read_before
+    hit_rate = hits / (hits + misses) * 100 if hits + misses else float("nan")
+    print(f"{table:24} {size / 1e6:>9.2f} {hit_rate:>9.1f}% {point_ms:>10.3f} {scan_ms:>10.1f}")
+    await db.execute(text(f"DROP TABLE {table}"))
+    await db.commit()
+
+
+async def postgres_benchmark(sections: List[str], reads: int) -> None:
+    if not settings.DATABASE_URL_ASYNC.startswith("postgresql"):
+        print("--postgres needs DATABASE_URL_ASYNC to point at PostgreSQL")
+        return
+    print(f"\n{'table':24} {'size MB':>9} {'cache hit':>10} {'point ms':>10} {'scan ms':>10}")
+    async with AsyncSessionLocal() as db:
+        await postgres_table(db, "bench_text_plain", "text", sections, reads)
+        await postgres_table(db, "bench_text_compressed", "bytea", [compress_text(s) for s in sections], reads)
+
+
+async def main(count: int, from_db: bool, postgres: bool, reads: int) -> None:
+    sections: Optional[List[str]] = await db_sections(count) if from_db else None
+    sections = sections or synthetic_sections(count)
+    codec_benchmark(sections)
+    if postgres:
+        await postgres_benchmark(sections, reads)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sections", type=int, default=2000)
+    parser.add_argument("--from-db", action="store_true", help="sample stored book_sections bodies instead of synthetic text")
+    parser.add_argument("--postgres", action="store_true", help="also compare table size / cache hit rate / latency in PostgreSQL")
+    parser.add_argument("--reads", type=int, default=500, help="random point reads per table")
+    args = parser.parse_args()
+    asyncio.run(main(args.sections, args.from_db, args.postgres, args.reads))
@@ -0,0 +1,101 @@
+# benchmarks/json_responses.py
+"""
+Render throughput of the largest responses: stdlib JSONResponse vs ORJSONResponse.
+
+Payloads are built from the real response schemas and pushed through FastAPI's
+own serialize_response step first, exactly like a route with response_model,
+so only the final render differs. Also asserts both renderers produce the same
+JSON document for every schema exercised.
+
+    python -m benchmarks.json_responses [--rounds 200]
+"""
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.schemas.book_chapter import BookChapterResponse
+from app.schemas.chat_with_guruji import ChatWithGurujiResponse, SourceType
+from app.schemas.place import PlaceResponse
+from app.utils.serialization import ORJSONResponse
+
+NOW = datetime(2024, 1, 1, 6, 30, 15, 123456)
+LOREM = "धर्मक्षेत्रे कुरुक्षेत्रे समवेता युयुत्सवः। Dharma-kshetre kuru-kshetre samaveta yuyutsavah. " * 12
+
+
+def places(n: int = 2000) -> List[dict]:
+    return [
+        {
+            "id": uuid.uuid4(), "name": f"Place {i}", "place_description": LOREM[:400],
+            "religious_importance": LOREM[:300], "historical_background": LOREM[:600],
+            "latitude": 25.3176 + i / 1000, "longitude": 82.9739, "state_id": uuid.uuid4(),
+            "category_id": uuid.uuid4(), "gallery_images": [f"https://cdn.example.com/p/{i}/{j}.jpg" for j in range(5)],
+            "created_at": NOW, "updated_at": NOW + timedelta(days=i), "created_by": uuid.uuid4(),
+        }
+        for i in range(n)
+    ]
+
+
+def chapter(sections: int = 200) -> dict:
+    return {
+        "id": uuid.uuid4(), "book_id": uuid.uuid4(), "chapter_number": 2, "title": "Sankhya Yoga",
+        "description": LOREM[:200], "created_at": NOW, "updated_at": NOW,
+        "sections": [
+            {"id": uuid.uuid4(), "title": f"Verse {i}", "body": LOREM * 2, "section_order": i,
+             "created_at": NOW, "updated_at": NOW}
+            for i in range(sections)
+        ],
+    }
+
+
+def chat(messages: int = 500) -> dict:
+    return {
+        "id": uuid.uuid4(), "chat_id": "conv_01", "user_id": uuid.uuid4(), "source": SourceType.ELEVEN_LABS,
+        "title": "Questions on karma", "created_at": NOW, "updated_at": NOW,
+        "messages": [
+            {"role": "user" if i % 2 else "agent", "message": LOREM[:500], "time_in_call_secs": i * 7, "score": 0.5}
+            for i in range(messages)
+        ],
+    }
+
+
+CASES = [
+    ("places /all (2000 rows)", List[PlaceResponse], places),
+    ("chapter with 200 sections", BookChapterResponse, chapter),
+    ("chat transcript (500 messages)", ChatWithGurujiResponse, chat),
+]
+
+
+def bench(response_class, content, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        response_class(content)
+    return rounds / (time.perf_counter() - start)
+
+
+async def main(rounds: int) -> None:
+    print(f"{'payload':34} {'size':>9} {'json/s':>9} {'orjson/s':>9} {'speedup':>8}")
+    for name, schema, factory in CASES:
+        field = create_response_field(name="bench", type_=schema)
+        content = await serialize_response(field=field, response_content=factory())
+
+        stdlib_body = JSONResponse(content).body
+        orjson_body = ORJSONResponse(content).body
+        assert json.loads(stdlib_body) == json.loads(orjson_body), f"{name}: renderers disagree"
+
+        before = bench(JSONResponse, content, rounds)
+        after = bench(ORJSONResponse, content, rounds)
+        print(f"{name:34} {len(orjson_body):>9} {before:>9.1f} {after:>9.1f} {after / before:>7.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=200)
+    asyncio.run(main(parser.parse_args().rounds))
@@ -0,0 +1,101 @@
+# benchmarks/list_serialization.py
+"""
+Per-item cost of building a paginated list response from ORM rows.
+
+before: model_validate per row in a loop -> PaginatedResponse[...] -> FastAPI
+        validates it again against response_model -> JSON render
+after:  paginated_body(), a single TypeAdapter pass from rows to bytes
+
+Rows are Content / Place instances with every column populated, like rows
+loaded by a query, so attribute access goes through the same SQLAlchemy
+instrumentation as in the routes.
+
+    python -m benchmarks.list_serialization [--items 100] [--rounds 200]
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from datetime import datetime
+
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.models.content import Content
+from app.models.place import Place
+from app.schemas.book import BookResponse
+from app.schemas.pagination import PaginatedResponse
+from app.schemas.place import PlaceResponse
+from app.utils.serialization import ORJSONResponse, paginated_body
+
+NOW = datetime(2024, 1, 1, 6, 30)
+
+
+def _loaded(obj):
+    # Unset attributes take SQLAlchemy's slower default-value path; loaded rows never do
+    for column in obj.__table__.columns:
+        if column.key not in obj.__dict__:
+            setattr(obj, column.key, None)
+    return obj
+
+
+def books(n: int):
+    return [_loaded(obj) for obj in [
+        Content(
+            id=uuid.uuid4(), title=f"Book {i}", slug=f"book-{i}", description="A commentary. " * 20,
+            language="EN", content_type="BOOK", sub_type="BOOK", status="PUBLISHED", featured=False,
+            premium_content=False, view_count=i, like_count=0, bookmark_count=0, review_count=0,
+            created_at=NOW, updated_at=NOW,
+        )
+        for i in range(n)
+    ]]
+
+
+def places(n: int):
+    return [_loaded(obj) for obj in [
+        Place(
+            id=uuid.uuid4(), name=f"Place {i}", place_description="A tirtha. " * 30, category_id=uuid.uuid4(),
+            latitude=25.3, longitude=82.9, is_featured=False, created_at=NOW, updated_at=NOW,
+        )
+        for i in range(n)
+    ]]
+
+
+async def before(schema, rows, field):
+    page = PaginatedResponse[schema](
+        total_count=len(rows), limit=len(rows), skip=0, items=[schema.model_validate(row) for row in rows]
+    )
+    return ORJSONResponse(await serialize_response(field=field, response_content=page)).body
+
+
+async def after(schema, rows, field):
+    return paginated_body(schema, rows, total_count=len(rows), skip=0, limit=len(rows))
+
+
+async def per_item_us(fn, schema, rows, field, rounds: int, repeats: int = 5) -> float:
+    """Best of `repeats` runs, to keep scheduler noise out of the comparison."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            await fn(schema, rows, field)
+        best = min(best, time.perf_counter() - start)
+    return best / (rounds * len(rows)) * 1e6
+
+
+async def main(items: int, rounds: int) -> None:
+    print(f"{'schema':16} {'before us/item':>15} {'after us/item':>14} {'speedup':>8}")
+    for schema, rows in ((BookResponse, books(items)), (PlaceResponse, places(items))):
+        field = create_response_field(name="bench", type_=PaginatedResponse[schema])
+        await after(schema, rows, field)  # warm the TypeAdapter cache
+        slow = await per_item_us(before, schema, rows, field, rounds)
+        fast = await per_item_us(after, schema, rows, field, rounds)
+        print(f"{schema.__name__:16} {slow:>15.2f} {fast:>14.2f} {slow / fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.items, args.rounds))
@@ -0,0 +1,6 @@
+# tests/conftest.py
+# app.config needs database URLs at import time; the tests below never touch the app's own database.
+import os
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("DATABASE_URL_ASYNC", "sqlite+aiosqlite://")
@@ -0,0 +1,190 @@
+# tests/test_response_cache.py
+"""
+Response cache (app/utils/cache.py) against both backends: the in-process LRU and Redis,
+the latter through fakeredis (a Redis-protocol stand-in; skipped if it isn't installed).
+
+    pip install -r app/requirements.txt -r tests/requirements.txt
+    python -m pytest -q tests
+"""
+import asyncio
+import uuid
+
+import pytest
+from pydantic import BaseModel
+from sqlalchemy import Boolean, Column, String, Uuid
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import declarative_base
+from sqlalchemy.pool import StaticPool
+from starlette.requests import Request
+
+import app.crud.base as crud_base
+from app.crud.base import CRUDBase
+from app.models.user import UserRole
+from app.utils.cache import (
+    InMemoryLRUBackend, RedisBackend, ResponseCache, entity_tag, visibility_scope,
+)
+
+# A throwaway table, so CRUDBase's writes run against a real (in-memory sqlite) database
+WidgetBase = declarative_base()
+
+
+class Widget(WidgetBase):
+    __tablename__ = "widgets"
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4)
+    name = Column(String(50), nullable=False)
+    is_deleted = Column(Boolean, default=False, nullable=False)
+
+
+class WidgetIn(BaseModel):
+    name: str
+
+
+widget_crud = CRUDBase(Widget)
+
+
+def make_backend(kind: str):
+    if kind == "memory":
+        return InMemoryLRUBackend(max_entries=100)
+    fakeredis = pytest.importorskip("fakeredis")
+    return RedisBackend(fakeredis.FakeAsyncRedis(), prefix="test")
+
+
+def make_request(path: str, query: str = "") -> Request:
+    return Request({"type": "http", "method": "GET", "path": path, "query_string": query.encode(), "headers": []})
+
+
+def body_producer(body: bytes):
+    async def produce(db):
+        return body
+    return produce
+
+
+@pytest.fixture(params=["memory", "redis"])
+def backend_kind(request):
+    if request.param == "redis":
+        pytest.importorskip("fakeredis")
+    return request.param
+
+
+# --- Keys ---
+
+def test_build_key_ignores_param_order_and_empty_values():
+    cache = ResponseCache(InMemoryLRUBackend())
+    key = cache.build_key(make_request("/api/v1/books", "limit=10&skip=0&search="))
+    assert key == cache.build_key(make_request("/api/v1/books", "skip=0&limit=10"))
+    assert key != cache.build_key(make_request("/api/v1/books", "skip=10&limit=10"))
+    assert key != cache.build_key(make_request("/api/v1/stories", "skip=0&limit=10"))
+
+
+def test_build_key_separates_visibility_scopes_and_versions():
+    cache = ResponseCache(InMemoryLRUBackend())
+    request = make_request("/api/v1/books", "skip=0")
+    admin = type("User", (), {"role": UserRole.ADMIN.value})()
+    reader = type("User", (), {"role": "user"})()
+    assert visibility_scope(admin) == "admin"
+    assert visibility_scope(reader) == visibility_scope(None) == "public"
+    assert cache.build_key(request, visibility_scope(admin)) != cache.build_key(request, visibility_scope(reader))
+    assert cache.build_key(request, "public", '"v1"') != cache.build_key(request, "public", '"v2"')
+
+
+def test_entity_key_is_shared_by_id_and_slug_urls():
+    cache = ResponseCache(InMemoryLRUBackend())
+    book_id = uuid.uuid4()
+    assert cache.entity_key("book", book_id, "public", '"e"') == cache.entity_key("book", str(book_id), "public", '"e"')
+    assert cache.entity_key("book", book_id, "public", '"e"') != cache.entity_key("book", book_id, "admin", '"e"')
+
+
+# --- Tag invalidation by CRUDBase writes ---
+
+def test_crud_writes_invalidate_tags(backend_kind, monkeypatch):
+    async def scenario():
+        cache = ResponseCache(make_backend(backend_kind), default_ttl=60, stale_ttl=10)
+        await cache.clear()
+        monkeypatch.setattr(crud_base, "response_cache", cache)
+
+        engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+        async with engine.begin() as conn:
+            await conn.run_sync(WidgetBase.metadata.create_all)
+        sessions = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+        async def cached(db, key, tags, body=b"[]"):
+            return (await cache.get_or_set_body(key, body_producer(body), db=db, tags=tags))[1]
+
+        async with sessions() as db:
+            assert await cached(db, "list", [entity_tag("widgets")]) == "MISS"
+            assert await cached(db, "other", [entity_tag("gadgets")]) == "MISS"
+            widget = await widget_crud.create(db, obj_in=WidgetIn(name="first"))
+            # Creating a row invalidates every list of its table, nothing else
+            assert await cached(db, "list", [entity_tag("widgets")]) == "MISS"
+            assert await cached(db, "other", [entity_tag("gadgets")]) == "HIT"
+
+            detail_tags = [entity_tag("widgets", widget.id)]
+            other_widget = await widget_crud.create(db, obj_in=WidgetIn(name="second"))
+            assert await cached(db, "detail", detail_tags) == "MISS"
+            assert await cached(db, "other-detail", [entity_tag("widgets", other_widget.id)]) == "MISS"
+            assert await cached(db, "list", [entity_tag("widgets")]) == "MISS"
+
+            await widget_crud.update(db, db_obj=widget, obj_in={"name": "renamed"})
+            assert await cached(db, "detail", detail_tags) == "MISS"
+            assert await cached(db, "list", [entity_tag("widgets")]) == "MISS"
+            assert await cached(db, "other-detail", [entity_tag("widgets", other_widget.id)]) == "HIT"
+
+            await widget_crud.remove(db, id=widget.id)
+            assert await cached(db, "detail", detail_tags) == "MISS"
+            assert await cached(db, "list", [entity_tag("widgets")]) == "MISS"
+            assert await cached(db, "other-detail", [entity_tag("widgets", other_widget.id)]) == "HIT"
+            assert await cached(db, "other", [entity_tag("gadgets")]) == "HIT"
+        await engine.dispose()
+
+    asyncio.run(scenario())
+
+
+def test_callable_tags_resolve_from_the_payload(backend_kind):
+    async def scenario():
+        cache = ResponseCache(make_backend(backend_kind), default_ttl=60, stale_ttl=10)
+        await cache.clear()
+        row_id = uuid.uuid4()
+
+        async def produce(db):
+            return {"id": str(row_id)}
+
+        tags = lambda payload: [entity_tag("widgets", payload["id"])]
+        assert (await cache.get_or_set_body("by-slug", produce, db=None, tags=tags))[1] == "MISS"
+        assert (await cache.get_or_set_body("by-slug", produce, db=None, tags=tags))[1] == "HIT"
+        await cache.invalidate_tags([entity_tag("widgets", row_id)])
+        assert (await cache.get_or_set_body("by-slug", produce, db=None, tags=tags))[1] == "MISS"
+
+    asyncio.run(scenario())
+
+
+# --- The _generation guard ---
+
+def test_write_during_build_does_not_store_stale_body(backend_kind):
+    async def scenario():
+        cache = ResponseCache(make_backend(backend_kind), default_ttl=60, stale_ttl=10)
+        await cache.clear()
+        started, release = asyncio.Event(), asyncio.Event()
+
+        async def slow_producer(db):
+            started.set()
+            await release.wait()
+            return b'{"name": "old"}'  # Read before the write below committed
+
+        build = asyncio.create_task(cache.get_or_set_body("detail", slow_producer, db=None, tags=["widgets:1"]))
+        await started.wait()
+        await cache.invalidate_tags(["widgets:1"])  # A write lands while the body is being built
+        release.set()
+        body, status = await build
+        assert (body, status) == (b'{"name": "old"}', "MISS")  # The request that built it still gets it...
+
+        # ...but it was not stored: the next request rebuilds and sees the new data
+        body, status = await cache.get_or_set_body(
+            "detail", body_producer(b'{"name": "new"}'), db=None, tags=["widgets:1"]
+        )
+        assert (body, status) == (b'{"name": "new"}', "MISS")
+        body, status = await cache.get_or_set_body(
+            "detail", body_producer(b'{"name": "newer"}'), db=None, tags=["widgets:1"]
+        )
+        assert (body, status) == (b'{"name": "new"}', "HIT")
+
+    asyncio.run(scenario())